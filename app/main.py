@@ -1,10 +1,52 @@
 import os
 import asyncio
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from playwright.async_api import async_playwright
 from app.router.v1.router import router as v1_router
+from app.src.browser_pool import browser_pool
+from app.src.corp_code import preload_company_data, get_company_index
+from app.src.parser import start_parse_executor, shutdown_parse_executor
+from app.src.http_client import http_client
+from app.src.hedging import navigation_hedger
+from app.src.scheduler import crawl_scheduler
+from app.src.work_queue import work_queue
+from app.src.statement_index import statement_index
+from app.src.industry_cube import industry_cube
+from app.utils.logging import logger
+
+warmup_state = {"ready": False, "error": None}
+
+
+async def warm_up():
+    """기업 정보 캐시 적재와 브라우저 풀 워밍업 (첫 요청 지연 방지)"""
+    try:
+        await asyncio.to_thread(preload_company_data)
+        await asyncio.to_thread(get_company_index)
+        await asyncio.to_thread(statement_index.refresh)
+        await asyncio.to_thread(industry_cube.build)
+        await asyncio.to_thread(start_parse_executor)
+        await browser_pool.start()
+        warmup_state["ready"] = True
+        logger.info(f"[warm_up] 워밍업 완료")
+    except Exception as e:
+        warmup_state["error"] = str(e)
+        logger.error(f"[warm_up] 워밍업 실패: {str(e)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup_task = asyncio.create_task(warm_up())
+    yield
+    warmup_task.cancel()
+    await browser_pool.close()
+    await http_client.close()
+    work_queue.close()
+    shutdown_parse_executor()
+
 
 app = FastAPI(
     title="Playwright API",
@@ -13,6 +55,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -46,4 +89,26 @@ app.mount("/api/v1", v1_app)
 
 @app.get("/health_check")
 async def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    if not warmup_state["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming_up", "error": warmup_state["error"]})
+    return {"status": "ready"}
+
+
+@app.get("/metrics/http")
+async def http_metrics():
+    return http_client.metrics()
+
+
+@app.get("/metrics/hedging")
+async def hedging_metrics():
+    return navigation_hedger.metrics()
+
+
+@app.get("/metrics/scheduler")
+async def scheduler_metrics():
+    return crawl_scheduler.metrics()
@@ -1,18 +1,76 @@
+import asyncio
+
+from typing import List, Optional
+from pydantic import BaseModel
 from fastapi import APIRouter
 
-from app.src.crawler import PlaywrightFinancialStatementCrawler
-from app.src.corp_code import search_company
+from app.src.crawler import FinancialStatementCrawler, NAVIGATION_MODES, SEARCH_MODES, EXTRACTION_MODES
+from app.src.browser_pool import browser_pool
+from app.src.opendart import OpenDartClient
+from app.src.statement_store import statement_store
+from app.src.statement_index import statement_index
+from app.src.industry_cube import industry_cube
+from app.src.har_archive import HAR_MODES
+from app.src.hedging import navigation_hedger
+from app.src.deadline import new_deadline
+from app.src.scheduler import crawl_scheduler, PRIORITY_WEIGHTS
+from app.src.work_queue import work_queue
+from app.utils.data import sanitize_json_values
+from app.src.corp_code import search_company, autocomplete_company, resolve_companies
 
 router = APIRouter()
 
+
+class CompanyQuery(BaseModel):
+    corp_name: str
+    corp_type_value: Optional[str] = None
+
+
+class CompanyResolveRequest(BaseModel):
+    companies: List[CompanyQuery]
+    corp_type_value: str = "all"
+
+
+def save_statements(corp_key: str, dataset: list):
+    for sj_div in statement_store.save_datasets(corp_key, dataset, source="company_fs"):
+        statement_index.update(corp_key, sj_div)
+    industry_cube.update_companies([corp_key])
+
+
 @router.post("/crawler/company_fs")
 async def collect_company_fs(
     corp_name: str,
     corp_type_value: str,
-    retry_count: int = 3
+    retry_count: int = 3,
+    resume: bool = True,
+    navigation_mode: str = "tree",
+    search_mode: str = "form",
+    prefetch_window: int = 0,
+    extraction_mode: str = "locator",
+    select_latest: bool = True,
+    engine: str = "browser",
+    validate: bool = True,
+    har_mode: str = "off",
+    section_concurrency: int = 1,
+    hedge: bool = True,
+    deadline_seconds: Optional[float] = None,
+    priority: str = "interactive"
 ):
+    # 요청 기한은 기업 검색을 포함한 요청 전체에 적용
+    deadline = new_deadline(deadline_seconds)
     
-    search_result = search_company(corp_name, corp_type_value)
+    if navigation_mode not in NAVIGATION_MODES:
+        return {"message": "failed", "message": f"navigation_mode는 {NAVIGATION_MODES} 중 하나여야 합니다."}
+    if search_mode not in SEARCH_MODES:
+        return {"message": "failed", "message": f"search_mode는 {SEARCH_MODES} 중 하나여야 합니다."}
+    if extraction_mode not in EXTRACTION_MODES:
+        return {"message": "failed", "message": f"extraction_mode는 {EXTRACTION_MODES} 중 하나여야 합니다."}
+    if har_mode not in HAR_MODES:
+        return {"message": "failed", "message": f"har_mode는 {HAR_MODES} 중 하나여야 합니다."}
+    if priority not in PRIORITY_WEIGHTS:
+        return {"message": "failed", "message": f"priority는 {list(PRIORITY_WEIGHTS)} 중 하나여야 합니다."}
+
+    search_result = await asyncio.to_thread(search_company, corp_name, corp_type_value)
     
     if search_result is None:
         return {"message": "failed", "message": "검색 결과가 없습니다."}
@@ -26,15 +84,91 @@ async def collect_company_fs(
     level4 = search_result["level4"]
     level5 = search_result["level5"]
 
-    crawler = PlaywrightFinancialStatementCrawler(
-        corp_name=corp_name,
-        stock_code=stock_code,
-        corp_type_value=corp_type_value,
-        retry_count=retry_count)
+    crawler = FinancialStatementCrawler(
+        headless=True,
+        browser_pool=browser_pool if browser_pool.ready else None,
+        navigation_mode=navigation_mode,
+        search_mode=search_mode,
+        prefetch_window=prefetch_window,
+        extraction_mode=extraction_mode,
+        select_latest=select_latest,
+        api_client=OpenDartClient(retry_count=retry_count, deadline=deadline) if engine == "api" else None,
+        validate=validate,
+        har_mode=har_mode,
+        section_concurrency=section_concurrency,
+        hedger=navigation_hedger if hedge else None,
+        deadline=deadline,
+        scheduler=crawl_scheduler,
+        priority=priority)
     
-    success, message, years, urls = await crawler.initialize_and_search()
+    try:
+        dataset = await crawler.collect_financial_statements(
+            company_name=corp_name,
+            corp_type_value=corp_type_value,
+            retry_count=retry_count,
+            resume=resume)
+    except Exception as e:
+        return {"message": "failed", "message": str(e)}
+    finally:
+        await crawler.close()
+        if crawler.api_client is not None:
+            await crawler.api_client.close()
+
+    # 재무제표별 최신본 저장 (내용이 같으면 새 버전을 만들지 않음) 후 조회 색인 갱신
+    # 실패한 보고서가 있거나 기한 때문에 중단된 부분 결과는 일부 연도가 빠져 있으므로 새 버전을 만들지 않고 이전 최신본을 유지
+    saved = not crawler.failed_reports and not crawler.partial
+    if saved:
+        await asyncio.to_thread(save_statements, corp_code or stock_code, dataset)
     
-    if success:
-        return {"message": "success", "years": years, "urls": urls}
-    else:
-        return {"message": "failed", "message": message}
\ No newline at end of file
+    return {
+        "message": "success",
+        "corp_code": corp_code,
+        "stock_code": stock_code,
+        "dataset": dataset,
+        "saved": saved,
+        "failed_reports": crawler.failed_reports,
+        "skipped_reports": crawler.skipped_reports,
+        "invalid_units": crawler.invalid_units,
+        "partial": crawler.partial,
+        "pending_reports": crawler.pending_reports
+    }
+
+
+@router.get("/crawler/autocomplete")
+async def autocomplete(
+    q: str,
+    corp_type_value: str = "all",
+    limit: int = 10
+):
+    candidates = await asyncio.to_thread(autocomplete_company, q, corp_type_value, limit)
+    return {"message": "success", "candidates": sanitize_json_values(candidates)}
+
+
+@router.post("/crawler/companies/resolve")
+async def resolve_company_list(request: CompanyResolveRequest):
+    queries = [company.dict() for company in request.companies]
+    result = await asyncio.to_thread(resolve_companies, queries, request.corp_type_value)
+    return {"message": "success", **sanitize_json_values(result)}
+
+
+@router.post("/crawler/queue")
+async def enqueue_companies(request: CompanyResolveRequest, priority: str = "backfill"):
+    """여러 노드가 나눠 처리할 기업 수집 작업 등록 (python -m app.src.work_queue worker 로 처리)"""
+    if priority not in PRIORITY_WEIGHTS:
+        return {"message": "failed", "message": f"priority는 {list(PRIORITY_WEIGHTS)} 중 하나여야 합니다."}
+
+    await work_queue.ensure_indexes()
+    job_ids = []
+    not_found = []
+    for company in request.companies:
+        job_id = await work_queue.enqueue(company.corp_name, company.corp_type_value or request.corp_type_value, priority)
+        if job_id is None:
+            not_found.append(company.corp_name)
+        else:
+            job_ids.append(job_id)
+    return {"message": "success", "job_ids": job_ids, "not_found": not_found}
+
+
+@router.get("/crawler/queue/stats")
+async def queue_stats(window_minutes: int = 60):
+    return {"message": "success", **await work_queue.stats(window_minutes)}
@@ -0,0 +1,31 @@
+from typing import Optional
+from fastapi import APIRouter
+
+from app.src.industry_cube import industry_cube
+
+router = APIRouter()
+
+
+@router.get("/benchmark")
+async def get_industry_benchmark(
+    level1: Optional[str] = None,
+    level2: Optional[str] = None,
+    level3: Optional[str] = None,
+    level4: Optional[str] = None,
+    level5: Optional[str] = None,
+    year: Optional[int] = None,
+    metrics: Optional[str] = None
+):
+    metric_list = [metric.strip() for metric in metrics.split(",") if metric.strip()] if metrics else None
+    node, rows = industry_cube.query([level1, level2, level3, level4, level5], year, metric_list)
+    return {"message": "success", "node": node, "fs_div": industry_cube.fs_div, "data": rows}
+
+
+@router.get("/children")
+async def get_industry_children(
+    level1: Optional[str] = None,
+    level2: Optional[str] = None,
+    level3: Optional[str] = None,
+    level4: Optional[str] = None
+):
+    return {"message": "success", "children": industry_cube.list_children([level1, level2, level3, level4])}
@@ -0,0 +1,66 @@
+from typing import Optional
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import JSONResponse
+
+from app.src.statement_index import statement_index
+
+router = APIRouter()
+
+
+def _parse_list(value: Optional[str]):
+    return [item.strip() for item in value.split(",") if item.strip()] if value else None
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더의 태그 목록("a", "b"), 약한 태그(W/"..."), * 중 하나라도 현재 ETag와 맞으면 True (약한 비교)"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def _conditional_response(request: Request, etag: str, content: dict):
+    """If-None-Match가 현재 ETag와 맞으면 본문 없이 304 반환"""
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(content=content, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+@router.get("/accounts/{sj_div}")
+async def get_account_series(
+    request: Request,
+    sj_div: str,
+    account_name: str,
+    corp_keys: Optional[str] = None,
+    from_year: Optional[int] = None,
+    to_year: Optional[int] = None
+):
+    etag, series = statement_index.get_account_series(sj_div, account_name, _parse_list(corp_keys), from_year, to_year)
+    return _conditional_response(request, etag, {"message": "success", "sj_div": sj_div.upper(), "account_name": account_name, "series": series})
+
+
+@router.get("/{corp_key}")
+async def list_statements(corp_key: str):
+    return {"message": "success", "corp_key": corp_key, "statements": statement_index.list_statements(corp_key)}
+
+
+@router.get("/{corp_key}/{sj_div}")
+async def get_statement(
+    request: Request,
+    corp_key: str,
+    sj_div: str,
+    from_year: Optional[int] = None,
+    to_year: Optional[int] = None,
+    fields: Optional[str] = None
+):
+    etag, rows = statement_index.get_statement(corp_key, sj_div, from_year, to_year, _parse_list(fields))
+    if rows is None:
+        return JSONResponse(status_code=404, content={"message": "failed", "message": "저장된 재무제표가 없습니다."})
+    return _conditional_response(request, etag, {"message": "success", "corp_key": corp_key, "sj_div": sj_div.upper(), "data": rows})
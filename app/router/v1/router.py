@@ -1,6 +1,10 @@
 from fastapi import APIRouter
 from app.router.v1.endpoints.crawler import router as crawler_router
+from app.router.v1.endpoints.statements import router as statements_router
+from app.router.v1.endpoints.industries import router as industries_router
 
 router = APIRouter()
 
-router.include_router(crawler_router, prefix="/crawler", tags=["crawler"])
\ No newline at end of file
+router.include_router(crawler_router, prefix="/crawler", tags=["crawler"])
+router.include_router(statements_router, prefix="/statements", tags=["statements"])
+router.include_router(industries_router, prefix="/industries", tags=["industries"])
\ No newline at end of file
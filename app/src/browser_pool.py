@@ -0,0 +1,191 @@
+import os
+import asyncio
+
+from typing import Dict, Set, Tuple
+from playwright.async_api import async_playwright, Browser, Page, BrowserContext
+
+from app.src.crawler import FinancialStatementCrawler
+from app.src.recycle import get_browser_rss_mb, new_browser_marker
+from app.utils.logging import logger
+
+
+class BrowserPool:
+    """
+    앱 수명 동안 유지되는 브라우저와 DART 메인 페이지에 미리 접속해 둔 페이지 풀
+    - start() : 브라우저를 띄우고 size개의 컨텍스트/페이지를 main.do까지 로드
+    - acquire() : 준비된 (context, page)를 꺼냄 (비어있으면 즉시 새로 생성)
+    - release() : 사용한 컨텍스트를 닫고 백그라운드에서 새 페이지를 채워 넣음
+    - recycle() : 새 브라우저를 띄워 교체하고, 이전 브라우저는 사용 중인 컨텍스트가 모두 반환되면 종료
+    """
+
+    def __init__(self, size: int = int(os.getenv("BROWSER_POOL_SIZE", 2)), headless: bool = True):
+        self.size = size
+        self.headless = headless
+        self.playwright = None
+        self.browser = None
+        self.marker = None
+        self.ready = False
+        self._pages: asyncio.Queue = asyncio.Queue()
+        self._refill_tasks = set()
+        # 브라우저별 사용 중인 컨텍스트 수 (교체된 브라우저는 0이 되면 종료)
+        self._leases: Dict[Browser, int] = {}
+        self._retired: Set[Browser] = set()
+        self._recycle_lock = asyncio.Lock()
+
+
+    async def _launch(self):
+        self.marker = new_browser_marker()
+        self.browser = await self.playwright.chromium.launch(
+            headless=self.headless,
+            args=[*FinancialStatementCrawler.BROWSER_ARGS, self.marker]
+        )
+        self._leases[self.browser] = 0
+
+
+    async def _new_ready_page(self) -> Tuple[BrowserContext, Page]:
+        context = await self.browser.new_context(
+            viewport={'width': 1920, 'height': 1080},
+            user_agent=FinancialStatementCrawler.USER_AGENT
+        )
+        page = await context.new_page()
+        await page.goto(FinancialStatementCrawler.INIT_URL, wait_until='networkidle', timeout=60000)
+        return context, page
+
+
+    async def _refill(self):
+        try:
+            self._pages.put_nowait(await self._new_ready_page())
+        except Exception as e:
+            logger.warning(f"[BrowserPool] 대기 페이지 보충 실패: {str(e)}")
+
+
+    def _schedule_refill(self):
+        if self.ready and self._pages.qsize() + len(self._refill_tasks) < self.size:
+            task = asyncio.create_task(self._refill())
+            self._refill_tasks.add(task)
+            task.add_done_callback(self._refill_tasks.discard)
+
+
+    async def _close_context(self, context: BrowserContext):
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"[BrowserPool] 컨텍스트 종료 실패: {str(e)}")
+
+
+    async def _close_if_drained(self, browser: Browser):
+        """교체된 브라우저는 사용 중인 컨텍스트가 없을 때 종료"""
+        if browser not in self._retired or self._leases.get(browser, 0) > 0:
+            return
+        self._retired.discard(browser)
+        self._leases.pop(browser, None)
+        try:
+            await browser.close()
+            logger.info(f"[BrowserPool] 교체된 브라우저 종료")
+        except Exception as e:
+            logger.warning(f"[BrowserPool] 교체된 브라우저 종료 실패: {str(e)}")
+
+
+    async def start(self):
+        logger.info(f"[BrowserPool] 브라우저 풀 워밍업 시작 (페이지 {self.size}개)")
+        self.playwright = await async_playwright().start()
+        await self._launch()
+
+        results = await asyncio.gather(*[self._new_ready_page() for _ in range(self.size)], return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"[BrowserPool] 대기 페이지 생성 실패: {str(result)}")
+                continue
+            self._pages.put_nowait(result)
+
+        self.ready = True
+        logger.info(f"[BrowserPool] 브라우저 풀 워밍업 완료 (준비된 페이지 {self._pages.qsize()}개)")
+
+
+    async def acquire(self) -> Tuple[BrowserContext, Page]:
+        context, page = None, None
+        while not self._pages.empty():
+            context, page = self._pages.get_nowait()
+            if context.browser is self.browser:
+                break
+            ## 교체 전 브라우저에서 만들어진 대기 페이지는 버림
+            await self._close_context(context)
+            context, page = None, None
+
+        if context is None:
+            logger.info(f"[BrowserPool] 준비된 페이지가 없어 새로 생성")
+            context, page = await self._new_ready_page()
+        self._leases[context.browser] = self._leases.get(context.browser, 0) + 1
+        return context, page
+
+
+    async def new_context(self, **kwargs) -> BrowserContext:
+        """대기 페이지 없이 현재 브라우저에 컨텍스트 생성 (HAR 기록/재생 등 옵션이 다른 컨텍스트용, release로 반환)"""
+        context = await self.browser.new_context(**kwargs)
+        self._leases[context.browser] = self._leases.get(context.browser, 0) + 1
+        return context
+
+
+    async def release(self, context: BrowserContext):
+        browser = context.browser
+        await self._close_context(context)
+
+        if browser in self._leases:
+            self._leases[browser] = max(0, self._leases[browser] - 1)
+            await self._close_if_drained(browser)
+        self._schedule_refill()
+
+
+    def rss_mb(self) -> float:
+        """풀이 띄운 현재 브라우저 프로세스 트리의 RSS 합계(MB)"""
+        return get_browser_rss_mb(self.marker)
+
+
+    async def recycle(self, stale_browser: Browser):
+        """
+        메모리 임계치를 넘은 브라우저를 새 브라우저로 교체
+        - 여러 요청이 같은 브라우저로 동시에 요청해도 한 번만 교체 (이미 교체됐으면 무시)
+        - 이전 브라우저의 대기 페이지는 버리고, 사용 중인 컨텍스트가 모두 반환되면 종료
+        """
+        async with self._recycle_lock:
+            if stale_browser is not self.browser or not self.ready:
+                return
+
+            logger.info(f"[BrowserPool] 브라우저 교체 시작 (메모리: {self.rss_mb():.2f} MB, 사용 중인 컨텍스트: {self._leases.get(stale_browser, 0)})")
+            await self._launch()
+            self._retired.add(stale_browser)
+
+            while not self._pages.empty():
+                context, _ = self._pages.get_nowait()
+                await self._close_context(context)
+            for _ in range(self.size):
+                self._schedule_refill()
+
+            await self._close_if_drained(stale_browser)
+            logger.info(f"[BrowserPool] 브라우저 교체 완료")
+
+
+    async def close(self):
+        self.ready = False
+        for task in list(self._refill_tasks):
+            task.cancel()
+
+        try:
+            for browser in [*self._retired, self.browser]:
+                if browser is not None:
+                    await browser.close()
+            if self.playwright is not None:
+                await self.playwright.stop()
+        except Exception as e:
+            logger.warning(f"[BrowserPool] 브라우저 종료 중 오류: {str(e)}")
+        finally:
+            self.browser = None
+            self.marker = None
+            self.playwright = None
+            self._pages = asyncio.Queue()
+            self._leases = {}
+            self._retired = set()
+        logger.info(f"[BrowserPool] 브라우저 풀 종료")
+
+
+browser_pool = BrowserPool()
@@ -0,0 +1,121 @@
+import re
+
+from typing import List, Optional
+from collections import Counter, defaultdict
+
+# 한글 음절의 초성 (가 = 0xAC00, 초성 하나당 21 * 28 = 588 음절)
+CHOSEONG_LIST = [
+    'ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+    'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ'
+]
+CHOSEONG_SET = set(CHOSEONG_LIST)
+CORP_NAME_NOISE_PATTERN = re.compile(r'\(주\)|㈜|주식회사|\(유\)|유한회사|\s+')
+
+
+def normalize_company_name(name: str) -> str:
+    """검색용 기업명 정규화 ('(주)', '주식회사', 공백 제거, 영문 소문자)"""
+    if not isinstance(name, str):
+        return ""
+    return CORP_NAME_NOISE_PATTERN.sub('', name).lower()
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절을 초성으로 변환 ('삼성전자' → 'ㅅㅅㅈㅈ'), 한글이 아닌 문자는 그대로 유지"""
+    chars = []
+    for char in text:
+        code = ord(char)
+        if 0xAC00 <= code <= 0xD7A3:
+            chars.append(CHOSEONG_LIST[(code - 0xAC00) // 588])
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+def char_ngrams(text: str, n: int = 2) -> set:
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i+n] for i in range(len(text) - n + 1)}
+
+
+class CompanyNameIndex:
+    """
+    기업명 문자 bigram 역색인
+    - 음절 bigram 색인과 초성 bigram 색인을 함께 유지하여 '삼성전', 'ㅅㅅㅈㅈ' 같은 입력 모두 지원
+    - 후보는 bigram Dice 유사도 + 완전 일치/접두 일치/포함 가산점으로 순위화
+    """
+
+    def __init__(self):
+        self.entries: List[dict] = []
+        self._names: List[str] = []
+        self._grams: List[set] = []
+        self._choseong_names: List[str] = []
+        self._choseong_grams: List[set] = []
+        self._postings = defaultdict(list)
+        self._choseong_postings = defaultdict(list)
+
+
+    def __len__(self):
+        return len(self.entries)
+
+
+    def add(self, entry: dict):
+        """entry : corp_name, stock_code, corp_code, market 등을 담은 dict"""
+        entry_id = len(self.entries)
+        name = normalize_company_name(entry['corp_name'])
+        choseong_name = to_choseong(name)
+
+        grams = char_ngrams(name)
+        choseong_grams = char_ngrams(choseong_name)
+        for gram in grams:
+            self._postings[gram].append(entry_id)
+        for gram in choseong_grams:
+            self._choseong_postings[gram].append(entry_id)
+
+        self.entries.append(entry)
+        self._names.append(name)
+        self._grams.append(grams)
+        self._choseong_names.append(choseong_name)
+        self._choseong_grams.append(choseong_grams)
+
+
+    def search(self, query: str, market: Optional[str] = None, limit: int = 10) -> List[dict]:
+        """
+        기업명 후보를 점수 순으로 반환
+
+        :param market: 법인 유형 코드 (P, A, N, E), None 또는 'all'이면 전체
+        :return: [{"corp_name", "stock_code", "corp_code", "market", ..., "score"}, ...]
+        """
+        query = normalize_company_name(query)
+        if not query:
+            return []
+
+        ## 초성만 입력한 경우 초성 색인 사용
+        use_choseong = all(char in CHOSEONG_SET for char in query)
+        names = self._choseong_names if use_choseong else self._names
+        grams_list = self._choseong_grams if use_choseong else self._grams
+        postings = self._choseong_postings if use_choseong else self._postings
+
+        query_grams = char_ngrams(query)
+        shared_counts = Counter()
+        for gram in query_grams:
+            shared_counts.update(postings.get(gram, []))
+
+        scored = []
+        for entry_id, shared in shared_counts.items():
+            entry = self.entries[entry_id]
+            if market and market != "all" and entry.get('market') != market:
+                continue
+
+            name = names[entry_id]
+            score = 2 * shared / (len(query_grams) + len(grams_list[entry_id]))
+            if name == query:
+                score += 1.0
+            elif name.startswith(query):
+                score += 0.5
+            elif query in name:
+                score += 0.25
+
+            scored.append((score, len(name), entry_id))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [{**self.entries[entry_id], "score": round(score, 4)} for score, _, entry_id in scored[:limit]]
@@ -6,8 +6,11 @@ import pandas as pd
 import xml.etree.ElementTree as ET
 import datetime
 
-from aiohttp import ClientSession
+from functools import lru_cache
 
+from app.src.company_index import CompanyNameIndex, normalize_company_name
+from app.src.http_client import http_client
+from app.src.registry_snapshot import REGISTRY_SNAPSHOT_DIR, open_snapshot, write_snapshot
 from app.utils.logging import logger
 
 INDUSTRY_CORPS_FILE_PATH = {
@@ -16,6 +19,193 @@ INDUSTRY_CORPS_FILE_PATH = {
     "N": "/playwright-crawler/data/corp_overview/industry_corps_N_20250606_125856.csv",
     "E": "/playwright-crawler/data/corp_overview/industry_corps_E_20250607_085405.csv"
 }
+CORP_CODE_FILE_PATH = "/playwright-crawler/data/corp_codes/corp_code.csv"
+# 부분 일치 시 이 점수 미만의 후보는 다른 기업일 가능성이 높으므로 사용하지 않음
+COMPANY_MATCH_MIN_SCORE = 0.5
+
+
+@lru_cache(maxsize=None)
+def load_industry_corps(corp_type_value: str) -> pd.DataFrame:
+    """
+    법인 유형별 industry_corps_*.csv 파일을 읽어 캐시
+    반환된 DataFrame은 공유되므로 호출 측에서 수정하지 않아야 함
+    """
+    return pd.read_csv(INDUSTRY_CORPS_FILE_PATH[corp_type_value], dtype={'stock_code': str})
+
+
+@lru_cache(maxsize=None)
+def load_corp_code_df() -> pd.DataFrame:
+    """corp_code.csv 파일을 읽어 캐시"""
+    return pd.read_csv(CORP_CODE_FILE_PATH, dtype={'corp_code': str, 'stock_code': str})
+
+
+def registry_sources() -> list:
+    return list(INDUSTRY_CORPS_FILE_PATH.values()) + [CORP_CODE_FILE_PATH]
+
+
+@lru_cache(maxsize=None)
+def get_registry_snapshot():
+    """컴파일된 기업 레지스트리 스냅샷 (없거나 원본보다 오래되었으면 None → CSV 사용)"""
+    return open_snapshot(registry_sources())
+
+
+def compile_registry_snapshot(snapshot_dir: str = REGISTRY_SNAPSHOT_DIR):
+    """기업 CSV들을 메모리 매핑용 스냅샷으로 컴파일 (python -m app.src.registry_snapshot)"""
+    tables = {"companies": build_company_table()}
+    if os.path.exists(CORP_CODE_FILE_PATH):
+        tables["corp_codes"] = load_corp_code_df()
+    else:
+        tables["corp_codes"] = pd.DataFrame(columns=['corp_code', 'corp_name', 'stock_code', 'modify_date'])
+
+    write_snapshot(tables, registry_sources(), snapshot_dir)
+    logger.info(f"[compile_registry_snapshot] 스냅샷 컴파일 완료: {snapshot_dir} (기업 {len(tables['companies'])}개, 고유번호 {len(tables['corp_codes'])}개)")
+
+
+def preload_company_data():
+    """기업 검색에 사용하는 CSV 파일들을 미리 읽어 캐시에 적재"""
+    if get_registry_snapshot() is not None:
+        logger.info(f"[preload_company_data] 레지스트리 스냅샷 사용, CSV 적재 생략")
+        return
+
+    for corp_type_value, file_path in INDUSTRY_CORPS_FILE_PATH.items():
+        if os.path.exists(file_path):
+            load_industry_corps(corp_type_value)
+        else:
+            logger.warning(f"[preload_company_data] 파일이 존재하지 않습니다: {file_path}")
+
+    if os.path.exists(CORP_CODE_FILE_PATH):
+        load_corp_code_df()
+    else:
+        logger.warning(f"[preload_company_data] 파일이 존재하지 않습니다: {CORP_CODE_FILE_PATH}")
+
+    logger.info(f"[preload_company_data] 기업 정보 캐시 적재 완료")
+
+
+@lru_cache(maxsize=None)
+def get_company_index() -> CompanyNameIndex:
+    """industry_corps_*.csv 전체 기업명으로 n-gram 검색 색인을 만들어 캐시"""
+    snapshot = get_registry_snapshot()
+    if snapshot is not None:
+        index = CompanyNameIndex()
+        companies = snapshot["companies"]
+        for row_id in range(len(companies)):
+            row = companies.row(row_id)
+            index.add({column: row[column] for column in ['corp_name', 'stock_code', 'corp_code', 'market', 'level1', 'level2', 'level3', 'level4', 'level5']})
+        logger.info(f"[get_company_index] 스냅샷으로 기업명 색인 생성 완료: {len(index)}개")
+        return index
+
+    corp_codes = {}
+    if os.path.exists(CORP_CODE_FILE_PATH):
+        corp_code_df = load_corp_code_df()
+        corp_codes = dict(zip(zip(corp_code_df['corp_name'], corp_code_df['stock_code']), corp_code_df['corp_code']))
+
+    index = CompanyNameIndex()
+    for corp_type, file_path in INDUSTRY_CORPS_FILE_PATH.items():
+        if not os.path.exists(file_path):
+            logger.warning(f"[get_company_index] 파일이 존재하지 않습니다: {file_path}")
+            continue
+
+        corps_df = load_industry_corps(corp_type)
+        for row in corps_df.to_dict('records'):
+            if not isinstance(row['corp_name'], str):
+                continue
+            stock_code = row['stock_code'] if isinstance(row['stock_code'], str) else None
+            index.add({
+                'corp_name': row['corp_name'],
+                'stock_code': stock_code,
+                'corp_code': corp_codes.get((row['corp_name'], stock_code)),
+                'market': corp_type,
+                'level1': row.get('level1', ''),
+                'level2': row.get('level2', ''),
+                'level3': row.get('level3', ''),
+                'level4': row.get('level4', ''),
+                'level5': row.get('level5', '')
+            })
+
+    logger.info(f"[get_company_index] 기업명 색인 생성 완료: {len(index)}개")
+    return index
+
+
+@lru_cache(maxsize=None)
+def load_company_table() -> pd.DataFrame:
+    """
+    모든 법인 유형의 industry_corps 파일을 하나로 합친 기업 테이블 (market, corp_code, name_key 컬럼 추가)
+    반환된 DataFrame은 공유되므로 호출 측에서 수정하지 않아야 함
+    """
+    snapshot = get_registry_snapshot()
+    if snapshot is not None:
+        return snapshot["companies"].to_frame()
+    return build_company_table()
+
+
+def build_company_table() -> pd.DataFrame:
+    """industry_corps CSV와 corp_code.csv로 기업 테이블 생성"""
+    frames = []
+    for corp_type, file_path in INDUSTRY_CORPS_FILE_PATH.items():
+        if not os.path.exists(file_path):
+            logger.warning(f"[load_company_table] 파일이 존재하지 않습니다: {file_path}")
+            continue
+        frames.append(load_industry_corps(corp_type).assign(market=corp_type))
+
+    companies_df = pd.concat(frames, ignore_index=True)
+    companies_df = companies_df[companies_df['corp_name'].notna()]
+
+    if os.path.exists(CORP_CODE_FILE_PATH):
+        corp_code_df = load_corp_code_df()[['corp_name', 'stock_code', 'corp_code']].drop_duplicates(['corp_name', 'stock_code'])
+        companies_df = companies_df.merge(corp_code_df, on=['corp_name', 'stock_code'], how='left')
+    else:
+        companies_df = companies_df.assign(corp_code=None)
+
+    return companies_df.assign(name_key=companies_df['corp_name'].map(normalize_company_name))
+
+
+def resolve_companies(queries: list, default_corp_type_value: str = "all") -> dict:
+    """
+    기업명 목록을 한 번의 join으로 (stock_code, corp_code, 산업 분류) 정보로 변환
+
+    Parameters:
+    queries (list): 기업명 문자열 또는 {"corp_name": ..., "corp_type_value": ...} dict 목록
+    default_corp_type_value (str): 법인 유형이 지정되지 않은 항목에 사용할 법인 유형 코드
+
+    Returns:
+    dict: {"matches": [...], "ambiguous": [...], "misses": [...]}
+          ambiguous는 동일 기업명이 여러 건인 경우 후보 목록, misses는 색인 기반 추천 후보 포함
+    """
+    query_df = pd.DataFrame([
+        {"corp_name": query, "corp_type_value": default_corp_type_value} if isinstance(query, str)
+        else {"corp_name": query["corp_name"], "corp_type_value": query.get("corp_type_value") or default_corp_type_value}
+        for query in queries
+    ], columns=["corp_name", "corp_type_value"])
+    query_df["query_id"] = range(len(query_df))
+    query_df["name_key"] = query_df["corp_name"].map(normalize_company_name)
+
+    columns = ['name_key', 'corp_name', 'stock_code', 'corp_code', 'market', 'level1', 'level2', 'level3', 'level4', 'level5']
+    joined = query_df.merge(load_company_table()[columns], on='name_key', how='inner', suffixes=('_query', ''))
+    joined = joined[(joined['corp_type_value'] == 'all') | (joined['corp_type_value'] == joined['market'])]
+    joined = joined.astype(object).where(joined.notna(), None)
+
+    candidates_by_query = {}
+    for query_id, candidate in zip(joined['query_id'], joined[columns[1:]].to_dict('records')):
+        candidates_by_query.setdefault(query_id, []).append(candidate)
+
+    result = {"matches": [], "ambiguous": [], "misses": []}
+    for row in query_df.itertuples(index=False):
+        count = len(candidates_by_query.get(row.query_id, []))
+        if count == 1:
+            result["matches"].append({"query": row.corp_name, **candidates_by_query[row.query_id][0]})
+        elif count > 1:
+            result["ambiguous"].append({"query": row.corp_name, "candidates": candidates_by_query[row.query_id]})
+        else:
+            suggestions = [c for c in get_company_index().search(row.corp_name, market=row.corp_type_value, limit=3) if c['score'] >= COMPANY_MATCH_MIN_SCORE]
+            result["misses"].append({"query": row.corp_name, "suggestions": suggestions})
+
+    logger.info(f"[resolve_companies] 기업 {len(query_df)}건 변환: 일치 {len(result['matches'])}, 중복 {len(result['ambiguous'])}, 실패 {len(result['misses'])}")
+    return result
+
+
+def autocomplete_company(query: str, corp_type_value: str = "all", limit: int = 10):
+    """기업명 자동완성 후보 (corp_code, stock_code, market 포함, 점수 순)"""
+    return get_company_index().search(query, market=corp_type_value, limit=limit)
 
 async def get_corp_code_df(file_path: str):
     """
@@ -35,12 +225,8 @@ async def get_corp_code_df(file_path: str):
     url = "https://opendart.fss.or.kr/api/corpCode.xml"
     params = {"crtfc_key": os.getenv("DART_API_KEY")}
     
-    async with ClientSession() as session:
-        async with session.get(url, params=params) as response:
-            if response.status != 200:
-                raise Exception(f"API 요청 실패: {response.status}")
-            
-            content = await response.read()
+    # 고유번호 ZIP은 변경 시에만 다시 받도록 조건부 요청 캐시 사용
+    content = await http_client.get(url, params=params, use_cache=True)
             
     with zipfile.ZipFile(io.BytesIO(content), "r") as zip_ref:
         file_name = zip_ref.namelist()[0]  # ZIP 파일 내부의 XML 파일명
@@ -86,7 +272,19 @@ def find_corp_code(corp_name, stock_code):
     str: 해당 기업의 고유코드(corp_code)
         찾지 못한 경우 None 반환
     """
-    corp_code_df = pd.read_csv(f"/playwright-crawler/data/corp_codes/corp_code.csv", dtype={'corp_code': str, 'stock_code': str})
+    snapshot = get_registry_snapshot()
+    if snapshot is not None:
+        rows = [row for row in snapshot["corp_codes"].lookup('stock_code', stock_code) if row['corp_code']]
+        for row in rows:
+            if row['corp_name'] == corp_name:
+                return row['corp_code']
+        for row in rows:
+            if corp_name.lower() in (row['corp_name'] or '').lower():
+                logger.info(f"정확한 일치 결과가 없어 부분 일치 결과를 반환합니다: {row['corp_name']} ({row['corp_code']})")
+                return row['corp_code']
+        return None
+
+    corp_code_df = load_corp_code_df()
 
     # corp_code가 비어있지 않은 row들만 필터링
     valid_df = corp_code_df[corp_code_df['corp_code'].notna() & (corp_code_df['corp_code'] != '')]
@@ -139,9 +337,15 @@ def find_stock_code(corp_name, corp_type_value):
             logger.error(f"지원되지 않는 법인 유형: {corp_type_value}")
             return None
     
+    snapshot = get_registry_snapshot()
+    if snapshot is not None:
+        rows = [row for row in snapshot["companies"].lookup('corp_name', corp_name) if row['market'] == corp_type_value and row['stock_code'] and row['stock_code'].strip() and row['stock_code'] != 'nan']
+        if rows:
+            return rows[0]['stock_code']
+
     try:
         # 파일 읽기
-        corp_code_df = pd.read_csv(INDUSTRY_CORPS_FILE_PATH[corp_type_value], dtype={'stock_code': str})
+        corp_code_df = load_industry_corps(corp_type_value)
         
         # stock_code 열을 문자열로 변환
         # corp_code_df['stock_code'] = corp_code_df['stock_code'].astype(str)
@@ -160,12 +364,12 @@ def find_stock_code(corp_name, corp_type_value):
         if not exact_match.empty:
             return exact_match.iloc[0]['stock_code']
         
-        # 정확히 일치하는 경우가 없으면 부분 일치 검색
-        partial_match = valid_df[valid_df['corp_name'].str.contains(corp_name, case=False, na=False)]
+        # 정확히 일치하는 경우가 없으면 기업명 색인에서 가장 유사한 기업 검색
+        candidates = [c for c in get_company_index().search(corp_name, market=corp_type_value) if c['stock_code'] and c['score'] >= COMPANY_MATCH_MIN_SCORE]
         
-        if not partial_match.empty:
-            logger.info(f"정확한 일치 결과가 없어 부분 일치 결과를 반환합니다: {partial_match.iloc[0]['corp_name']}")
-            return partial_match.iloc[0]['stock_code']
+        if candidates:
+            logger.info(f"정확한 일치 결과가 없어 가장 유사한 결과를 반환합니다: {candidates[0]['corp_name']} (score: {candidates[0]['score']})")
+            return candidates[0]['stock_code']
         
         logger.warning(f"기업을 찾을 수 없습니다: {corp_name}")
         return None
@@ -201,6 +405,28 @@ def search_company(corp_name, corp_type_value):
         if corp_type_value in INDUSTRY_CORPS_FILE_PATH:
             search_files = [(corp_type_value, INDUSTRY_CORPS_FILE_PATH[corp_type_value])]
     
+    # 스냅샷이 있으면 기업명 색인으로 바로 조회 (법인 유형 파일 순서대로 첫 번째 일치)
+    snapshot = get_registry_snapshot()
+    if snapshot is not None:
+        search_files = []
+        rows = snapshot["companies"].lookup('corp_name', corp_name)
+        for corp_type in INDUSTRY_CORPS_FILE_PATH:
+            row = next((row for row in rows if row['market'] == corp_type and (corp_type_value == "all" or corp_type_value == corp_type)), None)
+            if row is None:
+                continue
+
+            return {
+                'corp_name': row['corp_name'],
+                'stock_code': row['stock_code'],
+                'corp_code': row['corp_code'] or find_corp_code(row['corp_name'], row['stock_code']),
+                'corp_type': corp_type,
+                'level1': row['level1'] or '',
+                'level2': row['level2'] or '',
+                'level3': row['level3'] or '',
+                'level4': row['level4'] or '',
+                'level5': row['level5'] or ''
+            }
+
     # 모든 파일을 검색
     for corp_type, file_path in search_files:
         try:
@@ -210,7 +436,7 @@ def search_company(corp_name, corp_type_value):
                 continue
             
             # 파일 읽기
-            corps_df = pd.read_csv(file_path, dtype={'stock_code': str})
+            corps_df = load_industry_corps(corp_type)
             
             # 정확히 일치하는 경우 검색
             exact_match = corps_df[corps_df['corp_name'] == corp_name]
@@ -232,29 +458,27 @@ def search_company(corp_name, corp_type_value):
                     'level5': row.get('level5', '')
                 }
             
-            # 부분 일치 검색
-            partial_match = corps_df[corps_df['corp_name'].str.contains(corp_name, case=False, na=False)]
-            
-            if not partial_match.empty:
-                row = partial_match.iloc[0]
-                stock_code = row['stock_code']
-                corp_code = find_corp_code(row['corp_name'], stock_code)
-                
-                return {
-                    'corp_name': row['corp_name'],
-                    'stock_code': stock_code,
-                    'corp_code': corp_code,
-                    'corp_type': corp_type,
-                    'level1': row.get('level1', ''),
-                    'level2': row.get('level2', ''),
-                    'level3': row.get('level3', ''),
-                    'level4': row.get('level4', ''),
-                    'level5': row.get('level5', '')
-                }
-        
         except Exception as e:
             logger.error(f"{corp_type} 시장에서 기업 정보 검색 중 오류 발생: {e}")
             continue
     
+    # 정확히 일치하는 기업이 없으면 기업명 색인에서 가장 유사한 기업 선택
+    candidates = get_company_index().search(corp_name, market=corp_type_value, limit=1)
+    if candidates and candidates[0]['score'] >= COMPANY_MATCH_MIN_SCORE:
+        candidate = candidates[0]
+        logger.info(f"정확한 일치 결과가 없어 가장 유사한 결과를 반환합니다: {candidate['corp_name']} (score: {candidate['score']})")
+        
+        return {
+            'corp_name': candidate['corp_name'],
+            'stock_code': candidate['stock_code'],
+            'corp_code': find_corp_code(candidate['corp_name'], candidate['stock_code']),
+            'corp_type': candidate['market'],
+            'level1': candidate['level1'],
+            'level2': candidate['level2'],
+            'level3': candidate['level3'],
+            'level4': candidate['level4'],
+            'level5': candidate['level5']
+        }
+    
     logger.warning(f"기업을 찾을 수 없습니다: 기업명={corp_name}, 법인유형={corp_type_value}")
     return None
\ No newline at end of file
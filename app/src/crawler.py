@@ -1,5 +1,8 @@
+import os
 import re
+import gc
 import asyncio
+import tempfile
 import pandas as pd
 
 from typing import Optional
@@ -7,64 +10,296 @@ from pymongo import MongoClient
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext, ElementHandle
+from playwright.async_api import async_playwright, Page, Frame, Browser, BrowserContext, ElementHandle
 
 from app.src.corp_code import search_company
+from app.src.journal import CrawlJournal
+from app.src.recycle import RecyclePolicy, get_browser_rss_mb, new_browser_marker
+from app.src.toc import parse_toc_nodes, select_statement_nodes, build_viewer_url, section_matches_units
+from app.src.parser import SNAPSHOT_TABLES_JS, parse_in_pool
+from app.src.report_selection import select_latest_reports, get_fiscal_year
+from app.src.opendart import OpenDartClient
+from app.src.validation import validate_datasets, invalidate_failed_units
+from app.src.taxonomy import add_canonical_accounts
+from app.src.har_archive import HarArchive
+from app.src.hedging import NavigationHedger, REPORT_NAVIGATION, VIEWER_NAVIGATION
+from app.src.deadline import Deadline, DeadlineExceeded
+from app.src.scheduler import CrawlScheduler, INTERACTIVE
 from app.utils.time import get_current_korea_time
 from app.utils.data import clean_account_name, clean_paragraph_text, extract_year_from_report_title
 from app.utils.logging import logger
 
+# 재무제표 섹션 이동 방식 (tree : 좌측 트리 클릭, toc : 목차 데이터로 뷰어 URL 직접 로드)
+NAVIGATION_MODES = ["tree", "toc"]
+# 보고서 검색 방식 (form : 검색 폼 입력, direct : corp_code로 상세검색 직접 조회 + 전체 페이지 수집)
+SEARCH_MODES = ["form", "direct"]
+# 테이블 추출 방식 (locator : 셀 단위 locator 조회, snapshot : 테이블 스냅샷 1회 추출 후 프로세스 풀에서 파싱)
+EXTRACTION_MODES = ["locator", "snapshot"]
+
+
+class ReportExtractionError(Exception):
+    pass
+
 
 class FinancialStatementCrawler:
     INIT_URL = "https://dart.fss.or.kr/main.do"
+    DETAIL_SEARCH_URL = "https://dart.fss.or.kr/dsab007/detailSearch.ax"
+    DETAIL_SEARCH_MAX_RESULTS = 100
     TARGET_SJ_LIST = [
         "연결재무제표", "재무제표",
         "연결재무상태표", "연결손익계산서", "연결포괄손익계산서", 
         "재무상태표", "손익계산서", "포괄손익계산서",
     ]
 
-    def __init__(self, headless: bool = True):
+    RETRY_BACKOFF_SECONDS = 2
+    BROWSER_ARGS = [
+        '--no-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-gpu',
+        '--disable-extensions',
+        '--disable-software-rasterizer',
+        '--disable-background-timer-throttling',
+        '--disable-backgrounding-occluded-windows',
+        '--disable-renderer-backgrounding',
+        '--disable-features=TranslateUI',
+        '--disable-blink-features=AutomationControlled',
+        '--window-size=1920,1080'
+    ]
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+    def __init__(
+        self,
+        headless: bool = True,
+        recycle_policy: Optional[RecyclePolicy] = None,
+        browser_pool=None,
+        navigation_mode: str = "tree",
+        search_mode: str = "form",
+        prefetch_window: int = 0,
+        extraction_mode: str = "locator",
+        select_latest: bool = True,
+        api_client: Optional[OpenDartClient] = None,
+        validate: bool = True,
+        har_mode: str = "off",
+        section_concurrency: int = 1,
+        hedger: Optional[NavigationHedger] = None,
+        deadline: Optional[Deadline] = None,
+        scheduler: Optional[CrawlScheduler] = None,
+        priority: str = INTERACTIVE,
+    ):
         self.headless = headless
+        # 여러 요청이 공유하는 작업 슬롯 스케줄러와 이 요청의 우선순위 클래스 (interactive / backfill)
+        self.scheduler = scheduler
+        self.priority = priority
+        # 요청 기한 (기한이 지나면 수집한 보고서까지만 반환하고 나머지는 pending_reports로 남김)
+        self.deadline = deadline
+        self.partial = False
+        self.pending_reports = []
+        # 보고서/섹션 로드가 최근 지연 시간 백분위수를 넘기면 새 페이지에서 중복 로드 (app.src.hedging)
+        # HAR 기록 중에는 중복 로드 트래픽이 HAR에 섞이고, 재생 중에는 네트워크가 없어 의미가 없으므로 사용하지 않음
+        self.hedger = hedger if har_mode == "off" else None
+        # 목차 탐색 시 한 보고서의 재무제표 섹션을 동시에 여는 페이지 수 (1 : iframe에서 순차 수집)
+        self.section_concurrency = max(1, section_concurrency)
+        # 보고서 단위 HAR 기록/재생 (off : 사용 안 함, record : 보고서별 HAR 저장, replay : 저장된 HAR로 네트워크 없이 수집)
+        self.har_mode = har_mode
+        self.har_archive: Optional[HarArchive] = None
+        # OpenDART API 클라이언트가 주어지면 보고서 목록/재무제표를 API로 먼저 조회하고, API에 없는 보고서만 브라우저로 수집
+        self.api_client = api_client
+        # 보고서 수집 후 재무제표 검증, 실패한 단위는 저널에서 재추출 대상으로 표시
+        self.validate = validate
+        self.invalid_units = []
+        # 재추출 중인 보고서에서 다시 기록할 sj_div (None이면 전체 기록)
+        self.unit_filter = None
+        # 같은 회계 기간의 원본/정정 보고서 중 최신 보고서만 수집
+        self.select_latest = select_latest
+        self.skipped_reports = []
+        # 테이블 추출 방식 (EXTRACTION_MODES)
+        if extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(f"extraction_mode는 {EXTRACTION_MODES} 중 하나여야 합니다: {extraction_mode}")
+        self.extraction_mode = extraction_mode
+        # 현재 보고서를 파싱하는 동안 다음 보고서를 미리 로드할 대기 페이지 수 (0 : 사용 안 함)
+        self.prefetch_window = prefetch_window
+        self._prefetched = {}
+        # 보고서 검색 방식 (SEARCH_MODES)
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"search_mode는 {SEARCH_MODES} 중 하나여야 합니다: {search_mode}")
+        self.search_mode = search_mode
+        # 재무제표 섹션 이동 방식 (NAVIGATION_MODES)
+        if navigation_mode not in NAVIGATION_MODES:
+            raise ValueError(f"navigation_mode는 {NAVIGATION_MODES} 중 하나여야 합니다: {navigation_mode}")
+        self.navigation_mode = navigation_mode
+        # 앱 수명 동안 공유되는 BrowserPool (app.src.browser_pool) 이 주어지면 워밍업된 페이지를 사용
+        self.browser_pool = browser_pool
         self.playwright = None
         self.browser = None
+        self.browser_marker = None
         self.context = None
         self.page = None
 
+        self.journal: Optional[CrawlJournal] = None
+        self._replay_journal_dir: Optional[tempfile.TemporaryDirectory] = None
+        # 수집 중인 보고서의 사업연도 (데이터셋의 bsns_year, 당기/전기/전전기 연도 기준)
+        self.current_fiscal_year = None
+        self.failed_reports = []
 
-    async def init_browser(self):
-        logger.info(f"[init] playwright 브라우저 초기화 시작")
-        self.playwright = await async_playwright().start()
+        # 장시간 수집 시 메모리 증가를 막기 위한 컨텍스트/브라우저 재활용 상태
+        self.recycle_policy = recycle_policy if recycle_policy else RecyclePolicy()
+        self.reports_in_context = 0
+        self.contexts_in_browser = 0
+
+
+    def _timeout(self, default_ms: int) -> int:
+        """Playwright 대기 시간 (기한이 있으면 남은 시간 이내로 줄임)"""
+        if self.deadline is None:
+            return default_ms
+        return self.deadline.timeout_ms(default_ms)
+
+
+    def check_deadline(self, stage: str):
+        if self.deadline is not None:
+            self.deadline.check(stage)
+
+
+    async def _launch_browser(self):
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+
+        ## 같은 컨테이너의 다른 브라우저와 구분해 이 브라우저의 메모리만 측정하기 위한 표식
+        self.browser_marker = new_browser_marker()
         self.browser = await self.playwright.chromium.launch(
             headless=self.headless,
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-gpu',
-                '--disable-extensions',
-                '--disable-software-rasterizer',
-                '--disable-background-timer-throttling',
-                '--disable-backgrounding-occluded-windows',
-                '--disable-renderer-backgrounding',
-                '--disable-features=TranslateUI',
-                '--disable-blink-features=AutomationControlled',
-                '--window-size=1920,1080'
-            ]
+            args=[*self.BROWSER_ARGS, self.browser_marker]
         )
+        self.contexts_in_browser = 0
 
-        self.context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
 
-        self.page = await self.context.new_page()
-        logger.info(f"[init] 브라우저 초기화 완료")
+    async def _new_context(self):
+        if self.browser_pool is not None:
+            self.context, self.page = await self.browser_pool.acquire()
+        else:
+            self.context = await self.browser.new_context(
+                viewport={'width': 1920, 'height': 1080},
+                user_agent=self.USER_AGENT
+            )
+            self.page = await self.context.new_page()
+        self.reports_in_context = 0
+        self.contexts_in_browser += 1
+
+
+    async def ensure_browser(self):
+        """페이지 없이 브라우저만 준비 (HAR 재생 시 DART 접속 없이 보고서별 컨텍스트만 사용)"""
+        if self.browser is not None:
+            return
+        if self.browser_pool is not None:
+            self.browser = self.browser_pool.browser
+        else:
+            await self._launch_browser()
+
+
+    async def init_browser(self):
+        logger.info(f"[init] playwright 브라우저 초기화 시작")
+        if self.browser is None and self.browser_pool is not None:
+            ## 워밍업된 페이지는 이미 DART 메인 페이지에 접속된 상태
+            self.browser = self.browser_pool.browser
+            await self._new_context()
+            logger.info(f"[init] 브라우저 풀에서 준비된 페이지 사용")
+            return True
+
+        if self.browser is None:
+            await self._launch_browser()
+            await self._new_context()
+            logger.info(f"[init] 브라우저 초기화 완료")
+        else:
+            ## 재시도 시에는 이미 띄운 브라우저를 재사용
+            logger.info(f"[init] 기존 브라우저 재사용")
 
-        await self.page.goto(self.INIT_URL, wait_until='networkidle', timeout=60000)
+        await self.page.goto(self.INIT_URL, wait_until='networkidle', timeout=self._timeout(60000))
         logger.info(f"[init] DART 페이지 접속 완료")
 
         await self.page.screenshot(path=f'/playwright-crawler/screenshots/00_init.png')
 
         return True
+
+
+    async def rotate_context(self):
+        """현재 페이지/컨텍스트를 닫고 같은 브라우저에서 새 컨텍스트를 생성"""
+        logger.info(f"[rotate_context] 컨텍스트 교체 (처리 보고서 수: {self.reports_in_context})")
+        if self.browser_pool is not None:
+            await self.browser_pool.release(self.context)
+            await self._new_context()
+            return
+
+        try:
+            await self.context.close()
+        except Exception as e:
+            logger.warning(f"[rotate_context] 컨텍스트 종료 실패: {str(e)}")
+
+        await self._new_context()
+
+
+    async def relaunch_browser(self):
+        """브라우저를 종료하고 새로 띄움"""
+        logger.info(f"[relaunch_browser] 브라우저 재시작 (교체된 컨텍스트 수: {self.contexts_in_browser})")
+        if self.browser_pool is not None:
+            ## 공유 브라우저는 다른 요청도 사용 중이므로 풀에서 교체 (이전 브라우저는 사용 중인 컨텍스트가 모두 반환되면 종료)
+            await self.browser_pool.recycle(self.context.browser)
+            self.browser = self.browser_pool.browser
+            self.contexts_in_browser = 0
+            await self.rotate_context()
+            return
+
+        try:
+            await self.browser.close()
+        except Exception as e:
+            logger.warning(f"[relaunch_browser] 브라우저 종료 실패: {str(e)}")
+
+        gc.collect()
+        await self._launch_browser()
+        await self._new_context()
+
+
+    async def maybe_recycle(self):
+        """보고서 사이에서 재활용 정책에 따라 컨텍스트 또는 브라우저를 교체"""
+        if self.browser_pool is not None:
+            rss_mb = self.browser_pool.rss_mb()
+        else:
+            rss_mb = get_browser_rss_mb(self.browser_marker)
+        decision = self.recycle_policy.decide(self.reports_in_context, self.contexts_in_browser, rss_mb)
+        logger.info(f"[maybe_recycle] 브라우저 메모리: {rss_mb:.2f} MB, 컨텍스트 처리 보고서 수: {self.reports_in_context}, 결정: {decision}")
+
+        if decision != RecyclePolicy.NONE:
+            ## 미리 로드 중인 페이지는 교체될 컨텍스트에 속하므로 먼저 정리
+            await self.discard_prefetch()
+
+        if decision == RecyclePolicy.BROWSER:
+            await self.relaunch_browser()
+        elif decision == RecyclePolicy.CONTEXT:
+            await self.rotate_context()
+
+
+    def _cleanup_replay_journal(self):
+        if self._replay_journal_dir is not None:
+            self._replay_journal_dir.cleanup()
+            self._replay_journal_dir = None
+
+
+    async def close(self):
+        """브라우저와 playwright 종료 (브라우저 풀 사용 시 컨텍스트만 반환)"""
+        self._cleanup_replay_journal()
+        try:
+            if self.browser_pool is not None:
+                if self.context is not None:
+                    await self.browser_pool.release(self.context)
+            elif self.browser is not None:
+                await self.browser.close()
+            if self.playwright is not None:
+                await self.playwright.stop()
+        except Exception as e:
+            logger.warning(f"[close] 브라우저 종료 중 오류: {str(e)}")
+        finally:
+            self.playwright = None
+            self.browser = None
+            self.context = None
+            self.page = None
     
 
     async def search_by_corp_name(self, company_name: str, stock_code: str):
@@ -75,7 +310,7 @@ class FinancialStatementCrawler:
         await search_input.press('Enter')
 
         await asyncio.sleep(1)
-        await self.page.wait_for_load_state('networkidle')
+        await self.page.wait_for_load_state('networkidle', timeout=self._timeout(30000))
         await self.page.screenshot(path=f'/playwright-crawler/screenshots/01_query_input.png')
 
         ## 기업 검색 결과가 여러 개인 경우 팝업 창이 발생하므로 처리
@@ -90,7 +325,7 @@ class FinancialStatementCrawler:
 
         ## 1초 대기
         await asyncio.sleep(1)
-        await self.page.wait_for_load_state('networkidle')
+        await self.page.wait_for_load_state('networkidle', timeout=self._timeout(30000))
         await self.page.screenshot(path=f'/playwright-crawler/screenshots/02_set_option.png')
 
         logger.info(f"[search_by_corp_name] 기업 검색 완료: {company_name}")
@@ -214,6 +449,56 @@ class FinancialStatementCrawler:
         return reports
     
 
+    async def search_reports_direct(self, corp_code: str, company_name: str, start_date: Optional[str] = None, end_date: Optional[str] = None, public_type: str = "A001"):
+        """
+        공시 상세검색(detailSearch.ax)을 corp_code, 보고서 유형, 기간으로 직접 조회하여 모든 결과 페이지의 보고서 목록을 수집
+        검색 폼 입력과 기업 선택 팝업 처리를 거치지 않으며, collect_report_list와 동일한 형식의 보고서 목록을 반환
+
+        :param public_type: 공시 유형 코드 (A001 : 사업보고서)
+        """
+        start_date = start_date if start_date else "19990101"
+        end_date = end_date if end_date else get_current_korea_time().strftime("%Y%m%d")
+        logger.info(f"[search_reports_direct] 보고서 직접 검색 시작: {company_name}({corp_code}), {start_date} ~ {end_date}")
+
+        reports = []
+        current_page = 1
+        total_pages = 1
+        while current_page <= total_pages:
+            response = await self.page.request.post(self.DETAIL_SEARCH_URL, form={
+                "currentPage": current_page,
+                "maxResults": self.DETAIL_SEARCH_MAX_RESULTS,
+                "maxLinks": 10,
+                "sort": "date",
+                "series": "desc",
+                "option": "corp",
+                "textCrpCik": corp_code,
+                "textCrpNm": company_name,
+                "startDate": start_date,
+                "endDate": end_date,
+                "publicType": public_type,
+            })
+            if not response.ok:
+                raise Exception(f"보고서 검색 요청 실패: {response.status}")
+
+            html = await response.text()
+
+            ## 페이지 정보 예: [1/3] [총 25건]
+            page_info = re.search(r'\[\s*(\d+)\s*/\s*(\d+)\s*\]', html)
+            if page_info:
+                total_pages = int(page_info.group(2))
+
+            ## 검색 결과 조각을 페이지에 올려 기존 목록 파싱 로직을 그대로 사용
+            await self.page.set_content(html)
+            page_reports = await self.collect_report_list()
+            reports.extend(page_reports)
+            logger.info(f"[search_reports_direct] {current_page}/{total_pages} 페이지 수집: {len(page_reports)}개")
+
+            current_page += 1
+
+        logger.info(f"[search_reports_direct] 총 {len(reports)}개 보고서 정보 수집 완료")
+        return reports
+
+
     async def valid_standard_nb_table(self, table: ElementHandle):
         """nb 테이블의 표준 양식 검증"""
         is_standard_table = False
@@ -287,18 +572,22 @@ class FinancialStatementCrawler:
     async def search_right_panel(self):
         logger.info(f"[search_right_panel] 우측 패널 검색 시작")
 
-        await self.page.wait_for_selector('#ifrm', timeout=30000) ## iframe이 로드될 때까지 대기
+        await self.page.wait_for_selector('#ifrm', timeout=self._timeout(30000)) ## iframe이 로드될 때까지 대기
         await asyncio.sleep(1) ## iframe 내부 콘텐츠 로드 대기
 
-        current_year = self.page.url
-        current_year = current_year.split('=')[-1][:4]
+        ## 접수 연도는 정정/지연 제출 시 사업연도와 다르므로 보고서의 회계 기간에서 구한 사업연도 사용
+        current_year = self.current_fiscal_year
         
         # URL에서 rcept_no 추출
         current_rcept_no = self.page.url.split('=')[-1]
+
+        if self.extraction_mode == "snapshot":
+            iframe_element = await self.page.query_selector('#ifrm')
+            return await self.extract_tables_snapshot(await iframe_element.content_frame(), current_rcept_no, current_year)
         
         try:
             iframe = self.page.frame_locator('#ifrm') ## iframe 내부에 접근
-            await iframe.locator('body').wait_for(timeout=15000) ## iframe 내부 콘텐츠 로드 대기
+            await iframe.locator('body').wait_for(timeout=self._timeout(15000)) ## iframe 내부 콘텐츠 로드 대기
             
             tables = iframe.locator('table') ## iframe 내부에 속한 모든 table 요소
             table_count = await tables.count() ## table 요소의 개수
@@ -407,7 +696,7 @@ class FinancialStatementCrawler:
                                 logger.info(f"[search_right_panel] {i}번째 표준 데이터 테이블 행 수: {tbody_count}")
 
                                 tbody_list = await tbody_rows.all()
-                                years = [str(int(current_year) - 1), str(int(current_year) - 2), str(int(current_year) - 3)]
+                                years = [current_year, str(int(current_year) - 1), str(int(current_year) - 2)]
 
                                 # 계층 구조 추적을 위한 변수
                                 current_accounts_by_level = {}
@@ -490,10 +779,40 @@ class FinancialStatementCrawler:
                 return []
                 
         except Exception as e:
+            ## 실패를 빈 결과로 넘기면 보고서가 완료로 기록되므로 보고서 단위 재시도에 맡김
             logger.error(f"[search_right_panel] iframe 접근 실패: {str(e)}")
-            return []
+            raise
     
 
+    async def extract_tables_snapshot(self, frame: Frame, rcept_no: str, bsns_year: str):
+        """
+        프레임의 테이블을 한 번의 evaluate로 스냅샷하고, 파싱은 프로세스 풀에 넘겨 이벤트 루프를 비워 둠
+        반환 형식은 search_right_panel과 동일
+        """
+        try:
+            await frame.locator('body').wait_for(timeout=self._timeout(15000))
+            tables = await frame.evaluate(SNAPSHOT_TABLES_JS)
+            logger.info(f"[extract_tables_snapshot] 테이블 스냅샷 {len(tables)}개 추출 (rcept_no: {rcept_no})")
+
+            meta = {
+                "corp_name": getattr(self, 'company_name', ''),
+                "stock_code": getattr(self, 'stock_code', ''),
+                "corp_code": getattr(self, 'corp_code', ''),
+                "bsns_year": bsns_year,
+                "rcept_no": rcept_no,
+                "corp_type_value": getattr(self, 'corp_type_value', ''),
+                "corp_type_name": getattr(self, 'corp_type_name', ''),
+                "target_sj_list": self.TARGET_SJ_LIST,
+            }
+            dataset = await parse_in_pool(tables, meta)
+            logger.info(f"[extract_tables_snapshot] 총 {len(dataset)}개 재무제표 데이터 수집 완료")
+            return dataset
+
+        except Exception as e:
+            logger.error(f"[extract_tables_snapshot] 스냅샷 추출 실패: {str(e)}")
+            raise
+
+
     async def search_left_panel_tree(self):
         logger.info(f"[search_left_panel_tree] 좌측 트리 검색 시작")
         tree = self.page.locator('#listTree > ul')
@@ -523,7 +842,7 @@ class FinancialStatementCrawler:
         await target_lv1_node.locator('.jstree-anchor').first.click()
         
         await asyncio.sleep(1)
-        await self.page.wait_for_load_state('networkidle')
+        await self.page.wait_for_load_state('networkidle', timeout=self._timeout(30000))
         await self.page.screenshot(path=f'/playwright-crawler/screenshots/04_search_left_panel_tree.png')
 
         ## 재무에 관한 사항 하위 노드들 탐색
@@ -542,6 +861,9 @@ class FinancialStatementCrawler:
             clean_lv2_title = lv2_title.split(".")[-1].strip()
             if clean_lv2_title not in ['연결재무제표', '재무제표']:
                 continue
+            if not self.is_repair_section(lv2_title):
+                logger.info(f"[search_left_panel_tree] level2 '{lv2_title}' - 재추출 대상 단위가 없어 스킵")
+                continue
                 
             logger.info(f"[search_left_panel_tree] level2 '{lv2_title}' 노드 발견")
 
@@ -559,7 +881,7 @@ class FinancialStatementCrawler:
                     logger.info(f"[search_left_panel_tree] '{lv2_title}' 클릭하여 하위 노드 확인")
                     await lv2_node.locator('.jstree-anchor').first.click()
                     await asyncio.sleep(2)  # 노드가 펼쳐질 시간을 충분히 줌
-                    await self.page.wait_for_load_state('networkidle')
+                    await self.page.wait_for_load_state('networkidle', timeout=self._timeout(30000))
                     
                     # 클릭 후 노드 상태 재확인
                     lv2_class_after = await lv2_node.get_attribute('class')
@@ -580,15 +902,17 @@ class FinancialStatementCrawler:
                             logger.info(f"[search_left_panel_tree] level3 '{lv3_title}' 노드 발견")
                             
                             # 하위 노드가 타겟 리스트에 포함되는지 확인
-                            if any(target_sj in lv3_title for target_sj in self.TARGET_SJ_LIST):
+                            if any(target_sj in lv3_title for target_sj in self.TARGET_SJ_LIST) and self.is_repair_section(f"{lv2_title} {lv3_title}"):
                                 logger.info(f"[search_left_panel_tree] 타겟 노드 발견: {lv3_title}")
                                 await lv3_node.locator('.jstree-anchor').first.click()
                                 await asyncio.sleep(1)
-                                await self.page.wait_for_load_state('networkidle')
+                                await self.page.wait_for_load_state('networkidle', timeout=self._timeout(30000))
                                 await self.page.screenshot(path=f'/playwright-crawler/screenshots/04_search_left_panel_{lv3_title}.png')
 
+                                self.check_deadline("search_left_panel_tree")
                                 dataset = await self.search_right_panel()
                                 if dataset:
+                                    self._record_units(dataset)
                                     collected_datasets.extend(dataset)
                                     logger.info(f"[search_left_panel_tree] '{lv3_title}'에서 {len(dataset)}개 데이터 수집")
                     else:
@@ -609,25 +933,342 @@ class FinancialStatementCrawler:
                     logger.info(f"[search_left_panel_tree] level3 '{lv3_title}' 노드 발견")
                     
                     # 하위 노드가 타겟 리스트에 포함되는지 확인
-                    if any(target_sj in lv3_title for target_sj in self.TARGET_SJ_LIST):
+                    if any(target_sj in lv3_title for target_sj in self.TARGET_SJ_LIST) and self.is_repair_section(f"{lv2_title} {lv3_title}"):
                         logger.info(f"[search_left_panel_tree] 타겟 노드 발견: {lv3_title}")
                         await lv3_node.locator('.jstree-anchor').first.click()
                         await asyncio.sleep(1)
-                        await self.page.wait_for_load_state('networkidle')
+                        await self.page.wait_for_load_state('networkidle', timeout=self._timeout(30000))
                         await self.page.screenshot(path=f'/playwright-crawler/screenshots/04_search_left_panel_{lv3_title}.png')
 
+                        self.check_deadline("search_left_panel_tree")
                         dataset = await self.search_right_panel()
                         if dataset:
+                            self._record_units(dataset)
                             collected_datasets.extend(dataset)
                             logger.info(f"[search_left_panel_tree] '{lv3_title}'에서 {len(dataset)}개 데이터 수집")
                 
         logger.info(f"[search_left_panel_tree] 총 {len(collected_datasets)}개 재무제표 데이터 수집 완료")
         return collected_datasets
 
-    async def collect_financial_statements(self, company_name: str, corp_type_value: str):
+    async def search_toc_sections(self):
+        """
+        목차 데이터에서 재무제표 섹션의 뷰어 URL을 한 번에 읽고, 트리 클릭 없이 iframe에 직접 로드하여 수집
+        목차에서 대상 섹션을 찾지 못하면 None을 반환 (트리 탐색으로 대체)
+        """
+        logger.info(f"[search_toc_sections] 목차 기반 섹션 탐색 시작")
+        nodes = parse_toc_nodes(await self.page.content())
+        target_nodes = select_statement_nodes(nodes, self.TARGET_SJ_LIST)
+        logger.info(f"[search_toc_sections] 목차 노드 {len(nodes)}개 중 대상 섹션 {len(target_nodes)}개: {[node['text'] for node in target_nodes]}")
+
+        if not target_nodes:
+            logger.warning(f"[search_toc_sections] 목차에서 대상 섹션을 찾지 못해 트리 탐색으로 대체")
+            return None
+
+        repair_nodes = [node for node in target_nodes if self.is_repair_section(" ".join([*node["parents"][-1:], node["text"]]))]
+        if repair_nodes and len(repair_nodes) < len(target_nodes):
+            logger.info(f"[search_toc_sections] 재추출 대상 섹션만 로드: {[node['text'] for node in repair_nodes]}")
+            target_nodes = repair_nodes
+
+        if self.section_concurrency > 1:
+            return await self.search_toc_sections_parallel(target_nodes)
+
+        iframe_element = await self.page.wait_for_selector('#ifrm', timeout=self._timeout(30000))
+        iframe = await iframe_element.content_frame()
+
+        collected_datasets = []
+        for node in target_nodes:
+            self.check_deadline("search_toc_sections")
+            viewer_url = build_viewer_url(node)
+            logger.info(f"[search_toc_sections] '{node['text']}' 섹션 로드: {viewer_url}")
+            await iframe.goto(viewer_url, wait_until='networkidle', timeout=self._timeout(60000))
+
+            dataset = await self.search_right_panel()
+            if dataset:
+                self._record_units(dataset)
+                collected_datasets.extend(dataset)
+                logger.info(f"[search_toc_sections] '{node['text']}'에서 {len(dataset)}개 데이터 수집")
+
+        logger.info(f"[search_toc_sections] 총 {len(collected_datasets)}개 재무제표 데이터 수집 완료")
+        return collected_datasets
+
+
+    async def goto_report(self, url: str):
+        """현재 페이지에서 URL 로드 (헤징 사용 시 먼저 끝난 페이지가 현재 페이지가 됨)"""
+        if self.hedger is None:
+            await self.page.goto(url, wait_until='networkidle', timeout=self._timeout(60000))
+            return
+        self.page = await self.hedger.goto(self.page, url, self.context.new_page, timeout=self._timeout(60000), kind=REPORT_NAVIGATION)
+
+
+    async def _collect_section_page(self, node: dict, semaphore: asyncio.Semaphore, rcept_no: str, bsns_year: str):
+        """섹션 뷰어 URL을 별도 페이지에서 열어 스냅샷 추출"""
+        viewer_url = build_viewer_url(node)
+        async with semaphore:
+            page = await self.context.new_page()
+            try:
+                logger.info(f"[search_toc_sections_parallel] '{node['text']}' 섹션 로드: {viewer_url}")
+                if self.hedger is None:
+                    await page.goto(viewer_url, wait_until='networkidle', timeout=self._timeout(60000))
+                else:
+                    page = await self.hedger.goto(page, viewer_url, self.context.new_page, timeout=self._timeout(60000), kind=VIEWER_NAVIGATION)
+                dataset = await self.extract_tables_snapshot(page.main_frame, rcept_no, bsns_year)
+                logger.info(f"[search_toc_sections_parallel] '{node['text']}'에서 {len(dataset)}개 데이터 수집")
+                return dataset
+            finally:
+                await page.close()
+
+
+    async def search_toc_sections_parallel(self, target_nodes: list):
+        """
+        대상 섹션을 보고서당 최대 section_concurrency개의 페이지에서 동시에 수집
+        페이지마다 뷰어 문서를 직접 열기 때문에 추출은 snapshot 방식으로 하고, 결과는 목차 순서대로 합침
+        """
+        rcept_no = self.page.url.split('=')[-1]
+        bsns_year = self.current_fiscal_year
+        semaphore = asyncio.Semaphore(self.section_concurrency)
+
+        results = await asyncio.gather(
+            *[self._collect_section_page(node, semaphore, rcept_no, bsns_year) for node in target_nodes],
+            return_exceptions=True
+        )
+
+        collected_datasets = []
+        for node, result in zip(target_nodes, results):
+            if isinstance(result, Exception):
+                ## 한 섹션이라도 실패하면 보고서 단위 재시도에 맡김
+                raise result
+            if result:
+                self._record_units(result)
+                collected_datasets.extend(result)
+
+        logger.info(f"[search_toc_sections_parallel] 섹션 {len(target_nodes)}개 동시 수집 (동시 페이지 {self.section_concurrency}개), 총 {len(collected_datasets)}개 재무제표 데이터")
+        return collected_datasets
+
+
+    def is_repair_section(self, title: str) -> bool:
+        """재추출 중이면 대상 단위를 담을 수 있는 섹션만 이동/추출 (재추출이 아니면 모든 섹션)"""
+        return self.unit_filter is None or section_matches_units(title, self.unit_filter)
+
+
+    def _record_units(self, dataset: list):
+        """수집이 끝난 (rcept_no, sj_div) 단위를 저널에 기록"""
+        if self.journal is None:
+            return
+
+        for data in dataset:
+            if data.get("sj_div") and (self.unit_filter is None or data["sj_div"] in self.unit_filter):
+                self.journal.record_unit(data["rcept_no"], data["sj_div"], data)
+
+
+    async def with_retry(self, name: str, retry_count: int, async_func, *args, **kwargs):
+        """실패 시 지수 백오프로 최대 retry_count번 재시도"""
+        for attempt in range(retry_count + 1):
+            try:
+                return await async_func(*args, **kwargs)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                if self.deadline is not None and self.deadline.expired():
+                    ## 기한 때문에 줄어든 대기 시간이 끝나 실패한 경우는 재시도하지 않음
+                    raise DeadlineExceeded(name) from e
+                if attempt >= retry_count:
+                    logger.error(f"[with_retry] {name} 최종 실패 ({attempt+1}회 시도): {str(e)}")
+                    raise
+
+                backoff = self.RETRY_BACKOFF_SECONDS * (2 ** attempt)
+                if self.deadline is not None and self.deadline.remaining() < backoff:
+                    raise DeadlineExceeded(name) from e
+                logger.warning(f"[with_retry] {name} 실패 ({attempt+1}/{retry_count+1}), {backoff}초 후 재시도: {str(e)}")
+                await asyncio.sleep(backoff)
+
+
+    async def schedule_prefetch(self, pending_reports: list):
+        """다음 보고서들을 대기 페이지에서 미리 로드 (최대 prefetch_window개)"""
+        if self.deadline is not None and self.deadline.remaining() < 1:
+            return
+
+        for report in pending_reports[:self.prefetch_window]:
+            if report['rcept_no'] in self._prefetched:
+                continue
+
+            page = await self.context.new_page()
+            task = asyncio.create_task(page.goto(report['report_url'], wait_until='networkidle', timeout=self._timeout(60000)))
+            self._prefetched[report['rcept_no']] = (page, task)
+            logger.info(f"[schedule_prefetch] 보고서 미리 로드 시작: {report['rcept_no']}")
+
+
+    async def use_prefetched_page(self, rcept_no: str) -> bool:
+        """미리 로드한 페이지가 있으면 현재 페이지로 교체하고 True 반환"""
+        prefetched = self._prefetched.pop(rcept_no, None)
+        if prefetched is None:
+            return False
+
+        page, task = prefetched
+        try:
+            await task
+        except Exception as e:
+            logger.warning(f"[use_prefetched_page] 미리 로드 실패, 직접 이동으로 대체: {rcept_no}, {str(e)}")
+            await page.close()
+            return False
+
+        previous_page = self.page
+        self.page = page
+        await previous_page.close()
+        logger.info(f"[use_prefetched_page] 미리 로드된 페이지 사용: {rcept_no}")
+        return True
+
+
+    async def discard_prefetch(self):
+        """진행 중인 미리 로드를 취소하고 대기 페이지를 닫음"""
+        for rcept_no, (page, task) in list(self._prefetched.items()):
+            task.cancel()
+            try:
+                await page.close()
+            except Exception as e:
+                logger.warning(f"[discard_prefetch] 대기 페이지 종료 실패: {rcept_no}, {str(e)}")
+        self._prefetched = {}
+
+
+    def validate_report(self, rcept_no: str):
+        """보고서 단위 검증, 실패한 (rcept_no, sj_div)는 저널에서 무효화하고 invalid_units에 기록"""
+        if not self.validate:
+            return
+
+        issues = validate_datasets(self.journal.get_report_datasets(rcept_no))
+        self.invalid_units.extend(invalidate_failed_units(self.journal, issues))
+
+
+    async def collect_report_from_api(self, report: dict):
+        """OpenDART API로 보고서의 재무제표를 조회 (실패하거나 데이터가 없으면 빈 리스트)"""
+        meta = {
+            "corp_name": getattr(self, 'company_name', ''),
+            "stock_code": getattr(self, 'stock_code', ''),
+            "corp_code": getattr(self, 'corp_code', ''),
+            "corp_type_value": getattr(self, 'corp_type_value', ''),
+            "corp_type_name": getattr(self, 'corp_type_name', ''),
+        }
+        try:
+            dataset = await self.api_client.collect_report_datasets(report, meta)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.warning(f"[collect_report_from_api] API 조회 실패, 브라우저 수집으로 대체: {report['rcept_no']}, {str(e)}")
+            return []
+
+        self._record_units(dataset)
+        return dataset
+
+
+    async def _new_har_context(self, **kwargs):
+        """HAR 옵션을 준 보고서 전용 컨텍스트 (브라우저 풀 사용 시 풀의 현재 브라우저에서 생성)"""
+        if self.browser_pool is not None:
+            return await self.browser_pool.new_context(**kwargs)
+        return await self.browser.new_context(**kwargs)
+
+
+    async def collect_report_with_har(self, report: dict):
+        """
+        보고서 전용 컨텍스트에서 보고서 1건을 수집
+        - record : 컨텍스트의 트래픽을 보고서별 HAR로 기록 (컨텍스트 종료 시 파일로 저장)
+        - replay : 기록된 HAR로만 응답하고 HAR에 없는 요청은 차단
+        """
+        rcept_no = report['rcept_no']
+        har_path = self.har_archive.har_path(rcept_no)
+        await self.ensure_browser()
+
+        if self.har_mode == "record":
+            os.makedirs(self.har_archive.dir, exist_ok=True)
+            context = await self._new_har_context(
+                viewport={'width': 1920, 'height': 1080},
+                user_agent=self.USER_AGENT,
+                service_workers='block',
+                record_har_path=har_path,
+                record_har_content='embed'
+            )
+        else:
+            if not os.path.exists(har_path):
+                raise FileNotFoundError(f"HAR 파일이 없습니다: {har_path}")
+            context = await self._new_har_context(
+                viewport={'width': 1920, 'height': 1080},
+                user_agent=self.USER_AGENT,
+                service_workers='block'
+            )
+            await context.route_from_har(har_path, not_found='abort')
+
+        previous_context, previous_page = self.context, self.page
+        self.context = context
+        self.page = await context.new_page()
+        try:
+            dataset = await self.collect_report(report)
+        finally:
+            self.context, self.page = previous_context, previous_page
+            if self.browser_pool is not None:
+                await self.browser_pool.release(context)
+            else:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning(f"[collect_report_with_har] HAR 컨텍스트 종료 실패: {rcept_no}, {str(e)}")
+
+        if self.har_mode == "record":
+            self.har_archive.save_report(report)
+            logger.info(f"[collect_report_with_har] HAR 기록 완료: {har_path}")
+        return dataset
+
+
+    async def collect_report(self, report: dict):
+        """보고서 1건을 열어 재무제표 데이터셋을 수집"""
+        self.current_fiscal_year = get_fiscal_year(report)
+        if not await self.use_prefetched_page(report['rcept_no']):
+            await self.goto_report(report['report_url'])
+        await self.page.screenshot(path=f'/playwright-crawler/screenshots/03_report_url.png')
+
+        dataset = None
+        if self.navigation_mode == "toc":
+            dataset = await self.search_toc_sections()
+
+        if dataset is None:
+            dataset = await self.search_left_panel_tree()
+        ## 기한 때문에 일부 섹션 추출이 중단됐을 수 있으므로 완료로 기록하지 않음
+        self.check_deadline("collect_report")
+        self.reports_in_context += 1
+        if not dataset:
+            ## 재무제표를 하나도 찾지 못한 보고서는 완료로 기록하지 않고 재시도/실패 보고서로 남김
+            raise ReportExtractionError(f"재무제표 데이터를 찾지 못했습니다: {report['rcept_no']}")
+        return dataset
+
+
+    async def acquire_slot(self):
+        """스케줄러에서 보고서 수집 슬롯을 받음 (기한 안에 받지 못하면 DeadlineExceeded)"""
+        if self.scheduler is None:
+            return
+        timeout = self.deadline.remaining() if self.deadline is not None else None
+        try:
+            await self.scheduler.acquire(self.priority, timeout=timeout)
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceeded("acquire_slot") from e
+
+
+    def release_slot(self):
+        if self.scheduler is not None:
+            self.scheduler.release(self.priority)
+
+
+    def _stop_at_deadline(self, remaining_reports: list, reason: str):
+        """기한 초과로 수집 중단 (저널에 완료되지 않은 보고서는 pending_reports로 반환)"""
+        self.partial = True
+        self.pending_reports = [
+            {key: report.get(key) for key in ['rcept_no', 'report_name', 'publish_date', 'report_url']}
+            for report in remaining_reports
+            if not self.journal.is_report_completed(report['rcept_no'])
+        ]
+        logger.warning(f"[collect_financial_statements] 기한 초과로 수집 중단 ({reason}), 남은 보고서 {len(self.pending_reports)}개")
+
+
+    async def collect_financial_statements(self, company_name: str, corp_type_value: str, retry_count: int = 3, resume: bool = True):
         logger.info(f"[collect_financial_statements] 재무제표 수집 시작: {company_name}")
 
-        search_result = search_company(corp_name=company_name, corp_type_value=corp_type_value)
+        search_result = await asyncio.to_thread(search_company, corp_name=company_name, corp_type_value=corp_type_value)
         stock_code = search_result['stock_code']
         corp_code = search_result['corp_code']
         level1 = search_result['level1']
@@ -651,22 +1292,134 @@ class FinancialStatementCrawler:
             "E": "기타법인"
         }
         self.corp_type_name = corp_type_map.get(corp_type_value, "알 수 없음")
+
+        # 이전에 중단된 크롤링이 있으면 저널에서 이어서 수집
+        if self.har_mode == "replay":
+            ## 재생은 파서/추출 변경을 재현하기 위한 것이므로 resume과 관계없이 항상 다시 파싱하고,
+            ## 재생 결과가 운영 저널에 섞이지 않도록 요청마다 임시 저널 사용
+            self._cleanup_replay_journal()
+            self._replay_journal_dir = tempfile.TemporaryDirectory(prefix="har_replay_")
+            self.journal = CrawlJournal(corp_code or stock_code, journal_dir=self._replay_journal_dir.name)
+        else:
+            self.journal = CrawlJournal(corp_code or stock_code)
+            if not resume:
+                self.journal.clear()
+        self.failed_reports = []
+        self.invalid_units = []
+        self.partial = False
+        self.pending_reports = []
         
-        await self.init_browser()
-        await self.search_by_corp_name(company_name, stock_code)
-        report_list = await self.collect_report_list()
+        self.har_archive = HarArchive(corp_code or stock_code) if self.har_mode != "off" else None
+
+        use_api = self.api_client is not None and corp_code and self.har_mode != "replay"
+        try:
+            if self.har_mode == "replay":
+                ## 기록된 보고서 목록으로 수집 (DART 검색 없이 HAR만 사용)
+                report_list = self.har_archive.load_reports()
+                logger.info(f"[collect_financial_statements] HAR 재생 모드: 기록된 보고서 {len(report_list)}개")
+            elif use_api:
+                report_list = await self.with_retry("fetch_report_list", retry_count, self.api_client.fetch_report_list, corp_code)
+            elif self.search_mode == "direct" and corp_code:
+                await self.with_retry("init_browser", retry_count, self.init_browser)
+                report_list = await self.with_retry("search_reports_direct", retry_count, self.search_reports_direct, corp_code, company_name)
+            else:
+                await self.with_retry("init_browser", retry_count, self.init_browser)
+                await self.with_retry("search_by_corp_name", retry_count, self.search_by_corp_name, company_name, stock_code)
+                report_list = await self.collect_report_list()
+        except DeadlineExceeded as e:
+            ## 보고서 목록도 얻지 못한 경우 빈 부분 결과
+            logger.warning(f"[collect_financial_statements] 보고서 목록 조회 중 {str(e)}")
+            self.partial = True
+            return []
         logger.info(f"[collect_financial_statements] 총 {len(report_list)}개 보고서 정보 수집 완료")
 
+        self.skipped_reports = []
+        if self.select_latest:
+            report_list, self.skipped_reports = select_latest_reports(report_list)
+            logger.info(f"[collect_financial_statements] 최신 보고서 선택 후 {len(report_list)}개 보고서 수집 ({len(self.skipped_reports)}개 제외)")
+
         total_dataset = []                
         for idx, report in enumerate(report_list):
-            logger.info(f"[collect_financial_statements] {idx+1}번째 보고서 수집 시작")
-            logger.info(f"[collect_financial_statements] 회사명: {report['company_name']}, 보고서명: {report['report_name']}, 발행일: {report['publish_date']}, 보고서 URL: {report['report_url']}")
+            rcept_no = report['rcept_no']
+            if self.deadline is not None and self.deadline.expired() and not self.journal.is_report_completed(rcept_no):
+                self._stop_at_deadline(report_list[idx:], "보고서 수집 시작 전")
+                break
 
-            await self.page.goto(report['report_url'], wait_until='networkidle', timeout=60000)
-            await self.page.screenshot(path=f'/playwright-crawler/screenshots/03_report_url.png')
+            if self.journal.is_report_completed(rcept_no):
+                dataset = self.journal.get_report_datasets(rcept_no)
+                total_dataset.extend(dataset)
+                logger.info(f"[collect_financial_statements] {idx+1}번째 보고서는 저널에 수집 완료로 기록되어 있어 건너뜀: {rcept_no} ({len(dataset)}개 데이터)")
+                continue
 
-            dataset = await self.search_left_panel_tree()
-            total_dataset.extend(dataset if dataset else [])
+            ## 보고서 1건마다 슬롯을 받고 반환하여 우선순위가 높은 요청이 보고서 경계에서 끼어들 수 있게 함
+            try:
+                await self.acquire_slot()
+            except DeadlineExceeded as e:
+                self._stop_at_deadline(report_list[idx:], str(e))
+                break
+
+            try:
+                logger.info(f"[collect_financial_statements] {idx+1}번째 보고서 수집 시작")
+                repair_units = self.journal.invalidated_units(rcept_no)
+                self.unit_filter = repair_units if repair_units else None
+                if repair_units:
+                    logger.info(f"[collect_financial_statements] 검증 실패 단위만 재추출: {rcept_no} {sorted(repair_units)}")
+                logger.info(f"[collect_financial_statements] 회사명: {report['company_name']}, 보고서명: {report['report_name']}, 발행일: {report['publish_date']}, 보고서 URL: {report['report_url']}")
+
+                if use_api:
+                    try:
+                        api_dataset = await self.collect_report_from_api(report)
+                    except DeadlineExceeded as e:
+                        self._stop_at_deadline(report_list[idx:], str(e))
+                        break
+                    if api_dataset:
+                        self.validate_report(rcept_no)
+                        self.journal.record_report(rcept_no)
+                        total_dataset.extend(self.journal.get_report_datasets(rcept_no))
+                        continue
+
+                    if self.page is None:
+                        ## API에 데이터가 없는 보고서가 처음 나왔을 때 브라우저 기동
+                        try:
+                            await self.with_retry("init_browser", retry_count, self.init_browser)
+                        except DeadlineExceeded as e:
+                            self._stop_at_deadline(report_list[idx:], str(e))
+                            break
+                        except Exception as e:
+                            self.failed_reports.append({**report, "error": str(e)})
+                            continue
+
+                if self.prefetch_window > 0 and not use_api and self.har_mode == "off":
+                    pending_reports = [r for r in report_list[idx+1:] if not self.journal.is_report_completed(r['rcept_no'])]
+                    await self.schedule_prefetch(pending_reports)
+
+                collect = self.collect_report if self.har_mode == "off" else self.collect_report_with_har
+                try:
+                    await self.with_retry(f"collect_report({rcept_no})", retry_count, collect, report)
+                except DeadlineExceeded as e:
+                    self._stop_at_deadline(report_list[idx:], str(e))
+                    break
+                except Exception as e:
+                    self.failed_reports.append({**report, "error": str(e)})
+                    continue
+
+                self.validate_report(rcept_no)
+                self.journal.record_report(rcept_no)
+                total_dataset.extend(self.journal.get_report_datasets(rcept_no))
+
+                if idx < len(report_list) - 1 and self.page is not None and self.har_mode == "off":
+                    await self.maybe_recycle()
+            finally:
+                self.release_slot()
+
+        self.unit_filter = None
+        await self.discard_prefetch()
+
+        # 기업 간 비교를 위한 표준 계정 매핑
+        add_canonical_accounts(total_dataset)
+
+        if self.failed_reports:
+            logger.warning(f"[collect_financial_statements] 수집 실패 보고서 {len(self.failed_reports)}개: {[report['rcept_no'] for report in self.failed_reports]}")
 
         return total_dataset
 
@@ -0,0 +1,44 @@
+import time
+
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, stage: str):
+        super().__init__(f"요청 기한 초과: {stage}")
+        self.stage = stage
+
+
+class Deadline:
+    """
+    요청 단위 기한
+    - 각 단계(탐색, 트리 순회, 추출)에서 check로 기한을 확인
+    - Playwright 대기 시간은 timeout_ms로 남은 시간 이내로 줄여서 사용
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+    def check(self, stage: str):
+        if self.expired():
+            raise DeadlineExceeded(stage)
+
+
+    def timeout_ms(self, default_ms: int, stage: str = "") -> int:
+        """기본 대기 시간과 남은 시간 중 짧은 쪽 (Playwright는 0을 무제한으로 보므로 기한이 지났으면 예외)"""
+        self.check(stage)
+        return max(1, min(default_ms, int(self.remaining() * 1000)))
+
+
+def new_deadline(seconds: Optional[float]) -> Optional[Deadline]:
+    return Deadline(seconds) if seconds and seconds > 0 else None
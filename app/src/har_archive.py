@@ -0,0 +1,63 @@
+import os
+import json
+
+from typing import List
+
+from app.utils.logging import logger
+
+HAR_DIR = os.getenv("HAR_DIR", "/playwright-crawler/data/har")
+
+HAR_MODES = ["off", "record", "replay"]
+
+
+class HarArchive:
+    """
+    보고서(rcept_no) 단위 HAR 보관소
+    - record : 보고서 수집 중 발생한 네트워크 트래픽을 <corp_key>/<rcept_no>.har 로 저장하고, 보고서 정보를 <rcept_no>.json 으로 저장
+    - replay : 저장된 HAR로 네트워크 없이 같은 보고서를 다시 열어 파서/추출 변경을 재현
+    """
+
+    def __init__(self, corp_key: str, har_dir: str = HAR_DIR):
+        self.corp_key = corp_key
+        self.dir = os.path.join(har_dir, corp_key)
+
+
+    def har_path(self, rcept_no: str) -> str:
+        return os.path.join(self.dir, f"{rcept_no}.har")
+
+
+    def meta_path(self, rcept_no: str) -> str:
+        return os.path.join(self.dir, f"{rcept_no}.json")
+
+
+    def has_report(self, rcept_no: str) -> bool:
+        return os.path.exists(self.har_path(rcept_no)) and os.path.exists(self.meta_path(rcept_no))
+
+
+    def save_report(self, report: dict):
+        """HAR 기록이 끝난 보고서 정보 저장 (replay 시 보고서 목록으로 사용)"""
+        os.makedirs(self.dir, exist_ok=True)
+        tmp_path = self.meta_path(report['rcept_no']) + ".tmp"
+        with open(tmp_path, mode='w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False)
+        os.replace(tmp_path, self.meta_path(report['rcept_no']))
+
+
+    def load_reports(self) -> List[dict]:
+        """기록된 보고서 목록 (발행일 내림차순, HAR 파일이 없는 보고서는 제외)"""
+        if not os.path.isdir(self.dir):
+            return []
+
+        reports = []
+        for file_name in sorted(os.listdir(self.dir)):
+            if not file_name.endswith(".json"):
+                continue
+            rcept_no = file_name[:-len(".json")]
+            if not self.has_report(rcept_no):
+                logger.warning(f"[HarArchive] HAR 파일이 없어 제외: {self.corp_key} {rcept_no}")
+                continue
+            with open(self.meta_path(rcept_no), mode='r', encoding='utf-8') as f:
+                reports.append(json.load(f))
+
+        reports.sort(key=lambda report: report.get('publish_date', ''), reverse=True)
+        return reports
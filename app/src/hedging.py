@@ -0,0 +1,193 @@
+import os
+import time
+import asyncio
+
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+
+from playwright.async_api import Page
+
+from app.utils.logging import logger
+
+# 최근 로드 시간의 이 백분위수를 넘기면 중복 로드 시작
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", 95))
+# 백분위수를 계산하기 위한 최소 표본 수 (그 전에는 중복 로드하지 않음)
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", 20))
+HEDGE_LATENCY_WINDOW = int(os.getenv("HEDGE_LATENCY_WINDOW", 200))
+# 너무 이른 중복 로드를 막기 위한 최소 대기 시간
+HEDGE_MIN_DELAY_SECONDS = float(os.getenv("HEDGE_MIN_DELAY_SECONDS", 3))
+# 앱 전체에서 동시에 진행할 수 있는 중복 로드 수
+HEDGE_MAX_CONCURRENT = int(os.getenv("HEDGE_MAX_CONCURRENT", 4))
+
+# 로드 종류 (보고서 main.do 페이지, 섹션 뷰어 문서) - 로드 시간 분포가 달라 표본을 따로 관리
+REPORT_NAVIGATION = "report"
+VIEWER_NAVIGATION = "viewer"
+
+
+class LatencyTracker:
+    """최근 성공한 로드 시간(초)의 이동 창"""
+
+    def __init__(self, window: int = HEDGE_LATENCY_WINDOW, min_samples: int = HEDGE_MIN_SAMPLES):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+
+class NavigationHedger:
+    """
+    페이지 로드 헤징
+    - 로드가 같은 종류(kind) 로드의 최근 로드 시간 백분위수 임계값을 넘기면 새 페이지에서 같은 URL을 한 번 더 로드
+    - 먼저 성공한 페이지를 사용하고 나머지는 취소 후 닫음
+    - 동시에 진행 중인 중복 로드 수는 앱 전체에서 max_concurrent개로 제한
+    """
+
+    def __init__(
+        self,
+        percentile: float = HEDGE_PERCENTILE,
+        min_delay_seconds: float = HEDGE_MIN_DELAY_SECONDS,
+        max_concurrent: int = HEDGE_MAX_CONCURRENT,
+        trackers: Optional[Dict[str, LatencyTracker]] = None,
+    ):
+        self.percentile = percentile
+        self.min_delay_seconds = min_delay_seconds
+        self.max_concurrent = max_concurrent
+        # 로드 종류별 지연 시간 표본 (보고서 페이지와 뷰어 문서의 임계값이 섞이지 않도록)
+        self.trackers: Dict[str, LatencyTracker] = dict(trackers) if trackers else {}
+        self.active_hedges = 0
+        self.stats = {
+            "navigations": 0,
+            "hedges_started": 0,
+            "hedges_won": 0,
+            "hedges_skipped_budget": 0,
+            "failures": 0,
+        }
+
+
+    def tracker(self, kind: str) -> LatencyTracker:
+        if kind not in self.trackers:
+            self.trackers[kind] = LatencyTracker()
+        return self.trackers[kind]
+
+
+    def hedge_delay(self, kind: str = REPORT_NAVIGATION) -> Optional[float]:
+        """중복 로드를 시작할 대기 시간 (표본이 부족하면 None)"""
+        threshold = self.tracker(kind).percentile(self.percentile)
+        if threshold is None:
+            return None
+        return max(threshold, self.min_delay_seconds)
+
+
+    async def _close_page(self, page: Page):
+        try:
+            await page.close()
+        except Exception as e:
+            logger.warning(f"[NavigationHedger] 페이지 종료 실패: {str(e)}")
+
+
+    async def _first_success(self, attempts: Dict[asyncio.Task, Page]) -> Page:
+        """
+        먼저 성공한 로드의 페이지 반환 (모두 실패하면 마지막 예외 발생)
+        진 페이지는 닫고, 모두 실패하면 재시도에 쓸 수 있도록 첫 번째(호출자) 페이지는 남겨 둠
+        """
+        pending = set(attempts)
+        winner = None
+        last_error = None
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    winner = task
+                    break
+                last_error = task.exception()
+
+        for task in pending:
+            task.cancel()
+        keep = winner if winner is not None else next(iter(attempts))
+        for task, page in attempts.items():
+            if task is not keep:
+                await self._close_page(page)
+
+        if winner is None:
+            raise last_error
+        return attempts[winner]
+
+
+    async def goto(self, page: Page, url: str, open_page: Callable[[], Awaitable[Page]], wait_until: str = 'networkidle', timeout: int = 60000, kind: str = REPORT_NAVIGATION) -> Page:
+        """
+        헤징을 적용한 page.goto
+
+        :param open_page: 중복 로드용 새 페이지를 여는 함수 (예: context.new_page)
+        :param kind: 로드 종류 (REPORT_NAVIGATION, VIEWER_NAVIGATION), 종류별 표본으로 임계값 계산
+        :return: 로드에 성공한 페이지 - 중복 로드가 이기면 기존 page는 닫히므로 호출자는 반환된 페이지를 사용
+        """
+        self.stats["navigations"] += 1
+        started_at = time.monotonic()
+        primary = asyncio.create_task(page.goto(url, wait_until=wait_until, timeout=timeout))
+
+        tracker = self.tracker(kind)
+        delay = self.hedge_delay(kind)
+        if delay is not None:
+            await asyncio.wait({primary}, timeout=delay)
+
+        if delay is None or primary.done() or self.active_hedges >= self.max_concurrent:
+            if delay is not None and not primary.done():
+                self.stats["hedges_skipped_budget"] += 1
+            try:
+                await primary
+            except Exception:
+                self.stats["failures"] += 1
+                raise
+            tracker.record(time.monotonic() - started_at)
+            return page
+
+        self.active_hedges += 1
+        self.stats["hedges_started"] += 1
+        logger.info(f"[NavigationHedger] {delay:.2f}초 초과, 중복 로드 시작: {url}")
+        try:
+            attempts = {primary: page}
+            try:
+                hedge_page = await open_page()
+                attempts[asyncio.create_task(hedge_page.goto(url, wait_until=wait_until, timeout=timeout))] = hedge_page
+            except Exception as e:
+                ## 새 페이지를 열지 못하면 기존 로드만 기다림
+                logger.warning(f"[NavigationHedger] 중복 로드용 페이지 생성 실패: {str(e)}")
+            winner_page = await self._first_success(attempts)
+        except Exception:
+            self.stats["failures"] += 1
+            raise
+        finally:
+            self.active_hedges -= 1
+
+        if winner_page is not page:
+            self.stats["hedges_won"] += 1
+            logger.info(f"[NavigationHedger] 중복 로드가 먼저 완료: {url}")
+        tracker.record(time.monotonic() - started_at)
+        return winner_page
+
+
+    def metrics(self) -> dict:
+        return {
+            **self.stats,
+            "active_hedges": self.active_hedges,
+            "kinds": {
+                kind: {
+                    "latency_samples": len(tracker.samples),
+                    "hedge_delay_seconds": self.hedge_delay(kind),
+                }
+                for kind, tracker in self.trackers.items()
+            },
+        }
+
+
+# 앱 전체에서 지연 시간 표본과 중복 로드 예산을 공유
+navigation_hedger = NavigationHedger()
@@ -0,0 +1,205 @@
+import os
+import json
+import asyncio
+import hashlib
+
+from typing import Optional
+from aiohttp import ClientSession, TCPConnector, ClientTimeout, ClientError, TraceConfig
+
+from app.src.deadline import Deadline, DeadlineExceeded
+from app.utils.logging import logger
+
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", 100))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", 10))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", 30))
+HTTP_RETRY_COUNT = int(os.getenv("HTTP_RETRY_COUNT", 3))
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", "/playwright-crawler/data/http_cache")
+
+# 재시도 대상 상태 코드 (일시적 서버 오류, 요청 한도)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# 캐시 키에서 제외할 파라미터 (인증키가 바뀌어도 같은 응답)
+CACHE_EXCLUDED_PARAMS = {"crtfc_key"}
+
+
+class HttpClientError(Exception):
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class DartHttpClient:
+    """
+    앱 수명 동안 공유하는 DART/OpenDART 요청용 HTTP 클라이언트
+    - 호스트별 연결 수 제한, keep-alive, DNS 캐시를 갖춘 단일 커넥션 풀
+    - 일시적 오류(연결 오류, 5xx, 429)는 지수 백오프로 재시도
+    - use_cache=True 요청은 응답을 디스크에 저장하고 ETag/Last-Modified 조건부 요청으로 재검증
+    - 새 연결/재사용 연결 수, 수신 바이트, 캐시 적중 수 집계
+    """
+
+    def __init__(
+        self,
+        limit: int = HTTP_POOL_LIMIT,
+        limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+        timeout_seconds: float = HTTP_TIMEOUT_SECONDS,
+        retry_count: int = HTTP_RETRY_COUNT,
+        cache_dir: str = HTTP_CACHE_DIR,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout_seconds = timeout_seconds
+        self.retry_count = retry_count
+        self.cache_dir = cache_dir
+        self.session: Optional[ClientSession] = None
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "errors": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "bytes_received": 0,
+            "cache_hits": 0,
+            "cache_revalidated": 0,
+        }
+
+
+    def _trace_config(self) -> TraceConfig:
+        trace_config = TraceConfig()
+
+        async def on_connection_create_end(session, context, params):
+            self.stats["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.stats["connections_reused"] += 1
+
+        async def on_response_chunk_received(session, context, params):
+            self.stats["bytes_received"] += len(params.chunk)
+
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_response_chunk_received.append(on_response_chunk_received)
+        return trace_config
+
+
+    def _get_session(self) -> ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = ClientSession(
+                connector=TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host, ttl_dns_cache=300),
+                timeout=ClientTimeout(total=self.timeout_seconds),
+                trace_configs=[self._trace_config()],
+            )
+        return self.session
+
+
+    def _cache_path(self, url: str, params: Optional[dict]) -> str:
+        key_params = sorted((k, str(v)) for k, v in (params or {}).items() if k not in CACHE_EXCLUDED_PARAMS)
+        key = hashlib.sha256(f"{url}?{key_params}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+
+    def _read_cache(self, path: str):
+        """(body, meta) 반환, 캐시가 없거나 손상되었으면 (None, None)"""
+        try:
+            with open(f"{path}.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(f"{path}.body", "rb") as f:
+                return f.read(), meta
+        except (OSError, ValueError):
+            return None, None
+
+
+    def _write_cache(self, path: str, body: bytes, headers):
+        meta = {key: headers[key] for key in ["ETag", "Last-Modified"] if key in headers}
+        if not meta:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 본문을 먼저 쓰고 메타를 마지막에 교체하여 중단 시에도 메타-본문 불일치가 없도록 함
+            with open(f"{path}.body.tmp", "wb") as f:
+                f.write(body)
+            os.replace(f"{path}.body.tmp", f"{path}.body")
+            with open(f"{path}.json.tmp", "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(f"{path}.json.tmp", f"{path}.json")
+        except OSError as e:
+            logger.warning(f"[DartHttpClient] 응답 캐시 저장 실패: {str(e)}")
+
+
+    async def get(self, url: str, params: Optional[dict] = None, use_cache: bool = False, deadline: Optional[Deadline] = None) -> bytes:
+        """
+        GET 요청 후 본문 반환 (재시도 후에도 실패하면 HttpClientError)
+
+        :param deadline: 요청 기한 - 시도마다 제한 시간을 남은 시간 이내로 줄이고, 백오프 후 기한을 넘기면 DeadlineExceeded
+        """
+        session = self._get_session()
+
+        cache_path = self._cache_path(url, params) if use_cache else None
+        cached_body, cached_meta = self._read_cache(cache_path) if cache_path else (None, None)
+        headers = {}
+        if cached_meta:
+            if "ETag" in cached_meta:
+                headers["If-None-Match"] = cached_meta["ETag"]
+            if "Last-Modified" in cached_meta:
+                headers["If-Modified-Since"] = cached_meta["Last-Modified"]
+
+        for attempt in range(self.retry_count + 1):
+            ## 제한 시간을 넘기지 않으면 세션 기본 제한 시간 사용 (None은 제한 없음으로 해석됨)
+            request_kwargs = {}
+            if deadline is not None:
+                deadline.check(f"http {url}")
+                request_kwargs["timeout"] = ClientTimeout(total=min(self.timeout_seconds, deadline.remaining()))
+
+            self.stats["requests"] += 1
+            try:
+                async with session.get(url, params=params, headers=headers, **request_kwargs) as response:
+                    if response.status == 304 and cached_body is not None:
+                        self.stats["cache_hits"] += 1
+                        return cached_body
+
+                    if response.status in RETRY_STATUSES and attempt < self.retry_count:
+                        raise HttpClientError(f"일시적 오류 응답: {response.status}", response.status)
+                    if response.status != 200:
+                        self.stats["errors"] += 1
+                        raise HttpClientError(f"API 요청 실패: {url} {response.status}", response.status)
+
+                    body = await response.read()
+                    if cache_path:
+                        if cached_body is not None:
+                            self.stats["cache_revalidated"] += 1
+                        self._write_cache(cache_path, body, response.headers)
+                    return body
+
+            except (ClientError, asyncio.TimeoutError, HttpClientError) as e:
+                if isinstance(e, HttpClientError) and (e.status not in RETRY_STATUSES or attempt >= self.retry_count):
+                    raise
+                if attempt >= self.retry_count:
+                    self.stats["errors"] += 1
+                    raise HttpClientError(f"API 요청 실패: {url} {str(e)}", getattr(e, "status", None)) from e
+
+                self.stats["retries"] += 1
+                backoff = 2 ** attempt
+                if deadline is not None and deadline.remaining() <= backoff:
+                    raise DeadlineExceeded(f"http {url} 재시도 대기") from e
+                logger.warning(f"[DartHttpClient] 요청 실패, {backoff}초 후 재시도 ({attempt+1}/{self.retry_count}): {url}, {str(e)}")
+                await asyncio.sleep(backoff)
+
+
+    async def get_json(self, url: str, params: Optional[dict] = None, use_cache: bool = False, deadline: Optional[Deadline] = None) -> dict:
+        return json.loads(await self.get(url, params=params, use_cache=use_cache, deadline=deadline))
+
+
+    def metrics(self) -> dict:
+        opened = self.stats["connections_created"] + self.stats["connections_reused"]
+        return {
+            **self.stats,
+            "connection_reuse_ratio": round(self.stats["connections_reused"] / opened, 4) if opened else 0.0,
+        }
+
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+
+# 앱 전체에서 공유하는 클라이언트 (app.main lifespan에서 종료)
+http_client = DartHttpClient()
@@ -0,0 +1,191 @@
+import threading
+
+import pandas as pd
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.src.corp_code import load_company_table
+from app.src.ratios import load_account_panel, compute_ratios
+from app.src.statement_index import StatementIndex, statement_index
+from app.utils.logging import logger
+
+INDUSTRY_LEVELS = ['level1', 'level2', 'level3', 'level4', 'level5']
+NODE_SEPARATOR = " > "
+CUBE_QUANTILES = [0.1, 0.25, 0.75, 0.9]
+
+
+def get_company_industry_paths() -> Dict[str, List[str]]:
+    """corp_code / stock_code → 산업 분류 경로 (빈 단계 이후는 제외)"""
+    companies = load_company_table()
+    paths = {}
+    for row in companies[['corp_code', 'stock_code', *INDUSTRY_LEVELS]].itertuples(index=False):
+        path = []
+        for level in row[2:]:
+            if not isinstance(level, str) or not level.strip():
+                break
+            path.append(level.strip())
+        if not path:
+            continue
+        for key in [row.corp_code, row.stock_code]:
+            if isinstance(key, str) and key and key not in paths:
+                paths[key] = path
+    return paths
+
+
+def to_nodes(path: List[str]) -> List[str]:
+    """['제조업', '식료품 제조업'] → ['제조업', '제조업 > 식료품 제조업']"""
+    return [NODE_SEPARATOR.join(path[:depth]) for depth in range(1, len(path) + 1)]
+
+
+class IndustryCube:
+    """
+    산업 분류(level1~level5) 노드 x 연도별 주요 계정/재무비율 집계 큐브
+    - 기업 x 연도 지표 테이블을 보관하고, 노드별 count/sum/median/분위수를 미리 계산
+    - 기업 재무제표가 바뀌면 해당 기업이 속한 노드만 다시 집계
+    """
+
+    def __init__(self, fs_div: str = "CFS", index: StatementIndex = statement_index):
+        self.fs_div = fs_div
+        self.index = index
+        self._lock = threading.Lock()
+        self.company_metrics = pd.DataFrame()
+        self.cube = pd.DataFrame()
+        self.industry_paths: Dict[str, List[str]] = {}
+        self.node_members: Dict[str, set] = {}
+        self.ready = False
+
+
+    def _compute_company_metrics(self, corp_keys: Optional[List[str]] = None) -> pd.DataFrame:
+        panel = load_account_panel(self.fs_div, index=self.index, corp_keys=corp_keys)
+        if panel.empty:
+            return pd.DataFrame()
+        return pd.concat([panel, compute_ratios(panel)], axis=1)
+
+
+    def _aggregate(self, nodes: Iterable[str]) -> pd.DataFrame:
+        """지정한 노드들의 (node, year) x (지표, 통계) 집계"""
+        members = [
+            (node, corp_key)
+            for node in nodes
+            for corp_key in self.node_members.get(node, ())
+        ]
+        if not members or self.company_metrics.empty:
+            return pd.DataFrame()
+
+        membership = pd.DataFrame(members, columns=["node", "corp_key"])
+        metrics = self.company_metrics.reset_index().merge(membership, on="corp_key")
+        grouped = metrics.drop(columns="corp_key").groupby(["node", "year"])
+
+        stats = {
+            "count": grouped.count(),
+            "sum": grouped.sum(min_count=1),
+            "median": grouped.median(),
+        }
+        quantiles = grouped.quantile(CUBE_QUANTILES)
+        for q in CUBE_QUANTILES:
+            stats[f"p{int(q * 100)}"] = quantiles.xs(q, level=-1)
+
+        return pd.concat(stats, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1)
+
+
+    def build(self):
+        """색인된 전체 기업으로 큐브 생성"""
+        try:
+            self.industry_paths = get_company_industry_paths()
+        except Exception as e:
+            logger.warning(f"[IndustryCube] 산업 분류 정보를 읽지 못했습니다: {str(e)}")
+            self.industry_paths = {}
+        company_metrics = self._compute_company_metrics()
+
+        node_members = {}
+        if not company_metrics.empty:
+            for corp_key in company_metrics.index.get_level_values("corp_key").unique():
+                for node in to_nodes(self.industry_paths.get(corp_key, [])):
+                    node_members.setdefault(node, set()).add(corp_key)
+
+        with self._lock:
+            self.company_metrics = company_metrics
+            self.node_members = node_members
+            self.cube = self._aggregate(node_members.keys())
+            self.ready = True
+
+        logger.info(f"[IndustryCube] {self.fs_div} 큐브 생성 완료: 노드 {len(node_members)}개, 기업-연도 {len(company_metrics)}개")
+
+
+    def update_companies(self, corp_keys: List[str]):
+        """재무제표가 바뀐 기업들의 지표를 다시 계산하고, 해당 기업이 속한 노드만 재집계"""
+        if not self.ready:
+            return
+
+        corp_keys = list(corp_keys)
+        updated = self._compute_company_metrics(corp_keys)
+
+        with self._lock:
+            affected = set()
+            for corp_key in corp_keys:
+                nodes = to_nodes(self.industry_paths.get(corp_key, []))
+                affected.update(nodes)
+                for node in nodes:
+                    if updated.empty or corp_key not in updated.index.get_level_values("corp_key"):
+                        self.node_members.get(node, set()).discard(corp_key)
+                    else:
+                        self.node_members.setdefault(node, set()).add(corp_key)
+
+            if not self.company_metrics.empty:
+                keep = ~self.company_metrics.index.get_level_values("corp_key").isin(corp_keys)
+                self.company_metrics = self.company_metrics[keep]
+            self.company_metrics = pd.concat([self.company_metrics, updated]).sort_index() if not updated.empty else self.company_metrics
+
+            refreshed = self._aggregate(affected)
+            if not self.cube.empty:
+                self.cube = self.cube[~self.cube.index.get_level_values("node").isin(affected)]
+            self.cube = pd.concat([self.cube, refreshed]).sort_index() if not refreshed.empty else self.cube
+
+        logger.info(f"[IndustryCube] 기업 {len(corp_keys)}개 갱신, 노드 {len(affected)}개 재집계")
+
+
+    def query(self, levels: List[str], year: Optional[int] = None, metrics: Optional[List[str]] = None) -> Tuple[Optional[str], List[dict]]:
+        """
+        산업 노드의 연도별 집계 조회
+
+        :param levels: ['제조업', '식료품 제조업'] 형식의 산업 분류 경로
+        :return: (노드, [{"year": 2024, "metrics": {"영업이익률": {"count": .., "median": .., ...}, ...}}, ...])
+        """
+        node = NODE_SEPARATOR.join(level.strip() for level in levels if level and level.strip())
+        ## update_companies가 큐브를 교체하므로 같은 큐브로 확인/조회하도록 참조를 복사
+        with self._lock:
+            cube = self.cube
+        if not node or cube.empty or node not in cube.index.get_level_values("node"):
+            return node or None, []
+
+        node_cube = cube.xs(node, level="node")
+        if year is not None:
+            node_cube = node_cube[node_cube.index == year]
+        if metrics:
+            node_cube = node_cube[[column for column in node_cube.columns if column[0] in metrics]]
+
+        values = node_cube.astype(object).where(node_cube.notna(), None)
+        rows = []
+        for node_year, row in values.iterrows():
+            year_metrics = {}
+            for (metric, stat), value in row.items():
+                year_metrics.setdefault(metric, {})[stat] = int(value) if stat == "count" and value is not None else value
+            rows.append({"year": int(node_year), "metrics": year_metrics})
+        return node, rows
+
+
+    def list_children(self, levels: List[str]) -> List[str]:
+        """하위 산업 노드 이름 목록"""
+        prefix = NODE_SEPARATOR.join(level.strip() for level in levels if level and level.strip())
+        depth = len([level for level in levels if level and level.strip()])
+        ## update_companies가 노드를 추가하므로 락 안에서 노드 목록을 복사한 뒤 순회
+        with self._lock:
+            nodes = list(self.node_members)
+        return sorted({
+            node.split(NODE_SEPARATOR)[depth]
+            for node in nodes
+            if (not prefix or node.startswith(prefix + NODE_SEPARATOR)) and len(node.split(NODE_SEPARATOR)) == depth + 1
+        })
+
+
+industry_cube = IndustryCube()
@@ -0,0 +1,121 @@
+import os
+import json
+
+from typing import Dict, List, Tuple
+
+from app.utils.time import get_current_korea_time
+from app.utils.logging import logger
+
+JOURNAL_DIR = os.getenv("CRAWL_JOURNAL_DIR", "/playwright-crawler/data/journal")
+
+
+class CrawlJournal:
+    """
+    기업 단위 크롤링 저널 (JSONL)
+    - (기업, rcept_no, sj_div) 단위로 수집이 끝날 때마다 한 줄씩 기록
+    - 보고서의 모든 단위가 끝나면 report 완료 레코드를 기록
+    - 중단된 크롤링은 저널을 다시 읽어 완료된 보고서를 건너뛰고 이어서 수집
+    - 검증에 실패한 단위는 invalidate 레코드로 표시하여 다음 수집 때 해당 단위만 다시 추출
+    """
+
+    def __init__(self, corp_key: str, journal_dir: str = JOURNAL_DIR):
+        self.corp_key = corp_key
+        self.path = os.path.join(journal_dir, f"{corp_key}.jsonl")
+        self.units: Dict[Tuple[str, str], dict] = {}
+        self.completed_reports = set()
+        self.invalidated: Dict[Tuple[str, str], str] = {}
+        # 단위별 누적 무효화 횟수 (재추출 횟수 제한에 사용)
+        self.invalidation_counts: Dict[Tuple[str, str], int] = {}
+
+        os.makedirs(journal_dir, exist_ok=True)
+        self._load()
+
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, mode='r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    ## 기록 도중 프로세스가 종료되면 마지막 줄이 잘릴 수 있음
+                    logger.warning(f"[CrawlJournal] 손상된 저널 라인 무시: {self.path}:{line_no}")
+                    continue
+
+                self._apply(entry)
+
+        logger.info(f"[CrawlJournal] 저널 로드 완료: {self.path} (완료 보고서 {len(self.completed_reports)}개, 단위 {len(self.units)}개)")
+
+
+    def _apply(self, entry: dict):
+        entry_type = entry.get("type")
+        rcept_no = entry.get("rcept_no")
+
+        if entry_type == "unit":
+            self.units[(rcept_no, entry["sj_div"])] = entry["dataset"]
+            self.invalidated.pop((rcept_no, entry["sj_div"]), None)
+        elif entry_type == "report":
+            self.completed_reports.add(rcept_no)
+        elif entry_type == "invalidate":
+            self.invalidated[(rcept_no, entry["sj_div"])] = entry.get("reason", "")
+            self.invalidation_counts[(rcept_no, entry["sj_div"])] = self.invalidation_counts.get((rcept_no, entry["sj_div"]), 0) + 1
+
+
+    def _append(self, entry: dict):
+        entry["recorded_at"] = get_current_korea_time().isoformat()
+        with open(self.path, mode='a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._apply(entry)
+
+
+    def record_unit(self, rcept_no: str, sj_div: str, dataset: dict):
+        """(rcept_no, sj_div) 단위 수집 완료 기록"""
+        self._append({"type": "unit", "rcept_no": rcept_no, "sj_div": sj_div, "dataset": dataset})
+
+
+    def record_report(self, rcept_no: str):
+        """보고서 단위 수집 완료 기록"""
+        self._append({"type": "report", "rcept_no": rcept_no})
+
+
+    def invalidate_unit(self, rcept_no: str, sj_div: str, reason: str):
+        """검증 실패 등으로 (rcept_no, sj_div) 단위를 재추출 대상으로 표시 (기존 데이터는 재추출 전까지 유지)"""
+        self._append({"type": "invalidate", "rcept_no": rcept_no, "sj_div": sj_div, "reason": reason})
+
+
+    def invalidation_count(self, rcept_no: str, sj_div: str) -> int:
+        """(rcept_no, sj_div) 단위가 지금까지 무효화된 횟수"""
+        return self.invalidation_counts.get((rcept_no, sj_div), 0)
+
+
+    def invalidated_units(self, rcept_no: str) -> set:
+        """보고서에서 재추출이 필요한 sj_div 목록"""
+        return {sj_div for (unit_rcept_no, sj_div) in self.invalidated if unit_rcept_no == rcept_no}
+
+
+    def is_report_completed(self, rcept_no: str) -> bool:
+        return rcept_no in self.completed_reports and not self.invalidated_units(rcept_no)
+
+
+    def get_report_datasets(self, rcept_no: str) -> List[dict]:
+        """저널에 기록된 보고서의 데이터셋을 기록 순서대로 반환"""
+        return [dataset for (unit_rcept_no, _), dataset in self.units.items() if unit_rcept_no == rcept_no]
+
+
+    def clear(self):
+        """저널을 비우고 처음부터 다시 수집하도록 초기화"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.units = {}
+        self.completed_reports = set()
+        self.invalidated = {}
+        self.invalidation_counts = {}
+        logger.info(f"[CrawlJournal] 저널 초기화: {self.path}")
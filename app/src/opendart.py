@@ -0,0 +1,214 @@
+import os
+import time
+import asyncio
+
+from typing import List, Optional
+
+from app.src.http_client import DartHttpClient, http_client as shared_http_client
+from app.src.deadline import Deadline, DeadlineExceeded
+from app.utils.data import clean_account_name, float_to_formatted_string, extract_year_from_report_title
+from app.utils.logging import logger
+
+OPENDART_BASE_URL = os.getenv("OPENDART_BASE_URL", "https://opendart.fss.or.kr/api")
+OPENDART_MAX_REQUESTS_PER_MINUTE = int(os.getenv("OPENDART_MAX_REQUESTS_PER_MINUTE", 600))
+
+# 정기보고서 코드 (11011 : 사업보고서, 11012 : 반기보고서, 11013 : 1분기보고서, 11014 : 3분기보고서)
+ANNUAL_REPORT_CODE = "11011"
+# 크롤러가 수집하는 재무제표 유형만 사용 (현금흐름표 CF, 자본변동표 SCE 제외)
+TARGET_SJ_DIVS = ["BS", "IS", "CIS"]
+
+STATUS_OK = "000"
+STATUS_NO_DATA = "013"
+STATUS_RATE_LIMITED = "020"
+
+
+class OpenDartError(Exception):
+    pass
+
+
+class AsyncRateLimiter:
+    """분당 최대 요청 수를 넘지 않도록 요청 간 최소 간격을 보장"""
+
+    def __init__(self, max_requests_per_minute: int):
+        self.interval = 60 / max_requests_per_minute
+        self._lock = asyncio.Lock()
+        self._next_time = 0.0
+
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_time > now:
+                await asyncio.sleep(self._next_time - now)
+            self._next_time = max(now, self._next_time) + self.interval
+
+
+# 같은 인증키를 쓰는 모든 클라이언트가 한도를 공유
+rate_limiter = AsyncRateLimiter(OPENDART_MAX_REQUESTS_PER_MINUTE)
+
+
+class OpenDartClient:
+    """
+    OpenDART JSON API로 공시 목록과 재무제표 전체 계정을 조회하여 크롤러 데이터셋 형식으로 변환
+    - list.json : 사업보고서 목록 (브라우저 검색 대체)
+    - fnlttSinglAcntAll.json : 단일회사 전체 재무제표
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: str = OPENDART_BASE_URL, retry_count: int = 3, http_client: Optional[DartHttpClient] = None, deadline: Optional[Deadline] = None):
+        self.api_key = api_key if api_key else os.getenv("DART_API_KEY")
+        self.base_url = base_url.rstrip("/")
+        self.retry_count = retry_count
+        # 요청 기한 (HTTP 제한 시간을 남은 시간 이내로 줄이고, 기한을 넘길 백오프는 하지 않음)
+        self.deadline = deadline
+        # 커넥션 풀은 앱 전체에서 공유 (연결/재시도/캐시 정책은 DartHttpClient가 담당)
+        self.http_client = http_client if http_client else shared_http_client
+
+
+    async def request(self, endpoint: str, params: dict) -> dict:
+        """API 호출 (요청 한도 초과 시 백오프 후 재시도, 기한을 넘기면 DeadlineExceeded)"""
+        params = {"crtfc_key": self.api_key, **params}
+
+        for attempt in range(self.retry_count + 1):
+            await rate_limiter.wait()
+            try:
+                body = await self.http_client.get_json(f"{self.base_url}/{endpoint}", params=params, deadline=self.deadline)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                if self.deadline is not None and self.deadline.expired():
+                    ## 남은 시간으로 줄인 제한 시간에 걸린 경우
+                    raise DeadlineExceeded(f"OpenDART {endpoint}") from e
+                raise OpenDartError(f"API 요청 실패: {endpoint} {str(e)}") from e
+
+            status = body.get("status")
+            if status == STATUS_RATE_LIMITED and attempt < self.retry_count:
+                backoff = 2 ** (attempt + 1)
+                if self.deadline is not None and self.deadline.remaining() <= backoff:
+                    raise DeadlineExceeded(f"OpenDART {endpoint} 요청 한도 초과 대기")
+                logger.warning(f"[OpenDartClient] 요청 한도 초과, {backoff}초 후 재시도: {endpoint}")
+                await asyncio.sleep(backoff)
+                continue
+
+            if status not in (STATUS_OK, STATUS_NO_DATA):
+                raise OpenDartError(f"API 오류: {endpoint} {status} {body.get('message')}")
+
+            return body
+
+        raise OpenDartError(f"API 요청 한도 초과: {endpoint}")
+
+
+    async def fetch_report_list(self, corp_code: str, start_date: str = "19990101", end_date: Optional[str] = None, pblntf_detail_ty: str = "A001") -> List[dict]:
+        """사업보고서 목록 조회 (crawler.collect_report_list와 동일한 형식)"""
+        params = {
+            "corp_code": corp_code,
+            "bgn_de": start_date,
+            "pblntf_detail_ty": pblntf_detail_ty,
+            "page_count": 100,
+        }
+        if end_date:
+            params["end_de"] = end_date
+
+        reports = []
+        page_no = 1
+        total_page = 1
+        while page_no <= total_page:
+            body = await self.request("list.json", {**params, "page_no": page_no})
+            total_page = int(body.get("total_page", 0) or 0)
+
+            for item in body.get("list", []):
+                report_title = item["report_nm"].strip()
+                report_name, _, publish_date = report_title.partition("(")
+                if '제출기한연장신고서' in report_name:
+                    continue
+
+                reports.append({
+                    'index': str(len(reports) + 1),
+                    'company_name': item["corp_name"],
+                    'report_name': report_name.strip(),
+                    'publish_date': publish_date.rstrip(")").strip(),
+                    'report_url': f"https://dart.fss.or.kr/dsaf001/main.do?rcpNo={item['rcept_no']}",
+                    'rcept_no': item["rcept_no"]
+                })
+            page_no += 1
+
+        logger.info(f"[OpenDartClient] 보고서 목록 조회 완료: {corp_code}, {len(reports)}개")
+        return reports
+
+
+    async def fetch_statements(self, corp_code: str, bsns_year: str, fs_div: str, reprt_code: str = ANNUAL_REPORT_CODE) -> List[dict]:
+        """단일회사 전체 재무제표 조회 (데이터가 없으면 빈 리스트)"""
+        body = await self.request("fnlttSinglAcntAll.json", {
+            "corp_code": corp_code,
+            "bsns_year": bsns_year,
+            "reprt_code": reprt_code,
+            "fs_div": fs_div,
+        })
+        return body.get("list", [])
+
+
+    async def collect_report_datasets(self, report: dict, meta: dict) -> List[dict]:
+        """
+        보고서 1건(사업보고서)에 해당하는 연결/별도 재무제표를 API로 조회하여 크롤러 데이터셋으로 변환
+        API에 해당 연도 데이터가 없으면 빈 리스트를 반환 (브라우저 수집 대상)
+        """
+        fiscal_year = extract_year_from_report_title(f"({report['publish_date']})")
+        if fiscal_year is None:
+            return []
+
+        datasets = []
+        for fs_div in ["CFS", "OFS"]:
+            rows = await self.fetch_statements(meta["corp_code"], fiscal_year, fs_div)
+            datasets.extend(to_datasets(rows, fs_div, report['rcept_no'], fiscal_year, meta))
+
+        logger.info(f"[OpenDartClient] {report['rcept_no']} ({fiscal_year}) API 데이터셋 {len(datasets)}개")
+        return datasets
+
+
+    async def close(self):
+        """공유 커넥션 풀은 앱 종료 시 닫으므로 여기서는 닫지 않음"""
+        return
+
+
+def to_datasets(rows: List[dict], fs_div: str, rcept_no: str, fiscal_year: str, meta: dict) -> List[dict]:
+    """
+    fnlttSinglAcntAll 응답을 크롤러 데이터셋 형식으로 변환
+    - bsns_year는 크롤러와 같이 사업연도 (응답의 bsns_year, 없으면 보고서 회계 기간의 연도), amounts는 당기/전기/전전기 회계연도 기준
+    - API는 계정 계층 정보를 제공하지 않으므로 account_level 0, ancestors는 빈 리스트
+    """
+    years = [fiscal_year, str(int(fiscal_year) - 1), str(int(fiscal_year) - 2)]
+
+    datasets = {}
+    for row in sorted(rows, key=lambda row: (row.get("sj_div", ""), int(row.get("ord") or 0))):
+        sj_div = row.get("sj_div")
+        if sj_div not in TARGET_SJ_DIVS:
+            continue
+
+        dataset = datasets.setdefault(sj_div, {
+            "corp_name": meta.get("corp_name", ""),
+            "stock_code": meta.get("stock_code", ""),
+            "corp_code": meta.get("corp_code", ""),
+            "bsns_year": row.get("bsns_year") or fiscal_year,
+            "rcept_no": rcept_no,
+            "corp_type_value": meta.get("corp_type_value", ""),
+            "corp_type_name": meta.get("corp_type_name", ""),
+            "sj_div": f"{fs_div}_{sj_div}",
+            "unit": "원",
+            "data": []
+        })
+
+        amounts = []
+        for year, key in zip(years, ["thstrm_amount", "frmtrm_amount", "bfefrmtrm_amount"]):
+            if key in row:
+                amount = (row.get(key) or "").replace(",", "").strip()
+                amounts.append({year: float_to_formatted_string(int(amount)) if amount.lstrip("-").isdigit() else "0"})
+
+        dataset["data"].append({
+            "ord_value": len(dataset["data"]) + 1,
+            "raw_account_name": row.get("account_nm", ""),
+            "account_name": clean_account_name(row.get("account_nm", "")),
+            "amounts": amounts,
+            "account_level": 0,
+            "ancestors": []
+        })
+
+    return list(datasets.values())
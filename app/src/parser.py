@@ -0,0 +1,203 @@
+import os
+import re
+import asyncio
+import multiprocessing
+
+from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor
+
+from app.utils.data import clean_account_name, clean_paragraph_text
+from app.utils.logging import logger
+
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", os.cpu_count() or 1))
+
+# iframe 내부 테이블을 한 번의 evaluate 호출로 문자열 배열로만 구성된 스냅샷으로 추출
+# (nb 테이블 / border=1 데이터 테이블만 대상, textContent를 사용해 계정명 앞 공백을 보존)
+SNAPSHOT_TABLES_JS = """
+() => Array.from(document.querySelectorAll('table'))
+    .filter(table => table.getAttribute('class') === 'nb' || table.getAttribute('border') === '1')
+    .map(table => {
+        const headerRow = table.querySelector('thead tr');
+        return {
+            class: table.getAttribute('class'),
+            border: table.getAttribute('border'),
+            rows: Array.from(table.querySelectorAll('tr')).slice(0, 5).map(tr => ({
+                text: tr.textContent,
+                tds: Array.from(tr.querySelectorAll('td')).map(td => td.textContent),
+            })),
+            header: headerRow ? Array.from(headerRow.querySelectorAll('th')).map(th => th.textContent) : null,
+            body: Array.from(table.querySelectorAll('tbody tr')).map(tr => Array.from(tr.querySelectorAll('td')).map(td => td.textContent)),
+        };
+    })
+"""
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def to_sj_div(title: str) -> str:
+    """재무제표 제목을 sj_div 형식(CFS_BS, OFS_IS ...)으로 변환"""
+    fs_div = "CFS" if "연결" in title else "OFS"
+
+    sj_div = title
+    if "재무상태표" in title:
+        sj_div = "BS"
+    elif "포괄손익계산서" in title:
+        sj_div = "CIS"
+    elif "손익계산서" in title:
+        sj_div = "IS"
+
+    return f"{fs_div}_{sj_div}"
+
+
+def is_standard_nb_table(table: dict) -> bool:
+    """nb 테이블의 표준 양식 검증 (제목, 3개 연도행, 단위행)"""
+    rows = table["rows"]
+    if len(rows) < 5:
+        return False
+
+    years_found = 0
+    for row in rows[1:4]:
+        if row["tds"] and re.match(r'제\s*\d+\s*기', row["tds"][0].strip()):
+            years_found += 1
+
+    return years_found == 3
+
+
+def is_standard_data_table(table: dict) -> bool:
+    """데이터 테이블(border=1)의 표준 양식 검증"""
+    header = table["header"]
+    if header is None or len(header) != 4:
+        return False
+
+    for j, header_text in enumerate(header):
+        header_text = header_text.strip()
+        if j == 0 and header_text != '':
+            return False
+        if 1 < j < 4 and header_text != '' and not re.match(r'제\s*\d+\s*기', header_text):
+            return False
+
+    return True
+
+
+def parse_account_rows(body: List[List[str]], years: List[str]) -> List[dict]:
+    """데이터 테이블 행에서 계정명, 계층(앞 공백 수), 상위 계정, 3개년 금액 추출"""
+    current_accounts_by_level = {}
+    ord_value = 1
+    account_data = []
+
+    for tds in body:
+        if not tds or not tds[0]:
+            continue
+
+        raw_account_name = tds[0].replace('\u3000', ' ')
+        account_level = len(raw_account_name) - len(raw_account_name.lstrip())
+        account_name = clean_account_name(raw_account_name)
+
+        current_accounts_by_level[account_level] = account_name
+        ancestors = [current_accounts_by_level[level] for level in range(account_level) if level in current_accounts_by_level]
+
+        amounts = []
+        for k, td_text in enumerate(tds[1:4], start=1):
+            if td_text:
+                year = years[k-1] if k-1 < len(years) else ""
+                amounts.append({year: td_text.strip() if td_text.strip() else "0"})
+
+        if account_name == "과목" or not account_name:
+            continue
+
+        account_data.append({
+            "ord_value": ord_value,
+            "raw_account_name": raw_account_name,
+            "account_name": account_name,
+            "amounts": amounts,
+            "account_level": account_level,
+            "ancestors": ancestors
+        })
+        ord_value += 1
+
+    return account_data
+
+
+def parse_statement_tables(tables: List[dict], meta: dict) -> List[dict]:
+    """
+    테이블 스냅샷을 crawler.search_right_panel과 동일한 형식의 데이터셋으로 변환
+    프로세스 풀에서 실행되므로 입력/출력은 모두 pickle 가능한 기본 타입만 사용
+
+    :param meta: corp_name, stock_code, corp_code, bsns_year, rcept_no, corp_type_value, corp_type_name, target_sj_list
+    """
+    current_year = meta["bsns_year"]
+    ## bsns_year는 사업연도이므로 당기/전기/전전기 순
+    years = [current_year, str(int(current_year) - 1), str(int(current_year) - 2)]
+
+    dataset = []
+    for i, table in enumerate(tables):
+        try:
+            if table["class"] == "nb":
+                if not is_standard_nb_table(table):
+                    continue
+
+                nb_title = clean_paragraph_text(table["rows"][0]["text"])
+                if nb_title not in meta["target_sj_list"]:
+                    continue
+
+                unit = re.search(r'\(\s*단위\s*:\s*([^)]+)\)', table["rows"][4]["text"])
+                dataset.append({
+                    "corp_name": meta["corp_name"],
+                    "stock_code": meta["stock_code"],
+                    "corp_code": meta["corp_code"],
+                    "bsns_year": current_year,
+                    "rcept_no": meta["rcept_no"],
+                    "corp_type_value": meta["corp_type_value"],
+                    "corp_type_name": meta["corp_type_name"],
+                    "sj_div": to_sj_div(nb_title),
+                    "unit": unit.group(1).strip() if unit else None,
+                    "data": []
+                })
+
+            elif table["border"] == "1":
+                if not is_standard_data_table(table):
+                    logger.warning(f"[parse_statement_tables] {i}번째 테이블: 표준 양식이 아닌 데이터 테이블, 스킵합니다.")
+                    continue
+
+                if len(dataset) > 0:
+                    dataset[-1]["data"] = parse_account_rows(table["body"], years)
+
+        except Exception as e:
+            logger.warning(f"[parse_statement_tables] 테이블 {i+1} 처리 중 오류: {str(e)}")
+            continue
+
+    return dataset
+
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    """
+    파싱 프로세스 풀
+    - 스레드가 여럿 도는 프로세스(uvicorn, to_thread 워커, Playwright 드라이버)를 fork하면 자식이 잠긴 락(로거 등)을 물려받아 멈출 수 있으므로 spawn으로 생성
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        logger.info(f"[get_parse_executor] 파싱 프로세스 풀 생성 (workers: {PARSE_WORKERS})")
+    return _executor
+
+
+def start_parse_executor():
+    """프로세스 풀을 만들고 워커 프로세스를 미리 띄움 (lifespan 워밍업에서 호출, 첫 요청에서 spawn 지연 방지)"""
+    executor = get_parse_executor()
+    futures = [executor.submit(os.getpid) for _ in range(PARSE_WORKERS)]
+    for future in futures:
+        future.result()
+    logger.info(f"[start_parse_executor] 파싱 워커 프로세스 준비 완료 (workers: {PARSE_WORKERS})")
+
+
+def shutdown_parse_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def parse_in_pool(tables: List[dict], meta: dict) -> List[dict]:
+    """이벤트 루프를 막지 않도록 프로세스 풀에서 파싱하고 결과를 기다림"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_executor(), parse_statement_tables, tables, meta)
@@ -0,0 +1,176 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, List, Optional
+
+from app.src.statement_index import StatementIndex, statement_index
+from app.src.statement_store import StatementStore, statement_store
+from app.utils.logging import logger
+
+RATIO_SJ_DIV = "RATIOS"
+
+# 지표 계산에 쓰는 계정 (정규화된 계정명 → 지표 항목), 앞의 계정명이 우선
+ACCOUNT_ALIASES = {
+    "BS": {
+        "total_assets": ["자산총계"],
+        "total_liabilities": ["부채총계"],
+        "total_equity": ["자본총계"],
+        "current_assets": ["유동자산"],
+        "current_liabilities": ["유동부채"],
+    },
+    "IS": {
+        "revenue": ["매출액", "수익", "영업수익", "매출"],
+        "gross_profit": ["매출총이익"],
+        "operating_income": ["영업이익"],
+        "net_income": ["당기순이익"],
+    },
+}
+
+# 지표 정의 : ratio = numerator / denominator * scale, growth = 전년 대비 증감률(%)
+RATIO_DEFINITIONS = [
+    {"name": "부채비율", "numerator": "total_liabilities", "denominator": "total_equity", "scale": 100},
+    {"name": "유동비율", "numerator": "current_assets", "denominator": "current_liabilities", "scale": 100},
+    {"name": "자기자본비율", "numerator": "total_equity", "denominator": "total_assets", "scale": 100},
+    {"name": "매출총이익률", "numerator": "gross_profit", "denominator": "revenue", "scale": 100},
+    {"name": "영업이익률", "numerator": "operating_income", "denominator": "revenue", "scale": 100},
+    {"name": "순이익률", "numerator": "net_income", "denominator": "revenue", "scale": 100},
+    {"name": "ROA", "numerator": "net_income", "denominator": "total_assets", "scale": 100},
+    {"name": "ROE", "numerator": "net_income", "denominator": "total_equity", "scale": 100},
+    {"name": "매출액증가율", "growth": "revenue"},
+    {"name": "영업이익증가율", "growth": "operating_income"},
+    {"name": "순이익증가율", "growth": "net_income"},
+]
+
+
+def parse_amount_series(amounts: pd.Series) -> pd.Series:
+    """'1,234', '(1,234)', '-1,234' 형식의 금액 문자열을 한 번에 float로 변환 (변환 불가 값은 NaN)"""
+    text = amounts.astype(str).str.strip()
+    negative = text.str.startswith('(') & text.str.endswith(')')
+    values = pd.to_numeric(text.str.replace(r'[(),\s]', '', regex=True), errors='coerce')
+    return values.where(~negative, -values)
+
+
+def load_account_panel(fs_div: str = "CFS", index: StatementIndex = statement_index, corp_keys: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    색인된 재무제표에서 지표 계산용 계정만 골라 (corp_key, year) x 지표 항목 패널 생성
+    손익 항목은 IS가 없으면 CIS(포괄손익계산서)에서 가져옴
+    """
+    records = {"corp_key": [], "year": [], "item": [], "priority": [], "amount": []}
+    sources = [("BS", f"{fs_div}_BS", 0), ("IS", f"{fs_div}_IS", 0), ("IS", f"{fs_div}_CIS", 1)]
+    corp_key_filter = set(corp_keys) if corp_keys else None
+
+    for group, sj_div, source_priority in sources:
+        alias_rank = {
+            account_name: (item, rank)
+            for item, account_names in ACCOUNT_ALIASES[group].items()
+            for rank, account_name in enumerate(account_names)
+        }
+        for corp_key, rows in index.iter_statements(sj_div):
+            if corp_key_filter is not None and corp_key not in corp_key_filter:
+                continue
+            for row in rows:
+                alias = alias_rank.get(row["account_name"])
+                if alias is None:
+                    continue
+                item, rank = alias
+                for year, amount in row["amounts"].items():
+                    records["corp_key"].append(corp_key)
+                    records["year"].append(int(year))
+                    records["item"].append(item)
+                    records["priority"].append(source_priority * 100 + rank)
+                    records["amount"].append(amount)
+
+    long_df = pd.DataFrame(records)
+    if long_df.empty:
+        return pd.DataFrame()
+
+    long_df["amount"] = parse_amount_series(long_df["amount"])
+    # 같은 항목이 여러 계정/재무제표에 있으면 우선순위가 가장 높은(작은) 값 하나만 사용
+    long_df = long_df.sort_values("priority", kind="stable").drop_duplicates(["corp_key", "year", "item"])
+    return long_df.pivot(index=["corp_key", "year"], columns="item", values="amount").sort_index()
+
+
+def compute_ratios(panel: pd.DataFrame, definitions: List[dict] = RATIO_DEFINITIONS) -> pd.DataFrame:
+    """
+    패널 전체에 대해 지표를 열 단위로 계산
+    분모가 0이거나 값이 없으면 NaN (JSON 변환 시 sanitize_json_values로 null 처리)
+    """
+    ratios = pd.DataFrame(index=panel.index)
+    for definition in definitions:
+        if "growth" in definition:
+            if definition["growth"] not in panel:
+                ratios[definition["name"]] = np.nan
+                continue
+            values = panel[definition["growth"]]
+            previous = values.groupby(level="corp_key").shift(1)
+            # 직전 행이 바로 전년도인 경우만 증감률 계산
+            years = pd.Series(panel.index.get_level_values("year"), index=panel.index)
+            consecutive = years.groupby(level="corp_key").diff() == 1
+            growth = (values - previous) / previous.abs().replace(0, np.nan) * 100
+            ratios[definition["name"]] = growth.where(consecutive)
+        else:
+            if definition["numerator"] not in panel or definition["denominator"] not in panel:
+                ratios[definition["name"]] = np.nan
+                continue
+            denominator = panel[definition["denominator"]].replace(0, np.nan)
+            ratios[definition["name"]] = panel[definition["numerator"]] / denominator * definition.get("scale", 1)
+
+    return ratios.replace([np.inf, -np.inf], np.nan).round(4)
+
+
+def ratios_to_statement(ratios: pd.DataFrame) -> Dict[str, List[dict]]:
+    """기업별 지표를 저장소의 재무제표 형식(계정 목록 + 연도별 값)으로 변환"""
+    ratios = ratios.sort_index(level=["corp_key", "year"], ascending=[True, False])
+    corp_keys = ratios.index.get_level_values("corp_key").to_numpy()
+    years = ratios.index.get_level_values("year").astype(str).to_numpy()
+    # NaN은 None으로 (sanitize_json_values와 동일한 규칙)
+    values = ratios.astype(object).where(ratios.notna(), None).to_numpy()
+    boundaries = [0, *(np.flatnonzero(corp_keys[1:] != corp_keys[:-1]) + 1), len(corp_keys)]
+
+    statements = {}
+    for start, end in zip(boundaries[:-1], boundaries[1:]):
+        statements[corp_keys[start]] = [
+            {
+                "ord_value": ord_value,
+                "raw_account_name": name,
+                "account_name": name,
+                "amounts": [{years[i]: values[i, column]} for i in range(start, end)],
+                "account_level": 0,
+                "ancestors": []
+            }
+            for column, (ord_value, name) in enumerate(enumerate(ratios.columns, start=1))
+        ]
+    return statements
+
+
+def compute_market_ratios(fs_div: str = "CFS", corp_keys: Optional[List[str]] = None, index: StatementIndex = statement_index, store: Optional[StatementStore] = statement_store) -> pd.DataFrame:
+    """
+    색인된 전체(또는 지정) 기업의 지표를 일괄 계산하고, store가 주어지면 기업별 RATIOS로 저장
+    저장된 지표는 /statements/{corp_key}/{fs_div}_RATIOS 로 조회
+    """
+    panel = load_account_panel(fs_div, index=index, corp_keys=corp_keys)
+    if panel.empty:
+        logger.warning(f"[compute_market_ratios] {fs_div} 지표를 계산할 재무제표가 없습니다.")
+        return pd.DataFrame(columns=[definition["name"] for definition in RATIO_DEFINITIONS])
+
+    ratios = compute_ratios(panel)
+
+    if store is not None:
+        for corp_key, rows in ratios_to_statement(ratios).items():
+            store.put(corp_key, f"{fs_div}_{RATIO_SJ_DIV}", rows, source="ratios")
+            index.update(corp_key, f"{fs_div}_{RATIO_SJ_DIV}")
+
+    logger.info(f"[compute_market_ratios] {fs_div} 지표 계산 완료: 기업 {ratios.index.get_level_values('corp_key').nunique()}개, {len(ratios)}개 기업-연도")
+    return ratios
+
+
+if __name__ == "__main__":
+    # python -m app.src.ratios [--fs-div CFS]
+    parser = argparse.ArgumentParser(description="저장된 재무제표로 재무비율 일괄 계산")
+    parser.add_argument("--fs-div", default="CFS", choices=["CFS", "OFS"])
+    args = parser.parse_args()
+
+    statement_index.refresh()
+    compute_market_ratios(args.fs_div)
@@ -0,0 +1,90 @@
+import os
+import uuid
+import psutil
+
+from typing import Optional
+
+from app.utils.logging import logger
+
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+# 크롤러가 띄운 브라우저를 구분하기 위해 실행 인자에 추가하는 스위치 (chromium은 모르는 스위치를 무시)
+BROWSER_MARKER_ARG = "--dart-crawler-browser"
+
+
+def new_browser_marker() -> str:
+    """
+    브라우저 실행 인자에 붙이는 고유 표식
+    같은 컨테이너에 여러 크롤러/브라우저가 떠 있어도 이 표식으로 자기 브라우저 프로세스만 찾음
+    """
+    return f"{BROWSER_MARKER_ARG}={uuid.uuid4().hex}"
+
+
+def _find_marked_browser(marker: str) -> Optional[psutil.Process]:
+    for child in psutil.Process(os.getpid()).children(recursive=True):
+        try:
+            if marker in child.cmdline():
+                return child
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return None
+
+
+def get_browser_rss_mb(marker: Optional[str] = None) -> float:
+    """
+    브라우저 프로세스 트리(browser, renderer, gpu, utility ...)의 RSS 합계(MB)
+    - marker가 주어지면 실행 인자에 marker가 있는 브라우저 프로세스와 그 하위 프로세스만 합산
+    - marker가 없으면 현재 프로세스 하위의 chromium 프로세스를 모두 합산
+    """
+    total_rss = 0
+    try:
+        if marker:
+            root = _find_marked_browser(marker)
+            processes = [root] + root.children(recursive=True) if root is not None else []
+        else:
+            processes = psutil.Process(os.getpid()).children(recursive=True)
+
+        for process in processes:
+            try:
+                if marker or any(name in process.name().lower() for name in BROWSER_PROCESS_NAMES):
+                    total_rss += process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+    except Exception as e:
+        logger.error(f"[get_browser_rss_mb] 브라우저 메모리 사용량 확인 실패: {str(e)}")
+
+    return total_rss / 1024 / 1024
+
+
+class RecyclePolicy:
+    """
+    브라우저/컨텍스트 재활용 정책
+    - 컨텍스트당 처리한 보고서 수 또는 브라우저 RSS가 컨텍스트 임계치를 넘으면 컨텍스트 교체
+    - 브라우저 RSS가 브라우저 임계치를 넘거나 컨텍스트 교체 횟수가 한도를 넘으면 브라우저 재시작
+    """
+    NONE = "none"
+    CONTEXT = "context"
+    BROWSER = "browser"
+
+    def __init__(
+        self,
+        max_reports_per_context: int = int(os.getenv("RECYCLE_MAX_REPORTS_PER_CONTEXT", 20)),
+        context_rss_mb: float = float(os.getenv("RECYCLE_CONTEXT_RSS_MB", 1024)),
+        browser_rss_mb: float = float(os.getenv("RECYCLE_BROWSER_RSS_MB", 2048)),
+        max_contexts_per_browser: int = int(os.getenv("RECYCLE_MAX_CONTEXTS_PER_BROWSER", 10)),
+    ):
+        self.max_reports_per_context = max_reports_per_context
+        self.context_rss_mb = context_rss_mb
+        self.browser_rss_mb = browser_rss_mb
+        self.max_contexts_per_browser = max_contexts_per_browser
+
+
+    def decide(self, reports_in_context: int, contexts_in_browser: int, rss_mb: float) -> str:
+        if rss_mb >= self.browser_rss_mb:
+            return self.BROWSER
+
+        if reports_in_context >= self.max_reports_per_context or rss_mb >= self.context_rss_mb:
+            if contexts_in_browser + 1 >= self.max_contexts_per_browser:
+                return self.BROWSER
+            return self.CONTEXT
+
+        return self.NONE
@@ -0,0 +1,172 @@
+import os
+import sys
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, List, Optional
+
+from app.utils.logging import logger
+
+REGISTRY_SNAPSHOT_DIR = os.getenv("REGISTRY_SNAPSHOT_DIR", "/playwright-crawler/data/registry_snapshot")
+SNAPSHOT_FORMAT_VERSION = 1
+
+# 테이블별 저장 컬럼과 정렬 색인을 만들 컬럼
+SNAPSHOT_TABLES = {
+    "companies": {
+        "columns": ['corp_name', 'stock_code', 'corp_code', 'market', 'level1', 'level2', 'level3', 'level4', 'level5', 'name_key'],
+        "indexes": ['corp_name', 'name_key', 'stock_code', 'corp_code'],
+    },
+    "corp_codes": {
+        "columns": ['corp_code', 'corp_name', 'stock_code', 'modify_date'],
+        "indexes": ['corp_name', 'stock_code'],
+    },
+}
+
+
+def _source_signature(paths: List[str]) -> Dict[str, list]:
+    """원본 CSV 파일의 (mtime, size) - 스냅샷 컴파일 이후 변경 여부 판단용"""
+    signature = {}
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            signature[path] = [int(stat.st_mtime), stat.st_size]
+    return signature
+
+
+def _to_fixed_width(values: pd.Series) -> np.ndarray:
+    """빈 값은 ''로 채운 고정폭 유니코드 배열 (np.load의 mmap_mode로 그대로 매핑 가능)"""
+    values = values.astype(object).where(values.notna(), '').astype(str)
+    return np.asarray(values.to_numpy(), dtype=str)
+
+
+def write_snapshot(tables: Dict[str, pd.DataFrame], sources: List[str], snapshot_dir: str = REGISTRY_SNAPSHOT_DIR):
+    """
+    DataFrame들을 컬럼별 .npy 파일과 정렬 색인(키 배열 + 행 번호 배열)으로 저장
+    임시 디렉터리에 모두 쓴 뒤 교체하므로 읽는 프로세스는 항상 완성된 스냅샷만 봄
+    """
+    tmp_dir = f"{snapshot_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    manifest = {"version": SNAPSHOT_FORMAT_VERSION, "sources": _source_signature(sources), "tables": {}}
+    for table_name, df in tables.items():
+        spec = SNAPSHOT_TABLES[table_name]
+        for column in spec["columns"]:
+            values = _to_fixed_width(df[column] if column in df else pd.Series([''] * len(df)))
+            np.save(os.path.join(tmp_dir, f"{table_name}.{column}.npy"), values)
+
+            if column in spec["indexes"]:
+                order = np.argsort(values, kind="stable").astype(np.int32)
+                np.save(os.path.join(tmp_dir, f"{table_name}.{column}.order.npy"), order)
+                np.save(os.path.join(tmp_dir, f"{table_name}.{column}.keys.npy"), values[order])
+
+        manifest["tables"][table_name] = {"rows": len(df), "columns": spec["columns"], "indexes": spec["indexes"]}
+
+    with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    old_dir = f"{snapshot_dir}.old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(snapshot_dir):
+        os.rename(snapshot_dir, old_dir)
+    os.rename(tmp_dir, snapshot_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+class SnapshotTable:
+    """읽기 전용으로 메모리 매핑된 스냅샷 테이블 (페이지는 OS 페이지 캐시를 통해 프로세스 간 공유)"""
+
+    def __init__(self, snapshot_dir: str, name: str, spec: dict):
+        self.name = name
+        self.rows = spec["rows"]
+        self.columns = {
+            column: np.load(os.path.join(snapshot_dir, f"{name}.{column}.npy"), mmap_mode="r")
+            for column in spec["columns"]
+        }
+        self.indexes = {
+            column: (
+                np.load(os.path.join(snapshot_dir, f"{name}.{column}.keys.npy"), mmap_mode="r"),
+                np.load(os.path.join(snapshot_dir, f"{name}.{column}.order.npy"), mmap_mode="r"),
+            )
+            for column in spec["indexes"]
+        }
+
+
+    def __len__(self):
+        return self.rows
+
+
+    def row(self, row_id: int) -> dict:
+        """행을 dict로 반환 (빈 문자열은 None)"""
+        return {column: (str(values[row_id]) or None) for column, values in self.columns.items()}
+
+
+    def lookup_ids(self, column: str, value: str) -> np.ndarray:
+        keys, order = self.indexes[column]
+        lo = np.searchsorted(keys, value, side="left")
+        hi = np.searchsorted(keys, value, side="right")
+        return np.sort(order[lo:hi])
+
+
+    def lookup(self, column: str, value: str) -> List[dict]:
+        """색인 컬럼 값이 일치하는 행 목록 (원본 파일 순서)"""
+        if not isinstance(value, str) or not value:
+            return []
+        return [self.row(row_id) for row_id in self.lookup_ids(column, value)]
+
+
+    def to_frame(self) -> pd.DataFrame:
+        """pandas 연산이 필요한 경우용 DataFrame 복사본 (빈 문자열은 None)"""
+        df = pd.DataFrame({column: np.asarray(values, dtype=object) for column, values in self.columns.items()})
+        return df.where(df != '', None)
+
+
+class RegistrySnapshot:
+    def __init__(self, snapshot_dir: str = REGISTRY_SNAPSHOT_DIR):
+        self.snapshot_dir = snapshot_dir
+        with open(os.path.join(snapshot_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("version") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 버전: {self.manifest.get('version')}")
+
+        self.tables = {
+            name: SnapshotTable(snapshot_dir, name, spec)
+            for name, spec in self.manifest["tables"].items()
+        }
+
+
+    def __getitem__(self, table_name: str) -> SnapshotTable:
+        return self.tables[table_name]
+
+
+    def is_stale(self, sources: List[str]) -> bool:
+        """원본 CSV가 컴파일 이후 변경/추가/삭제되었는지 여부"""
+        return _source_signature(sources) != self.manifest["sources"]
+
+
+def open_snapshot(sources: List[str], snapshot_dir: str = REGISTRY_SNAPSHOT_DIR) -> Optional[RegistrySnapshot]:
+    """스냅샷이 없거나 원본보다 오래되었으면 None (CSV 로드로 대체)"""
+    if not os.path.exists(os.path.join(snapshot_dir, "manifest.json")):
+        return None
+
+    try:
+        snapshot = RegistrySnapshot(snapshot_dir)
+    except Exception as e:
+        logger.warning(f"[open_snapshot] 스냅샷 로드 실패: {str(e)}")
+        return None
+
+    if snapshot.is_stale(sources):
+        logger.warning(f"[open_snapshot] 원본 CSV가 변경되어 스냅샷을 사용하지 않습니다. 스냅샷을 다시 컴파일하세요: {snapshot_dir}")
+        return None
+
+    return snapshot
+
+
+if __name__ == "__main__":
+    # python -m app.src.registry_snapshot [출력 디렉터리]
+    from app.src.corp_code import compile_registry_snapshot
+
+    compile_registry_snapshot(sys.argv[1] if len(sys.argv) > 1 else REGISTRY_SNAPSHOT_DIR)
@@ -0,0 +1,68 @@
+import re
+
+from typing import List, Tuple
+
+from app.utils.data import extract_year_from_report_title
+from app.utils.logging import logger
+
+AMENDMENT_PATTERN = re.compile(r'^\s*\[([^\]]+)\]')
+
+
+def get_fiscal_period(report: dict) -> str:
+    """보고서의 회계 기간 (사업보고서 (2023.12) → '2023.12', 형식이 다르면 연도만 사용)"""
+    publish_date = report.get('publish_date', '')
+    if re.match(r'^\d{4}\.\d{2}$', publish_date):
+        return publish_date
+
+    return extract_year_from_report_title(f"{report.get('report_name', '')} ({publish_date})")
+
+
+def get_fiscal_year(report: dict) -> str:
+    """
+    보고서의 사업연도 (회계 기간의 연도, 정정/지연 제출 보고서도 접수 연도와 무관하게 같은 값)
+    회계 기간을 알 수 없으면 사업보고서는 다음 해에 제출된다고 보고 접수 연도 - 1
+    """
+    period = get_fiscal_period(report)
+    if period:
+        return period[:4]
+
+    logger.warning(f"[get_fiscal_year] 회계 기간을 알 수 없어 접수 연도로 추정: {report.get('rcept_no')} {report.get('report_name', '')}")
+    return str(int(report['rcept_no'][:4]) - 1)
+
+
+def select_latest_reports(reports: List[dict]) -> Tuple[List[dict], List[dict]]:
+    """
+    회계 기간별로 원본 보고서와 정정 보고서([기재정정] 등)를 묶어 가장 최근 접수(rcept_no)된 보고서만 남김
+
+    Returns:
+        tuple: (선택된 보고서 목록 - 원래 순서 유지, 건너뛴 보고서 목록 - skip_reason 포함)
+    """
+    latest_by_period = {}
+    for report in reports:
+        period = get_fiscal_period(report)
+        if period is None:
+            continue
+
+        latest = latest_by_period.get(period)
+        if latest is None or report['rcept_no'] > latest['rcept_no']:
+            latest_by_period[period] = report
+
+    selected = []
+    skipped = []
+    for report in reports:
+        period = get_fiscal_period(report)
+        latest = latest_by_period.get(period)
+        if latest is None or latest['rcept_no'] == report['rcept_no']:
+            selected.append(report)
+            continue
+
+        amendment = AMENDMENT_PATTERN.match(latest['report_name'])
+        skipped.append({
+            **report,
+            "skip_reason": f"{period} 기간의 최신 보고서로 대체됨: {latest['rcept_no']} ({amendment.group(1) if amendment else latest['report_name']})"
+        })
+
+    if skipped:
+        logger.info(f"[select_latest_reports] 정정 등으로 대체된 보고서 {len(skipped)}개 제외: {[report['rcept_no'] for report in skipped]}")
+
+    return selected, skipped
@@ -0,0 +1,151 @@
+import os
+import time
+import asyncio
+
+from collections import deque
+from typing import Dict, Optional
+
+from app.utils.logging import logger
+
+# 동시에 보고서를 수집할 수 있는 작업 슬롯 수 (브라우저 풀 크기와 같게 두는 것을 권장)
+CRAWL_WORKER_SLOTS = int(os.getenv("CRAWL_WORKER_SLOTS", os.getenv("BROWSER_POOL_SIZE", 2)))
+# interactive 요청 전용으로 항상 비워 두는 슬롯 수
+CRAWL_RESERVED_INTERACTIVE_SLOTS = int(os.getenv("CRAWL_RESERVED_INTERACTIVE_SLOTS", 1))
+
+INTERACTIVE = "interactive"
+BACKFILL = "backfill"
+# 우선순위 클래스별 가중치 (대기 중인 클래스끼리 가중치 비율로 슬롯을 나눠 가짐)
+PRIORITY_WEIGHTS = {INTERACTIVE: 4, BACKFILL: 1}
+WAIT_TIME_WINDOW = 500
+
+
+class CrawlScheduler:
+    """
+    보고서 단위 작업 슬롯 스케줄러
+    - 크롤러는 보고서 1건을 수집할 때마다 슬롯을 받고 끝나면 반환하므로, 긴 백필도 보고서 경계에서 다른 요청에 슬롯을 양보
+    - 슬롯이 비면 대기 중인 클래스 중 (받은 슬롯 수 / 가중치)가 가장 작은 클래스에 배정 (가중 공정 분배)
+    - interactive가 아닌 클래스는 reserved_interactive개를 뺀 슬롯까지만 사용
+    - 클래스별 대기 시간 집계
+    """
+
+    def __init__(
+        self,
+        slots: int = CRAWL_WORKER_SLOTS,
+        reserved_interactive: int = CRAWL_RESERVED_INTERACTIVE_SLOTS,
+        weights: Dict[str, int] = PRIORITY_WEIGHTS,
+    ):
+        self.slots = max(1, slots)
+        self.reserved_interactive = min(max(0, reserved_interactive), self.slots - 1)
+        self.weights = dict(weights)
+        self._waiters: Dict[str, deque] = {priority: deque() for priority in self.weights}
+        self.in_use: Dict[str, int] = {priority: 0 for priority in self.weights}
+        self.served: Dict[str, int] = {priority: 0 for priority in self.weights}
+        self._wait_times: Dict[str, deque] = {priority: deque(maxlen=WAIT_TIME_WINDOW) for priority in self.weights}
+
+
+    def _validate(self, priority: str):
+        if priority not in self.weights:
+            raise ValueError(f"알 수 없는 우선순위 클래스: {priority} (가능한 값: {list(self.weights)})")
+
+
+    def _capacity(self, priority: str) -> int:
+        return self.slots if priority == INTERACTIVE else self.slots - self.reserved_interactive
+
+
+    def _can_run(self, priority: str) -> bool:
+        return sum(self.in_use.values()) < self.slots and self.in_use[priority] < self._capacity(priority)
+
+
+    def _activate(self, priority: str):
+        """
+        쉬고 있던 클래스가 다시 요청하면 받은 슬롯 수를 활성 클래스의 진행도에 맞춤
+        (오래 쉬었던 클래스가 밀린 몫을 한꺼번에 가져가지 않도록)
+        """
+        if self._waiters[priority] or self.in_use[priority]:
+            return
+        active = [p for p in self.weights if p != priority and (self._waiters[p] or self.in_use[p])]
+        if active:
+            progress = min(self.served[p] / self.weights[p] for p in active)
+            self.served[priority] = max(self.served[priority], int(progress * self.weights[priority]))
+
+
+    def _dispatch(self):
+        """빈 슬롯을 대기 중인 클래스에 가중 공정 분배로 배정"""
+        while True:
+            candidates = [
+                priority for priority, waiters in self._waiters.items()
+                if waiters and self._can_run(priority)
+            ]
+            if not candidates:
+                return
+
+            priority = min(candidates, key=lambda p: (self.served[p] / self.weights[p], -self.weights[p]))
+            future = self._waiters[priority].popleft()
+            if future.done():
+                continue
+            self.in_use[priority] += 1
+            self.served[priority] += 1
+            future.set_result(None)
+
+
+    async def acquire(self, priority: str = INTERACTIVE, timeout: Optional[float] = None) -> float:
+        """
+        슬롯을 받을 때까지 대기
+
+        :param timeout: 최대 대기 시간(초), 초과하면 asyncio.TimeoutError
+        :return: 대기 시간(초)
+        """
+        self._validate(priority)
+        started_at = time.monotonic()
+        self._activate(priority)
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(future)
+        self._dispatch()
+        if not future.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout)
+            except BaseException:
+                if future.done() and not future.cancelled():
+                    ## 슬롯을 받은 직후 취소된 경우 바로 반환
+                    self.release(priority)
+                else:
+                    future.cancel()
+                    if future in self._waiters[priority]:
+                        self._waiters[priority].remove(future)
+                raise
+
+        wait_seconds = time.monotonic() - started_at
+        self._wait_times[priority].append(wait_seconds)
+        if wait_seconds >= 1:
+            logger.info(f"[CrawlScheduler] {priority} 슬롯 대기 {wait_seconds:.2f}초 (사용 중: {self.in_use})")
+        return wait_seconds
+
+
+    def release(self, priority: str = INTERACTIVE):
+        self.in_use[priority] = max(0, self.in_use[priority] - 1)
+        self._dispatch()
+
+
+    def metrics(self) -> dict:
+        classes = {}
+        for priority, wait_times in self._wait_times.items():
+            ordered = sorted(wait_times)
+            classes[priority] = {
+                "weight": self.weights[priority],
+                "in_use": self.in_use[priority],
+                "waiting": len(self._waiters[priority]),
+                "served": self.served[priority],
+                "wait_seconds_avg": round(sum(ordered) / len(ordered), 4) if ordered else 0.0,
+                "wait_seconds_p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4) if ordered else 0.0,
+                "wait_seconds_max": round(ordered[-1], 4) if ordered else 0.0,
+            }
+        return {
+            "slots": self.slots,
+            "reserved_interactive": self.reserved_interactive,
+            "classes": classes,
+        }
+
+
+# 앱 전체에서 공유하는 스케줄러 (crawler 엔드포인트에서 priority 파라미터로 클래스 지정)
+crawl_scheduler = CrawlScheduler()
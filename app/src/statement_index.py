@@ -0,0 +1,157 @@
+import hashlib
+import threading
+
+from typing import Dict, List, Optional, Tuple
+
+from app.src.statement_store import StatementStore, statement_store
+from app.utils.logging import logger
+
+
+def _make_etag(*parts) -> str:
+    return '"' + hashlib.sha1("|".join(str(part) for part in parts).encode('utf-8')).hexdigest() + '"'
+
+
+def _filter_amounts(amounts: Dict[str, str], from_year: Optional[int], to_year: Optional[int]) -> List[dict]:
+    return [
+        {year: value} for year, value in amounts.items()
+        if (from_year is None or int(year) >= from_year) and (to_year is None or int(year) <= to_year)
+    ]
+
+
+def _project(row: dict, fields: Optional[List[str]]) -> dict:
+    if not fields:
+        return row
+    return {field: row[field] for field in fields if field in row}
+
+
+class StatementIndex:
+    """
+    저장소의 최신 재무제표를 메모리에 올린 조회용 색인
+    - (corp_key, sj_div) → 계정 목록 (금액은 연도 → 값 dict로 보관)
+    - (sj_div, account_name) → 해당 계정을 가진 기업 목록
+    저장소 ref의 latest 해시를 ETag 원천으로 사용
+    갱신(update)은 스레드에서 실행되므로 색인 변경과 조회 모두 잠금 안에서 수행
+    (재무제표 항목은 통째로 교체만 하고 수정하지 않으므로, 조회는 잠금 안에서 참조만 꺼내고 가공은 잠금 밖에서 함)
+    """
+
+    def __init__(self, store: StatementStore = statement_store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._statements: Dict[Tuple[str, str], dict] = {}
+        self._account_postings: Dict[Tuple[str, str], set] = {}
+
+
+    def _index_statement(self, corp_key: str, sj_div: str, digest: str, payload: List[dict]):
+        rows = []
+        accounts = {}
+        for row in payload:
+            amounts = {}
+            for amount in row.get('amounts', []):
+                amounts.update({year: value for year, value in amount.items() if year})
+            rows.append({**row, "amounts": amounts})
+            accounts.setdefault(row['account_name'], []).append(len(rows) - 1)
+
+        key = (corp_key, sj_div)
+        previous = self._statements.get(key)
+        if previous is not None:
+            for account_name in previous["accounts"]:
+                self._account_postings.get((sj_div, account_name), set()).discard(corp_key)
+
+        self._statements[key] = {"hash": digest, "rows": rows, "accounts": accounts}
+        for account_name in accounts:
+            self._account_postings.setdefault((sj_div, account_name), set()).add(corp_key)
+
+
+    def update(self, corp_key: str, sj_div: str):
+        """저장소의 최신본이 바뀐 경우에만 다시 읽음"""
+        ref = self.store.get_ref(corp_key, sj_div)
+        if ref is None or ref["latest"] is None:
+            return
+
+        with self._lock:
+            current = self._statements.get((corp_key, ref["sj_div"]))
+            if current is not None and current["hash"] == ref["latest"]:
+                return
+            self._index_statement(corp_key, ref["sj_div"], ref["latest"], self.store.get(ref["latest"]))
+
+
+    def refresh(self):
+        """저장소 전체 ref를 훑어 변경된 재무제표만 다시 색인"""
+        for ref in self.store.list_refs():
+            self.update(ref["corp_key"], ref["sj_div"])
+        with self._lock:
+            statement_count, account_count = len(self._statements), len(self._account_postings)
+        logger.info(f"[StatementIndex] 색인 갱신 완료: 재무제표 {statement_count}개, 계정 {account_count}개")
+
+
+    def iter_statements(self, sj_div: str):
+        """sj_div 재무제표를 가진 모든 기업의 (corp_key, 계정 목록 - 금액은 연도 → 값 dict)"""
+        sj_div = sj_div.upper()
+        with self._lock:
+            statements = [
+                (corp_key, statement["rows"])
+                for (corp_key, key_sj_div), statement in self._statements.items() if key_sj_div == sj_div
+            ]
+        yield from statements
+
+
+    def list_statements(self, corp_key: str) -> List[dict]:
+        with self._lock:
+            statements = [(sj_div, statement) for (key, sj_div), statement in self._statements.items() if key == corp_key]
+        return [
+            {"sj_div": sj_div, "hash": statement["hash"], "accounts": len(statement["rows"])}
+            for sj_div, statement in sorted(statements, key=lambda item: item[0])
+        ]
+
+
+    def get_statement(self, corp_key: str, sj_div: str, from_year: Optional[int] = None, to_year: Optional[int] = None, fields: Optional[List[str]] = None) -> Tuple[Optional[str], Optional[List[dict]]]:
+        """
+        기업의 재무제표 조회
+
+        Returns:
+            tuple: (ETag, 계정 목록) - 없으면 (None, None)
+        """
+        with self._lock:
+            statement = self._statements.get((corp_key, sj_div.upper()))
+        if statement is None:
+            return None, None
+
+        etag = _make_etag(statement["hash"], from_year, to_year, fields)
+        rows = [
+            _project({**row, "amounts": _filter_amounts(row["amounts"], from_year, to_year)}, fields)
+            for row in statement["rows"]
+        ]
+        return etag, rows
+
+
+    def get_account_series(self, sj_div: str, account_name: str, corp_keys: Optional[List[str]] = None, from_year: Optional[int] = None, to_year: Optional[int] = None) -> Tuple[str, List[dict]]:
+        """
+        계정 하나의 연도별 금액을 여러 기업에 걸쳐 조회 (같은 계정명이 여러 번 나오면 첫 번째 계정 사용)
+
+        Returns:
+            tuple: (ETag, [{"corp_key", "account_name", "ancestors", "amounts": [{"2024": ...}, ...]}, ...])
+        """
+        sj_div = sj_div.upper()
+        with self._lock:
+            candidates = set(self._account_postings.get((sj_div, account_name), set()))
+            if corp_keys:
+                candidates &= set(corp_keys)
+            statements = {corp_key: self._statements[(corp_key, sj_div)] for corp_key in candidates}
+
+        series = []
+        versions = []
+        for corp_key in sorted(statements):
+            statement = statements[corp_key]
+            row = statement["rows"][statement["accounts"][account_name][0]]
+            versions.append(f"{corp_key}:{statement['hash']}")
+            series.append({
+                "corp_key": corp_key,
+                "account_name": account_name,
+                "ancestors": row.get("ancestors", []),
+                "amounts": _filter_amounts(row["amounts"], from_year, to_year),
+            })
+
+        return _make_etag(sj_div, account_name, from_year, to_year, *versions), series
+
+
+statement_index = StatementIndex()
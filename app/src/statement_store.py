@@ -0,0 +1,262 @@
+import os
+import re
+import json
+import glob
+import fcntl
+import hashlib
+import argparse
+import threading
+
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from app.utils.time import get_current_korea_time
+from app.utils.logging import logger
+
+STATEMENT_STORE_DIR = os.getenv("STATEMENT_STORE_DIR", "/playwright-crawler/data/store")
+INTEGRATED_DIR = os.getenv("INTEGRATED_DIR", "/playwright-crawler/data/integrated")
+
+# data/integrated/<sj_div>/json/<재무제표명>_<기업명>_<YYYYMMDD>_<HHMMSS>.json
+INTEGRATED_FILE_PATTERN = re.compile(r'^(?P<title>[^_]+)_(?P<corp_name>.+)_(?P<timestamp>\d{8}_\d{6})\.json$')
+
+
+def content_hash(payload) -> str:
+    """키 순서/공백과 무관한 정규화 JSON의 sha256"""
+    canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _write_json_atomic(path: str, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, mode='w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def integrate_datasets(datasets: List[dict]) -> Dict[str, List[dict]]:
+    """
+    크롤러 데이터셋(보고서 x 재무제표)을 재무제표별 다년도 계정 목록으로 통합
+    - 같은 연도 금액이 여러 보고서에 있으면 가장 최근 보고서(rcept_no) 값을 사용
+    - 계정 순서는 최근 보고서 기준, 과거 보고서에만 있는 계정은 뒤에 추가
+
+    Returns:
+        dict: {sj_div: [{"ord_value", "raw_account_name", "account_name", "amounts": [{"2024": ...}, ...], "account_level", "ancestors"}, ...]}
+    """
+    statements = {}
+    for dataset in sorted(datasets, key=lambda dataset: dataset.get('rcept_no', ''), reverse=True):
+        accounts = statements.setdefault(dataset['sj_div'], {})
+        for row in dataset.get('data', []):
+            key = (row['account_name'], tuple(row.get('ancestors', [])))
+            account = accounts.setdefault(key, {**row, "amounts": {}})
+            for amount in row.get('amounts', []):
+                for year, value in amount.items():
+                    if year and year not in account["amounts"]:
+                        account["amounts"][year] = value
+
+    integrated = {}
+    for sj_div, accounts in statements.items():
+        integrated[sj_div] = []
+        for ord_value, account in enumerate(accounts.values(), start=1):
+            integrated[sj_div].append({
+                **account,
+                "ord_value": ord_value,
+                "amounts": [{year: account["amounts"][year]} for year in sorted(account["amounts"], reverse=True)],
+            })
+    return integrated
+
+
+class StatementStore:
+    """
+    수집 결과 저장소 (내용 주소 기반 중복 제거)
+    - objects/<hash[:2]>/<hash>.json : 재무제표 본문, 같은 내용은 한 번만 저장
+    - refs/<corp_key>/<sj_div>.json : 기업 x 재무제표별 버전 목록과 최신(latest) 해시
+    - put(object 저장 + ref 갱신)과 compact는 같은 락(스레드 락 + 저장소 lock 파일) 안에서 실행
+      (동시 저장이 서로의 버전을 덮어쓰거나, compact CLI가 아직 참조되지 않은 새 object를 지우지 않도록)
+    """
+
+    def __init__(self, root: str = STATEMENT_STORE_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.refs_dir = os.path.join(root, "refs")
+        self._lock = threading.Lock()
+
+
+    @contextmanager
+    def _locked(self):
+        """같은 프로세스의 스레드와 다른 프로세스(compact CLI, 같은 디렉터리를 쓰는 워커) 모두에 대한 배타 락"""
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            with open(os.path.join(self.root, ".lock"), mode='w') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.json")
+
+
+    def _ref_path(self, corp_key: str, sj_div: str) -> str:
+        return os.path.join(self.refs_dir, corp_key, f"{sj_div.upper()}.json")
+
+
+    def get_ref(self, corp_key: str, sj_div: str) -> Optional[dict]:
+        path = self._ref_path(corp_key, sj_div)
+        if not os.path.exists(path):
+            return None
+        with open(path, mode='r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+    def put(self, corp_key: str, sj_div: str, payload, source: Optional[str] = None, saved_at: Optional[str] = None) -> str:
+        """
+        재무제표 저장 후 해시 반환
+        최신 버전과 내용이 같으면 새 버전을 만들지 않음
+        """
+        digest = content_hash(payload)
+        with self._locked():
+            object_path = self._object_path(digest)
+            if not os.path.exists(object_path):
+                _write_json_atomic(object_path, payload)
+
+            ref = self.get_ref(corp_key, sj_div) or {"corp_key": corp_key, "sj_div": sj_div.upper(), "latest": None, "versions": []}
+            if ref["latest"] == digest:
+                return digest
+
+            ref["versions"].append({
+                "version": len(ref["versions"]) + 1,
+                "hash": digest,
+                "saved_at": saved_at or get_current_korea_time().isoformat(),
+                "source": source,
+            })
+            ref["latest"] = digest
+            _write_json_atomic(self._ref_path(corp_key, sj_div), ref)
+            return digest
+
+
+    def get(self, digest: str):
+        with open(self._object_path(digest), mode='r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+    def get_latest(self, corp_key: str, sj_div: str):
+        """최신 재무제표 본문 (없으면 None)"""
+        ref = self.get_ref(corp_key, sj_div)
+        if ref is None or ref["latest"] is None:
+            return None
+        return self.get(ref["latest"])
+
+
+    def list_refs(self) -> List[dict]:
+        refs = []
+        for path in sorted(glob.glob(os.path.join(self.refs_dir, "*", "*.json"))):
+            with open(path, mode='r', encoding='utf-8') as f:
+                refs.append(json.load(f))
+        return refs
+
+
+    def save_datasets(self, corp_key: str, datasets: List[dict], source: Optional[str] = None) -> Dict[str, str]:
+        """크롤러 데이터셋을 재무제표별로 통합하여 저장, {sj_div: hash} 반환"""
+        return {
+            sj_div: self.put(corp_key, sj_div, accounts, source=source)
+            for sj_div, accounts in integrate_datasets(datasets).items()
+        }
+
+
+    def compact(self) -> dict:
+        """
+        버전 이력에서 연속된 동일 내용을 합치고, 어떤 ref에서도 참조하지 않는 object를 삭제
+        """
+        with self._locked():
+            referenced = set()
+            collapsed = 0
+            for ref in self.list_refs():
+                versions = []
+                for version in ref["versions"]:
+                    if versions and versions[-1]["hash"] == version["hash"]:
+                        collapsed += 1
+                        continue
+                    versions.append({**version, "version": len(versions) + 1})
+
+                if len(versions) != len(ref["versions"]):
+                    ref["versions"] = versions
+                    _write_json_atomic(self._ref_path(ref["corp_key"], ref["sj_div"]), ref)
+                referenced.update(version["hash"] for version in versions)
+
+            removed = 0
+            for path in glob.glob(os.path.join(self.objects_dir, "*", "*.json")):
+                if os.path.basename(path)[:-len(".json")] not in referenced:
+                    os.remove(path)
+                    removed += 1
+
+        logger.info(f"[StatementStore] 압축 완료: 중복 버전 {collapsed}개 병합, 미참조 object {removed}개 삭제")
+        return {"collapsed_versions": collapsed, "removed_objects": removed}
+
+
+    def import_integrated(self, integrated_dir: str = INTEGRATED_DIR, delete_imported: bool = False, resolve_corp_key: Optional[Callable[[str], str]] = None) -> dict:
+        """
+        data/integrated/<sj_div>/json/*.json 타임스탬프 파일들을 저장소로 가져옴
+        시간순으로 넣으므로 같은 내용은 하나의 object/버전으로 합쳐짐
+        resolve_corp_key : 파일명의 기업명을 저장 키(corp_code)로 변환하는 함수, 없으면 기업명을 그대로 사용
+        delete_imported=True이면 가져온 JSON과 같은 이름의 CSV 파일을 삭제
+        """
+        imported = 0
+        for json_path in sorted(glob.glob(os.path.join(integrated_dir, "*", "json", "*.json"))):
+            match = INTEGRATED_FILE_PATTERN.match(os.path.basename(json_path))
+            if match is None:
+                logger.warning(f"[StatementStore] 파일명 형식이 달라 건너뜀: {json_path}")
+                continue
+
+            sj_div = os.path.basename(os.path.dirname(os.path.dirname(json_path)))
+            imported += 1
+            with open(json_path, mode='r', encoding='utf-8') as f:
+                payload = json.load(f)
+
+            timestamp = match.group("timestamp")
+            saved_at = f"{timestamp[:4]}-{timestamp[4:6]}-{timestamp[6:8]}T{timestamp[9:11]}:{timestamp[11:13]}:{timestamp[13:15]}"
+            corp_name = match.group("corp_name")
+            corp_key = resolve_corp_key(corp_name) if resolve_corp_key else corp_name
+            self.put(corp_key, sj_div, payload, source=os.path.relpath(json_path, integrated_dir), saved_at=saved_at)
+
+            if delete_imported:
+                csv_path = os.path.join(os.path.dirname(os.path.dirname(json_path)), "csv", os.path.basename(json_path)[:-len(".json")] + ".csv")
+                for path in [json_path, csv_path]:
+                    if os.path.exists(path):
+                        os.remove(path)
+
+        logger.info(f"[StatementStore] {integrated_dir} 파일 {imported}개 가져오기 완료")
+        return {"imported_files": imported}
+
+
+statement_store = StatementStore()
+
+
+if __name__ == "__main__":
+    # python -m app.src.statement_store compact [--import-dir data/integrated] [--delete-imported]
+    parser = argparse.ArgumentParser(description="수집 결과 저장소 관리")
+    parser.add_argument("command", choices=["compact"])
+    parser.add_argument("--store-dir", default=STATEMENT_STORE_DIR)
+    parser.add_argument("--import-dir", default=None, help="가져올 data/integrated 디렉터리")
+    parser.add_argument("--delete-imported", action="store_true", help="가져온 JSON/CSV 원본 삭제")
+    args = parser.parse_args()
+
+    from functools import lru_cache
+    from app.src.corp_code import search_company
+
+    @lru_cache(maxsize=None)
+    def resolve_corp_key(corp_name: str) -> str:
+        try:
+            company = search_company(corp_name, "all")
+        except Exception:
+            company = None
+        return company['corp_code'] if company and company['corp_code'] else corp_name
+
+    store = StatementStore(args.store_dir)
+    result = {}
+    if args.import_dir:
+        result.update(store.import_integrated(args.import_dir, delete_imported=args.delete_imported, resolve_corp_key=resolve_corp_key))
+    result.update(store.compact())
+    print(json.dumps(result, ensure_ascii=False))
@@ -0,0 +1,200 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+# 표준 계정 → 계정명 패턴 (clean_account_name으로 정규화된 계정명 기준)
+# 패턴은 계정명과 일치하거나 계정명의 끝에 올 때만 매칭 ('당기기타포괄손익' → 기타포괄손익)
+# 계정명 끝에 여러 패턴이 맞으면 가장 긴 패턴의 표준 계정을 사용하므로,
+# 짧은 패턴으로 끝나는 다른 계정('유동자산' ⊂ '비유동자산')은 더 긴 패턴으로 구분
+TAXONOMY_RULES: Dict[str, List[str]] = {
+    # 재무상태표
+    "자산총계": ["자산총계"],
+    "유동자산": ["유동자산"],
+    "비유동자산": ["비유동자산"],
+    "현금및현금성자산": ["현금및현금성자산", "현금및현금등가물", "현금및예치금"],
+    "단기금융상품": ["단기금융상품", "단기금융자산", "단기투자자산"],
+    "매출채권": ["매출채권", "매출채권및기타채권", "매출채권및기타유동채권", "외상매출금"],
+    "장기매출채권": ["장기매출채권", "장기매출채권및기타비유동채권"],
+    "재고자산": ["재고자산", "유동재고자산"],
+    "유형자산": ["유형자산"],
+    "무형자산": ["무형자산", "영업권이외의무형자산", "영업권"],
+    "투자부동산": ["투자부동산"],
+    "사용권자산": ["사용권자산"],
+    "관계기업투자": ["관계기업투자", "관계기업에대한투자자산", "관계기업및공동기업투자", "종속기업,조인트벤처와관계기업에대한투자자산", "종속기업에대한투자자산"],
+    "이연법인세자산": ["이연법인세자산"],
+    "매각예정자산": ["매각예정", "매각예정자산", "매각예정비유동자산", "분류된비유동자산", "분류된비유동자산이나처분자산집단"],
+    "기타유동자산": ["기타유동자산"],
+    "기타비유동자산": ["기타비유동자산"],
+    "부채총계": ["부채총계"],
+    "유동부채": ["유동부채"],
+    "비유동부채": ["비유동부채"],
+    "매입채무": ["매입채무", "매입채무및기타채무", "매입채무및기타유동채무", "외상매입금"],
+    "장기매입채무": ["장기매입채무", "장기매입채무및기타비유동채무"],
+    "단기차입금": ["단기차입금", "유동차입금"],
+    "유동성장기부채": ["유동성장기차입금", "유동성장기부채", "비유동차입금의유동성대체부분", "유동성사채"],
+    "장기차입금": ["장기차입금", "비유동차입금"],
+    "사채": ["사채", "전환사채", "신주인수권부사채"],
+    "리스부채": ["리스부채", "유동리스부채", "비유동리스부채"],
+    "충당부채": ["충당부채"],
+    "기타유동부채": ["기타유동부채"],
+    "기타비유동부채": ["기타비유동부채"],
+    "퇴직급여부채": ["퇴직급여부채", "확정급여부채", "순확정급여부채"],
+    "이연법인세부채": ["이연법인세부채"],
+    "자본총계": ["자본총계"],
+    "지배기업소유주지분": ["지배기업의소유주에게귀속되는자본", "지배기업소유주지분"],
+    "비지배지분": ["비지배지분"],
+    "자본금": ["자본금", "납입자본"],
+    "자본잉여금": ["자본잉여금", "주식발행초과금"],
+    "이익잉여금": ["이익잉여금", "결손금", "미처분이익잉여금"],
+    "기타포괄손익누계액": ["기타포괄손익누계액"],
+    "자본과부채총계": ["자본과부채총계", "부채와자본총계"],
+    # 손익계산서
+    "매출액": ["매출액", "영업수익"],
+    "매출원가": ["매출원가", "영업비용"],
+    "매출총이익": ["매출총이익", "매출총손실"],
+    "판매비와관리비": ["판매비와관리비", "판매비와일반관리비", "판관비"],
+    "대손상각비": ["대손상각비", "매출채권손상차손"],
+    "영업이익": ["영업이익", "영업손실", "영업손익"],
+    "금융수익": ["금융수익"],
+    "금융원가": ["금융원가", "금융비용"],
+    "법인세비용차감전순이익": ["법인세비용차감전순이익", "법인세비용차감전계속영업이익", "법인세차감전순이익"],
+    "법인세비용": ["법인세비용"],
+    "당기순이익": ["당기순이익", "당기순손실", "당기순손익"],
+    "기타포괄손익": ["기타포괄손익"],
+    "총포괄손익": ["총포괄손익", "총포괄이익"],
+    "주당이익": ["주당이익", "주당순이익", "주당손익"],
+}
+
+# 다른 계정명의 일부로 자주 쓰여 부분 일치로는 쓰지 않는 계정명 ('수익' ⊂ '이연수익', '금융수익')
+EXACT_ACCOUNT_NAMES: Dict[str, str] = {
+    "수익": "매출액",
+    "매출": "매출액",
+}
+
+
+# 계정명에 들어 있으면 다른 계정의 일부(귀속 구분, 중단영업, 차감 계정 등)라서
+# 패턴이 계정명 끝에 맞더라도 지정한 표준 계정 외에는 매칭하지 않는 한정어
+# ('계속영업이익' ≠ 영업이익, '지배기업의소유주에게귀속되는당기순이익' ≠ 당기순이익, '매각예정비유동부채' ≠ 비유동부채)
+EXCLUDED_ACCOUNT_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "계속영업": (),
+    "중단영업": (),
+    "귀속": (),
+    "매각예정": ("매각예정자산",),
+    "할인발행차금": (),
+    "할증발행차금": (),
+    "상환할증금": (),
+}
+
+
+class AccountMatcher:
+    """
+    표준 계정 패턴을 Aho-Corasick 오토마톤으로 컴파일하여 계정명을 한 번의 순회로 매칭
+    - 정확히 일치하는 패턴이 있으면 우선 사용
+    - 그 외에는 계정명의 끝에 오는 패턴 중 가장 긴 패턴의 표준 계정
+      (계정명 중간에만 있는 패턴은 한정어가 붙은 다른 계정이므로 사용하지 않음)
+    - 제외 한정어가 들어 있는 계정명은 허용된 표준 계정이 아니면 매칭하지 않음
+    - 결과는 계정명별로 캐시
+    """
+
+    def __init__(
+        self,
+        rules: Dict[str, List[str]] = TAXONOMY_RULES,
+        exact_names: Dict[str, str] = EXACT_ACCOUNT_NAMES,
+        excluded_patterns: Dict[str, Tuple[str, ...]] = EXCLUDED_ACCOUNT_PATTERNS,
+    ):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, str]]] = [[]]
+        self._exact: Dict[str, str] = dict(exact_names)
+        self._excluded: Dict[str, Tuple[str, ...]] = dict(excluded_patterns)
+        self._cache: Dict[str, Optional[str]] = {}
+
+        for canonical, patterns in rules.items():
+            for pattern in patterns:
+                self._exact.setdefault(pattern, canonical)
+                self._add_pattern(pattern, canonical)
+        self._build_failure_links()
+
+
+    def _add_pattern(self, pattern: str, canonical: str):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((len(pattern), canonical))
+
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+
+    def _match(self, name: str) -> Optional[str]:
+        if name in self._exact:
+            return self._exact[name]
+
+        state = 0
+        for char in name:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+        ## 마지막 상태의 출력 = 계정명 끝에서 끝나는 패턴들 (길이가 같으면 먼저 등록된 패턴 우선)
+        if not self._outputs[state]:
+            return None
+        _, canonical = max(self._outputs[state], key=lambda output: output[0])
+
+        for pattern, allowed in self._excluded.items():
+            if pattern in name and canonical not in allowed:
+                return None
+        return canonical
+
+
+    def map_account(self, name: str) -> Optional[str]:
+        if not isinstance(name, str) or not name:
+            return None
+        if name not in self._cache:
+            self._cache[name] = self._match(name)
+        return self._cache[name]
+
+
+    def map_accounts(self, names: Iterable[str]) -> pd.Series:
+        """계정명 열 전체를 매핑 (고유 계정명만 매칭)"""
+        names = pd.Series(list(names), dtype=object)
+        unique_names = names.dropna().unique()
+        mapping = {name: self.map_account(name) for name in unique_names}
+        return names.map(mapping)
+
+
+_matcher: Optional[AccountMatcher] = None
+
+
+def get_account_matcher() -> AccountMatcher:
+    global _matcher
+    if _matcher is None:
+        _matcher = AccountMatcher()
+    return _matcher
+
+
+def add_canonical_accounts(datasets: List[dict]) -> List[dict]:
+    """데이터셋의 모든 계정 행에 canonical_account 필드를 추가 (매칭되지 않으면 None)"""
+    rows = [row for dataset in datasets for row in dataset.get("data", [])]
+    canonical_accounts = get_account_matcher().map_accounts(row.get("account_name") for row in rows)
+    for row, canonical_account in zip(rows, canonical_accounts):
+        row["canonical_account"] = canonical_account if isinstance(canonical_account, str) else None
+    return datasets
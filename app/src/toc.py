@@ -0,0 +1,108 @@
+import re
+
+from typing import List
+
+from app.utils.data import clean_paragraph_text
+
+VIEWER_URL = "https://dart.fss.or.kr/report/viewer.do"
+
+# 보고서 main.do 페이지의 목차 스크립트
+#   var node2 = {};
+#   node2['text'] = "2. 연결재무제표";
+#   node2['rcpNo'] = "20240312000736"; node2['dcmNo'] = ...; node2['eleId'] = ...
+TOC_TOKEN_PATTERN = re.compile(
+    r"var\s+node(\d+)\s*=\s*\{\}"
+    r"|node(\d+)\['(\w+)'\]\s*=\s*\"([^\"]*)\""
+)
+
+VIEWER_PARAMS = ["rcpNo", "dcmNo", "eleId", "offset", "length", "dtd"]
+
+# 손익계산서와 포괄손익계산서가 한 섹션에 함께 실리는 경우가 있어 같은 섹션 종류로 취급
+SECTION_SJ_DIVS = {"BS": {"BS"}, "IS": {"IS", "CIS"}}
+
+
+def parse_toc_nodes(html: str) -> List[dict]:
+    """
+    보고서 페이지 HTML의 목차(jstree) 생성 스크립트에서 노드 목록을 한 번에 추출
+
+    Returns:
+        list: [{"level": 2, "text": "2. 연결재무제표", "parents": ["III. 재무에 관한 사항"], "rcpNo": ..., ...}, ...]
+              문서 순서 그대로 반환
+    """
+    nodes = []
+    current_by_level = {}
+
+    for match in TOC_TOKEN_PATTERN.finditer(html or ""):
+        if match.group(1):
+            level = int(match.group(1))
+            node = {
+                "level": level,
+                "text": "",
+                "parents": [current_by_level[lv]["text"] for lv in range(1, level) if lv in current_by_level],
+            }
+            current_by_level[level] = node
+            # 하위 레벨 노드는 새 상위 노드가 나오면 무효
+            for lv in [lv for lv in current_by_level if lv > level]:
+                del current_by_level[lv]
+            nodes.append(node)
+        else:
+            level = int(match.group(2))
+            if level in current_by_level:
+                current_by_level[level][match.group(3)] = match.group(4)
+
+    return nodes
+
+
+def build_viewer_url(node: dict) -> str:
+    """목차 노드의 파라미터로 뷰어(iframe) URL 생성"""
+    query = "&".join(f"{param}={node.get(param, '')}" for param in VIEWER_PARAMS)
+    return f"{VIEWER_URL}?{query}"
+
+
+def select_statement_nodes(nodes: List[dict], target_titles: List[str]) -> List[dict]:
+    """
+    '재무에 관한 사항' 아래에서 수집 대상 재무제표 노드만 선택
+    - '연결재무제표', '재무제표' 노드에 대상 하위 노드가 있으면 하위 노드들을, 없으면 노드 자체를 선택
+    """
+    financial_nodes = [
+        node for node in nodes
+        if any("재무에 관한 사항" in parent for parent in node["parents"]) and node.get("dcmNo")
+    ]
+
+    selected = []
+    for idx, node in enumerate(financial_nodes):
+        title = clean_paragraph_text(node["text"])
+        if title not in ['연결재무제표', '재무제표'] or node["level"] != 2:
+            continue
+
+        children = []
+        for child in financial_nodes[idx + 1:]:
+            if child["level"] <= node["level"]:
+                break
+            if child["level"] == node["level"] + 1 and clean_paragraph_text(child["text"]) in target_titles:
+                children.append(child)
+
+        selected.extend(children if children else [node])
+
+    return selected
+
+
+def section_matches_units(title: str, units: set) -> bool:
+    """
+    재무제표 섹션(상위 섹션 제목 포함)이 재추출 대상 단위(CFS_BS, OFS_IS ...) 중 하나를 담을 수 있는지
+    제목으로 재무제표 종류를 알 수 없는 섹션(연결재무제표 등)은 연결/별도 구분만 확인
+    """
+    title = clean_paragraph_text(title)
+    fs_div = "CFS" if "연결" in title else "OFS"
+    if "재무상태표" in title:
+        sj_divs = SECTION_SJ_DIVS["BS"]
+    elif "손익계산서" in title:
+        sj_divs = SECTION_SJ_DIVS["IS"]
+    else:
+        sj_divs = None
+
+    for unit in units:
+        unit_fs_div, _, unit_sj_div = unit.partition("_")
+        if unit_fs_div == fs_div and (sj_divs is None or unit_sj_div in sj_divs):
+            return True
+    return False
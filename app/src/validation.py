@@ -0,0 +1,176 @@
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from typing import List
+
+from app.src.journal import CrawlJournal
+from app.src.ratios import parse_amount_series
+from app.utils.logging import logger
+
+# 합계 계정 = 구성 계정의 합 (구성 계정이 모두 있을 때만 검사)
+SUBTOTAL_RULES = [
+    {"sj_div": "BS", "total": "자산총계", "components": ["유동자산", "비유동자산"]},
+    {"sj_div": "BS", "total": "부채총계", "components": ["유동부채", "비유동부채"]},
+    {"sj_div": "BS", "total": "자산총계", "components": ["부채총계", "자본총계"]},
+    {"sj_div": "BS", "total": "자본과부채총계", "components": ["부채총계", "자본총계"]},
+]
+# 반올림 오차 허용 범위 (합계 금액 대비)
+BALANCE_TOLERANCE = 0.001
+# 검증 실패 단위를 다시 추출하는 최대 횟수 (넘으면 더 이상 무효화하지 않고 포기한 단위로 보고)
+MAX_REPAIR_ATTEMPTS = int(os.getenv("VALIDATION_MAX_REPAIR_ATTEMPTS", 2))
+
+
+def _to_long_frame(datasets: List[dict]) -> pd.DataFrame:
+    records = {"unit": [], "row": [], "account_name": [], "year": [], "amount": []}
+    for unit, dataset in enumerate(datasets):
+        for row_no, row in enumerate(dataset.get("data", [])):
+            for amount in row.get("amounts", []):
+                for year, value in amount.items():
+                    records["unit"].append(unit)
+                    records["row"].append(row_no)
+                    records["account_name"].append(row.get("account_name"))
+                    records["year"].append(year)
+                    records["amount"].append(value)
+
+    long_df = pd.DataFrame(records)
+    long_df["amount"] = parse_amount_series(long_df["amount"]) if not long_df.empty else long_df["amount"]
+    return long_df
+
+
+def _check_years(long_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    연도 열 정렬 검사
+    - 연도 헤더 개수보다 금액 열이 많아 연도가 비어있는 금액('' 키)
+    - 재무제표 대부분의 계정에 없는 연도가 일부 계정에만 있는 경우 (열 밀림)
+    - 연도가 연속하지 않는 경우
+    빈 셀은 금액에서 빠지므로 연도가 적은 계정은 정상으로 봄
+    """
+    issues = []
+    blank_years = long_df[long_df["year"] == ""].groupby("unit").size()
+    for unit, count in blank_years.items():
+        issues.append({"unit": unit, "check": "year_alignment", "detail": f"연도 없는 금액 {count}개 (열 밀림 의심)"})
+
+    valid = long_df[long_df["year"] != ""]
+    rows_per_unit = valid.groupby("unit")["row"].nunique()
+    year_counts = valid.groupby(["unit", "year"])["row"].nunique()
+    # 재무제표 계정의 절반 이상에 있는 연도를 헤더 연도로 간주
+    is_header = year_counts >= rows_per_unit.reindex(year_counts.index.get_level_values("unit")).to_numpy() / 2
+
+    minority = year_counts[~is_header]
+    for unit, counts in minority.groupby(level="unit"):
+        issues.append({"unit": unit, "check": "year_alignment", "detail": f"일부 계정에만 있는 연도 {counts.index.get_level_values('year').tolist()} ({int(counts.sum())}개 계정, 열 밀림 의심)"})
+
+    header_years = year_counts[is_header].reset_index()
+    header_years["numeric_year"] = pd.to_numeric(header_years["year"], errors="coerce")
+    header_years = header_years.sort_values(["unit", "numeric_year"])
+    header_years["gap"] = header_years.groupby("unit")["numeric_year"].diff()
+    broken = header_years[header_years["numeric_year"].isna() | (header_years["gap"].notna() & (header_years["gap"] != 1))]
+    for unit in broken["unit"].unique():
+        issues.append({"unit": unit, "check": "year_alignment", "detail": f"연도가 연속하지 않음: {header_years.loc[header_years['unit'] == unit, 'year'].tolist()}"})
+
+    return pd.DataFrame(issues, columns=["unit", "check", "detail"])
+
+
+def _check_subtotals(long_df: pd.DataFrame, sj_types: pd.Series) -> pd.DataFrame:
+    """합계 계정과 구성 계정 합의 차이를 모든 재무제표/연도에 대해 한 번에 계산"""
+    accounts = {rule["total"] for rule in SUBTOTAL_RULES} | {name for rule in SUBTOTAL_RULES for name in rule["components"]}
+    selected = long_df[long_df["account_name"].isin(accounts) & (long_df["year"] != "")]
+    if selected.empty:
+        return pd.DataFrame(columns=["unit", "check", "detail"])
+
+    # 같은 계정명이 여러 번 나오면 첫 번째 계정 사용
+    wide = selected.drop_duplicates(["unit", "account_name", "year"]).pivot(index=["unit", "year"], columns="account_name", values="amount")
+    units = wide.index.get_level_values("unit")
+
+    issues = []
+    for rule in SUBTOTAL_RULES:
+        if rule["total"] not in wide or any(component not in wide for component in rule["components"]):
+            continue
+
+        total = wide[rule["total"]]
+        expected = wide[rule["components"]].sum(axis=1, min_count=len(rule["components"]))
+        applicable = sj_types.reindex(units).to_numpy() == rule["sj_div"]
+        diff = (total - expected).abs()
+        failed = applicable & (diff > np.maximum(1, total.abs() * BALANCE_TOLERANCE)).to_numpy()
+
+        for (unit, year), total_value, expected_value in zip(wide.index[failed], total[failed], expected[failed]):
+            issues.append({
+                "unit": unit,
+                "check": "subtotal",
+                "detail": f"{year} {rule['total']}({total_value:,.0f}) != {' + '.join(rule['components'])}({expected_value:,.0f})"
+            })
+
+    return pd.DataFrame(issues, columns=["unit", "check", "detail"])
+
+
+def validate_datasets(datasets: List[dict]) -> List[dict]:
+    """
+    파싱된 재무제표 데이터셋 목록을 한 번에 검증
+
+    Returns:
+        list: [{"rcept_no", "sj_div", "check", "detail"}, ...] - 문제가 없으면 빈 리스트
+    """
+    issues = []
+    for unit, dataset in enumerate(datasets):
+        if not dataset.get("data"):
+            issues.append({"unit": unit, "check": "empty", "detail": "계정 데이터 없음"})
+        if not dataset.get("unit"):
+            issues.append({"unit": unit, "check": "unit", "detail": "단위 정보 없음"})
+
+    long_df = _to_long_frame(datasets)
+    frames = [pd.DataFrame(issues, columns=["unit", "check", "detail"])]
+    if not long_df.empty:
+        sj_types = pd.Series([dataset.get("sj_div", "").split("_")[-1] for dataset in datasets])
+        frames.extend([_check_years(long_df), _check_subtotals(long_df, sj_types)])
+
+    result = pd.concat(frames, ignore_index=True)
+    return [
+        {"rcept_no": datasets[unit]["rcept_no"], "sj_div": datasets[unit]["sj_div"], "check": check, "detail": detail}
+        for unit, check, detail in result[["unit", "check", "detail"]].itertuples(index=False)
+    ]
+
+
+def invalidate_failed_units(journal: CrawlJournal, issues: List[dict], max_repair_attempts: int = MAX_REPAIR_ATTEMPTS) -> List[dict]:
+    """
+    검증 실패한 (rcept_no, sj_div) 단위만 저널에서 무효화하여 다음 수집 때 해당 단위만 다시 추출
+    이미 max_repair_attempts번 다시 추출한 단위는 무효화하지 않고 abandoned로 보고 (같은 보고서를 끝없이 다시 수집하지 않도록)
+    """
+    units = {}
+    for issue in issues:
+        units.setdefault((issue["rcept_no"], issue["sj_div"]), []).append(f"{issue['check']}: {issue['detail']}")
+
+    invalid_units = []
+    for (rcept_no, sj_div), reasons in units.items():
+        abandoned = journal.invalidation_count(rcept_no, sj_div) >= max_repair_attempts
+        if not abandoned:
+            journal.invalidate_unit(rcept_no, sj_div, "; ".join(reasons))
+        invalid_units.append({"rcept_no": rcept_no, "sj_div": sj_div, "reasons": reasons, "abandoned": abandoned})
+
+    abandoned_units = [(unit["rcept_no"], unit["sj_div"]) for unit in invalid_units if unit["abandoned"]]
+    if len(abandoned_units) < len(invalid_units):
+        logger.warning(f"[invalidate_failed_units] 검증 실패 단위 {len(invalid_units) - len(abandoned_units)}개 재추출 대상으로 표시: {[key for key in units if key not in abandoned_units]}")
+    if abandoned_units:
+        logger.error(f"[invalidate_failed_units] 재추출 {max_repair_attempts}회 후에도 검증 실패, 재추출 중단: {abandoned_units}")
+    return invalid_units
+
+
+def validate_journal(journal: CrawlJournal) -> List[dict]:
+    """저널에 기록된 전체 단위를 검증하고 실패한 단위를 무효화"""
+    return invalidate_failed_units(journal, validate_datasets(list(journal.units.values())))
+
+
+if __name__ == "__main__":
+    # python -m app.src.validation <corp_code> [<corp_code> ...]
+    parser = argparse.ArgumentParser(description="저널에 기록된 재무제표 검증 및 재추출 대상 표시")
+    parser.add_argument("corp_keys", nargs="+")
+    args = parser.parse_args()
+
+    for corp_key in args.corp_keys:
+        invalid_units = validate_journal(CrawlJournal(corp_key))
+        print(f"{corp_key}: 재추출 대상 {len(invalid_units)}개")
+        for invalid_unit in invalid_units:
+            status = " (재추출 중단)" if invalid_unit["abandoned"] else ""
+            print(f"  {invalid_unit['rcept_no']} {invalid_unit['sj_div']}{status} - {'; '.join(invalid_unit['reasons'])}")
@@ -0,0 +1,461 @@
+import os
+import time
+import uuid
+import json
+import socket
+import asyncio
+import argparse
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.src.corp_code import search_company
+from app.src.crawler import FinancialStatementCrawler
+from app.src.opendart import OpenDartClient
+from app.src.http_client import http_client
+from app.src.journal import CrawlJournal
+from app.src.parser import start_parse_executor, shutdown_parse_executor
+from app.src.statement_store import statement_store
+from app.utils.logging import logger
+
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+WORK_QUEUE_DB = os.getenv("WORK_QUEUE_DB", "dart_crawler")
+# 작업 임대 기간, 하트비트 주기 (하트비트가 끊긴 노드의 작업은 임대 만료 후 다른 노드가 가져감)
+WORK_QUEUE_LEASE_SECONDS = int(os.getenv("WORK_QUEUE_LEASE_SECONDS", 300))
+WORK_QUEUE_HEARTBEAT_SECONDS = int(os.getenv("WORK_QUEUE_HEARTBEAT_SECONDS", 60))
+WORK_QUEUE_MAX_ATTEMPTS = int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", 3))
+WORK_QUEUE_POLL_SECONDS = float(os.getenv("WORK_QUEUE_POLL_SECONDS", 5))
+NODE_ID = os.getenv("NODE_ID", f"{socket.gethostname()}-{os.getpid()}")
+
+# 우선순위 클래스 → 정렬 순서 (app.src.scheduler의 클래스와 같은 이름)
+PRIORITY_RANKS = {"interactive": 1, "backfill": 0}
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+# 시도 횟수를 모두 썼지만 일부 보고서만 수집된 작업 (수집된 보고서는 crawl_results에 남아 있음)
+PARTIAL = "partial"
+
+
+class WorkQueue:
+    """
+    MongoDB 컬렉션 기반 다중 노드 크롤링 작업 큐
+    - crawl_jobs : 기업 단위 작업 (_id = corp_code 또는 stock_code)
+      pending → leased(lease_owner, lease_token, lease_expires_at) → done / failed / partial
+    - 임대는 find_one_and_update로 원자적으로 획득하고, 만료된 임대도 다시 가져갈 수 있음
+    - 임대 시각은 모두 서버 시각($$NOW) 기준이라 노드 간 시계 차이의 영향을 받지 않음
+    - crawl_results : (corp_code, rcept_no) 단위 완료 기록과 보고서 데이터셋, 같은 보고서를 여러 노드가 처리해도 한 번만 기록
+      노드마다 로컬인 저널/statement_store 대신 모든 노드가 공유하는 수집 결과로 사용
+    - 완료/실패 처리는 lease_token이 일치할 때만 반영 (임대를 잃은 노드의 늦은 완료는 무시)
+    """
+
+    def __init__(
+        self,
+        uri: str = MONGO_URI,
+        db_name: str = WORK_QUEUE_DB,
+        node_id: str = NODE_ID,
+        lease_seconds: int = WORK_QUEUE_LEASE_SECONDS,
+        max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS,
+    ):
+        self.uri = uri
+        self.db_name = db_name
+        self.node_id = node_id
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._client: Optional[AsyncIOMotorClient] = None
+
+
+    @property
+    def db(self):
+        if self._client is None:
+            self._client = AsyncIOMotorClient(self.uri)
+        return self._client[self.db_name]
+
+
+    @property
+    def jobs(self):
+        return self.db["crawl_jobs"]
+
+
+    @property
+    def results(self):
+        return self.db["crawl_results"]
+
+
+    def _lease_expiry(self) -> dict:
+        return {"$add": ["$$NOW", self.lease_seconds * 1000]}
+
+
+    async def ensure_indexes(self):
+        await self.jobs.create_index([("status", ASCENDING), ("priority", DESCENDING), ("enqueued_at", ASCENDING)])
+        await self.jobs.create_index([("status", ASCENDING), ("lease_expires_at", ASCENDING)])
+        await self.results.create_index([("corp_code", ASCENDING)])
+        await self.results.create_index([("node_id", ASCENDING), ("completed_at", DESCENDING)])
+
+
+    async def enqueue(self, corp_name: str, corp_type_value: str = "all", priority: str = "backfill", params: Optional[dict] = None) -> Optional[str]:
+        """
+        기업 수집 작업 등록 (이미 대기/진행 중인 기업은 그대로 두고, 완료/실패한 기업은 다시 대기 상태로)
+
+        Returns:
+            str: 작업 id (corp_code 또는 stock_code), 기업을 찾지 못하면 None
+        """
+        company = await asyncio.to_thread(search_company, corp_name, corp_type_value)
+        if company is None:
+            logger.warning(f"[WorkQueue] 기업을 찾을 수 없어 등록하지 않음: {corp_name}")
+            return None
+
+        job_id = company['corp_code'] or company['stock_code']
+        await self.add_job(job_id, corp_name, corp_type_value, priority, params)
+        return job_id
+
+
+    async def add_job(self, job_id: str, corp_name: str, corp_type_value: str = "all", priority: str = "backfill", params: Optional[dict] = None):
+        """작업 id(corp_code 또는 stock_code)로 작업 등록 (enqueue 참고)"""
+        await self.jobs.update_one(
+            {"_id": job_id},
+            [{"$set": {
+                "corp_name": corp_name,
+                "corp_type_value": corp_type_value,
+                "priority_class": priority,
+                "priority": PRIORITY_RANKS.get(priority, 0),
+                "params": {"$literal": params or {}},
+                "status": {"$cond": [{"$in": ["$status", [PENDING, LEASED]]}, "$status", PENDING]},
+                "attempts": {"$cond": [{"$in": ["$status", [PENDING, LEASED]]}, {"$ifNull": ["$attempts", 0]}, 0]},
+                "enqueued_at": {"$ifNull": ["$enqueued_at", "$$NOW"]},
+            }}],
+            upsert=True
+        )
+
+
+    async def reap_expired(self) -> int:
+        """시도 횟수를 모두 쓴 작업의 임대가 만료되면 실패로 처리 (노드를 반복해서 죽이는 작업이 계속 임대되지 않도록)"""
+        result = await self.jobs.update_many(
+            {"status": LEASED, "attempts": {"$gte": self.max_attempts}, "$expr": {"$lt": ["$lease_expires_at", "$$NOW"]}},
+            [{"$set": {"status": FAILED, "last_error": "임대 만료 (하트비트 중단)", "failed_at": "$$NOW", "lease_owner": None, "lease_expires_at": None}}]
+        )
+        if result.modified_count:
+            logger.warning(f"[WorkQueue] 임대가 만료된 작업 {result.modified_count}개 실패 처리")
+        return result.modified_count
+
+
+    async def lease(self) -> Optional[dict]:
+        """대기 중이거나 임대가 만료된 작업 하나를 우선순위, 등록 순으로 임대"""
+        await self.reap_expired()
+        return await self.jobs.find_one_and_update(
+            {"$or": [
+                {"status": PENDING},
+                {"status": LEASED, "$expr": {"$lt": ["$lease_expires_at", "$$NOW"]}},
+            ]},
+            [{"$set": {
+                "status": LEASED,
+                "lease_owner": self.node_id,
+                "lease_token": uuid.uuid4().hex,
+                "leased_at": "$$NOW",
+                "lease_expires_at": self._lease_expiry(),
+                "attempts": {"$add": [{"$ifNull": ["$attempts", 0]}, 1]},
+            }}],
+            sort=[("priority", DESCENDING), ("enqueued_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+
+    async def heartbeat(self, job: dict) -> bool:
+        """임대 연장 (임대를 잃었으면 False)"""
+        result = await self.jobs.update_one(
+            {"_id": job["_id"], "lease_token": job["lease_token"], "status": LEASED},
+            [{"$set": {"lease_expires_at": self._lease_expiry(), "heartbeat_at": "$$NOW"}}]
+        )
+        return result.matched_count == 1
+
+
+    async def complete_report(self, job: dict, rcept_no: str, datasets: List[dict]) -> bool:
+        """보고서 완료와 데이터셋 기록 ((corp_code, rcept_no)당 한 번만 기록되며, 새로 기록된 경우 True)"""
+        result = await self.results.update_one(
+            {"_id": f"{job['_id']}:{rcept_no}"},
+            {"$setOnInsert": {
+                "corp_code": job["_id"],
+                "rcept_no": rcept_no,
+                "sj_divs": sorted({dataset["sj_div"] for dataset in datasets}),
+                "datasets": datasets,
+                "node_id": self.node_id,
+                "completed_at": datetime.now(timezone.utc),
+            }},
+            upsert=True
+        )
+        return result.upserted_id is not None
+
+
+    async def recorded_reports(self, corp_code: str) -> Dict[str, List[dict]]:
+        """어느 노드에서든 완료로 기록된 보고서의 데이터셋 {rcept_no: datasets}"""
+        return {
+            row["rcept_no"]: row.get("datasets", [])
+            async for row in self.results.find({"corp_code": corp_code}, {"rcept_no": 1, "datasets": 1}).sort("rcept_no", DESCENDING)
+        }
+
+
+    async def complete(self, job: dict, result: dict) -> bool:
+        """작업 완료 (임대를 잃었으면 반영하지 않고 False)"""
+        updated = await self.jobs.update_one(
+            {"_id": job["_id"], "lease_token": job["lease_token"], "status": LEASED},
+            [{"$set": {
+                "status": DONE,
+                "completed_at": "$$NOW",
+                "completed_by": self.node_id,
+                "result": {"$literal": result},
+                "lease_expires_at": None,
+            }}]
+        )
+        return updated.matched_count == 1
+
+
+    async def fail(self, job: dict, error: str, result: Optional[dict] = None) -> bool:
+        """
+        작업 실패 (시도 횟수가 남았으면 다시 대기 상태로)
+        result가 주어지면 일부 보고서만 수집된 작업으로 보고, 시도 횟수를 모두 쓰면 partial로 처리
+        """
+        final_status = PARTIAL if result is not None else FAILED
+        updated = await self.jobs.update_one(
+            {"_id": job["_id"], "lease_token": job["lease_token"], "status": LEASED},
+            [{"$set": {
+                "status": {"$cond": [{"$gte": ["$attempts", self.max_attempts]}, final_status, PENDING]},
+                "result": {"$literal": result},
+                "last_error": {"$literal": error},
+                "failed_at": "$$NOW",
+                "lease_owner": None,
+                "lease_expires_at": None,
+            }}]
+        )
+        return updated.matched_count == 1
+
+
+    async def stats(self, window_minutes: int = 60) -> dict:
+        """상태별 작업 수와 노드별 처리량 (최근 window_minutes분 보고서 수 기준 시간당 처리량)"""
+        status_counts = {
+            row["_id"]: row["count"]
+            async for row in self.jobs.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}])
+        }
+
+        since = datetime.now(timezone.utc) - timedelta(minutes=window_minutes)
+        nodes: Dict[str, dict] = {}
+        async for row in self.results.aggregate([
+            {"$group": {
+                "_id": "$node_id",
+                "reports": {"$sum": 1},
+                "recent_reports": {"$sum": {"$cond": [{"$gte": ["$completed_at", since]}, 1, 0]}},
+                "last_completed_at": {"$max": "$completed_at"},
+            }}
+        ]):
+            nodes[row["_id"]] = {
+                "reports": row["reports"],
+                "reports_per_hour": round(row["recent_reports"] * 60 / window_minutes, 2),
+                "last_completed_at": row["last_completed_at"].isoformat() if row["last_completed_at"] else None,
+            }
+
+        async for row in self.jobs.aggregate([
+            {"$match": {"status": DONE}},
+            {"$group": {"_id": "$completed_by", "jobs": {"$sum": 1}}}
+        ]):
+            nodes.setdefault(row["_id"], {"reports": 0, "reports_per_hour": 0.0, "last_completed_at": None})["jobs"] = row["jobs"]
+
+        leased_by = {
+            row["_id"]: row["count"]
+            async for row in self.jobs.aggregate([
+                {"$match": {"status": LEASED}},
+                {"$group": {"_id": "$lease_owner", "count": {"$sum": 1}}}
+            ])
+        }
+        for node_id, count in leased_by.items():
+            nodes.setdefault(node_id, {"reports": 0, "reports_per_hour": 0.0, "last_completed_at": None})["leased"] = count
+
+        return {"jobs": status_counts, "nodes": nodes, "window_minutes": window_minutes}
+
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+        self._client = None
+
+
+def seed_journal(corp_key: str, recorded: Dict[str, List[dict]]) -> int:
+    """
+    다른 노드(또는 이전 시도)가 crawl_results에 기록한 보고서를 이 노드의 저널에 완료로 기록
+    크롤러는 저널에 완료된 보고서를 다시 수집하지 않고 기록된 데이터셋을 그대로 사용
+    """
+    journal = CrawlJournal(corp_key)
+    seeded = 0
+    for rcept_no, datasets in recorded.items():
+        if journal.is_report_completed(rcept_no):
+            continue
+        for dataset in datasets:
+            journal.record_unit(rcept_no, dataset["sj_div"], dataset)
+        journal.record_report(rcept_no)
+        seeded += 1
+    return seeded
+
+
+class QueueWorker:
+    """
+    작업 큐에서 기업을 하나씩 임대해 수집하는 노드 워커
+    - 수집하는 동안 하트비트로 임대를 연장하고, 임대를 잃으면 수집을 취소
+    - crawl_results에 이미 기록된 보고서는 다시 수집하지 않음
+    - 보고서별 데이터셋을 crawl_results에 기록 (모든 노드가 공유하는 결과)
+    - 모든 보고서가 수집되면 이 노드의 statement_store에도 저장
+      (STATEMENT_STORE_DIR를 노드 간에 공유하지 않으면 `python -m app.src.work_queue sync <corp_code>`로 다른 노드에 반영)
+    - 실패한 보고서가 있으면 작업을 다시 대기 상태로 돌려, 다음 시도에서 남은 보고서만 수집
+    """
+
+    def __init__(self, queue: WorkQueue, heartbeat_seconds: int = WORK_QUEUE_HEARTBEAT_SECONDS, poll_seconds: float = WORK_QUEUE_POLL_SECONDS):
+        self.queue = queue
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+
+
+    async def _keep_alive(self, job: dict, process_task: asyncio.Task) -> bool:
+        """
+        임대를 연장하다가 임대를 잃으면 수집 작업을 취소하고 True 반환
+        하트비트 요청 자체가 실패하면 다음 주기에 다시 시도하고, 마지막 성공 후 임대 기간이 지나면 임대를 잃은 것으로 봄
+        """
+        last_renewed_at = time.monotonic()
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                renewed = await self.queue.heartbeat(job)
+            except Exception as e:
+                logger.error(f"[QueueWorker] 하트비트 실패, 다음 주기에 재시도: {job['_id']} {str(e)}")
+                if time.monotonic() - last_renewed_at < self.queue.lease_seconds:
+                    continue
+                renewed = False
+
+            if renewed:
+                last_renewed_at = time.monotonic()
+                continue
+
+            logger.warning(f"[QueueWorker] 임대를 잃어 수집을 중단합니다 (다른 노드가 처리 중일 수 있음): {job['_id']}")
+            process_task.cancel()
+            return True
+
+
+    async def process(self, job: dict) -> dict:
+        recorded = await self.queue.recorded_reports(job["_id"])
+        seeded = await asyncio.to_thread(seed_journal, job["_id"], recorded)
+        if recorded:
+            logger.info(f"[QueueWorker] crawl_results에 기록된 보고서 {len(recorded)}개는 다시 수집하지 않음 (저널에 새로 반영 {seeded}개): {job['_id']}")
+
+        params = job.get("params", {})
+        crawler = FinancialStatementCrawler(
+            headless=True,
+            navigation_mode=params.get("navigation_mode", "tree"),
+            search_mode=params.get("search_mode", "form"),
+            extraction_mode=params.get("extraction_mode", "locator"),
+            api_client=OpenDartClient() if params.get("engine") == "api" else None)
+        try:
+            dataset = await crawler.collect_financial_statements(
+                company_name=job["corp_name"],
+                corp_type_value=job["corp_type_value"],
+                retry_count=params.get("retry_count", 3))
+        finally:
+            await crawler.close()
+
+        ## 검증 실패로 재추출 대상이 된 보고서는 완료로 기록하지 않음
+        reports: Dict[str, List[dict]] = {}
+        for data in dataset:
+            if crawler.journal.is_report_completed(data["rcept_no"]):
+                reports.setdefault(data["rcept_no"], []).append(data)
+        new_reports = 0
+        for rcept_no, datasets in reports.items():
+            if rcept_no not in recorded and await self.queue.complete_report(job, rcept_no, datasets):
+                new_reports += 1
+
+        failed_reports = [report["rcept_no"] for report in crawler.failed_reports]
+        if not failed_reports:
+            await asyncio.to_thread(statement_store.save_datasets, job["_id"], dataset, "work_queue")
+
+        return {
+            "reports": len(reports),
+            "new_reports": new_reports,
+            "failed_reports": failed_reports,
+            "invalid_units": len(crawler.invalid_units),
+        }
+
+
+    async def run(self, max_jobs: Optional[int] = None):
+        """큐가 빌 때마다 poll_seconds 대기하며 계속 처리 (max_jobs개 처리 후 종료)"""
+        await self.queue.ensure_indexes()
+        processed = 0
+        logger.info(f"[QueueWorker] 워커 시작: {self.queue.node_id}")
+
+        while max_jobs is None or processed < max_jobs:
+            job = await self.queue.lease()
+            if job is None:
+                await asyncio.sleep(self.poll_seconds)
+                continue
+
+            logger.info(f"[QueueWorker] 작업 임대: {job['_id']} {job['corp_name']} ({job['attempts']}번째 시도)")
+            process_task = asyncio.create_task(self.process(job))
+            keep_alive = asyncio.create_task(self._keep_alive(job, process_task))
+            try:
+                result = await process_task
+            except asyncio.CancelledError:
+                if not (keep_alive.done() and not keep_alive.cancelled() and keep_alive.result()):
+                    raise
+                ## 임대를 잃었으므로 완료/실패 처리는 새로 임대한 노드에 맡김
+                logger.warning(f"[QueueWorker] 임대를 잃어 작업을 포기함: {job['_id']}")
+            except Exception as e:
+                logger.error(f"[QueueWorker] 작업 실패: {job['_id']} {str(e)}")
+                await self.queue.fail(job, str(e))
+            else:
+                if result["failed_reports"]:
+                    logger.warning(f"[QueueWorker] 실패한 보고서가 있어 작업을 다시 대기시킴: {job['_id']} {result['failed_reports']}")
+                    await self.queue.fail(job, f"수집 실패 보고서 {len(result['failed_reports'])}개", result)
+                elif await self.queue.complete(job, result):
+                    logger.info(f"[QueueWorker] 작업 완료: {job['_id']} {result}")
+                else:
+                    logger.warning(f"[QueueWorker] 임대가 만료되어 완료를 반영하지 않음: {job['_id']}")
+            finally:
+                keep_alive.cancel()
+            processed += 1
+
+
+# 앱 전체에서 공유하는 큐 (Mongo 연결은 첫 사용 시 생성)
+work_queue = WorkQueue()
+
+
+if __name__ == "__main__":
+    # python -m app.src.work_queue enqueue 삼성전자 카카오 [--corp-type all] [--priority backfill]
+    # python -m app.src.work_queue worker [--max-jobs 10]
+    # python -m app.src.work_queue stats
+    # python -m app.src.work_queue sync 00126380 [...]  (crawl_results의 수집 결과를 이 노드의 statement_store에 저장)
+    parser = argparse.ArgumentParser(description="MongoDB 기반 크롤링 작업 큐")
+    parser.add_argument("command", choices=["enqueue", "worker", "stats", "sync"])
+    parser.add_argument("corp_names", nargs="*")
+    parser.add_argument("--corp-type", default="all")
+    parser.add_argument("--priority", default="backfill", choices=list(PRIORITY_RANKS))
+    parser.add_argument("--max-jobs", type=int, default=None)
+    args = parser.parse_args()
+
+    async def main():
+        try:
+            if args.command == "enqueue":
+                await work_queue.ensure_indexes()
+                for corp_name in args.corp_names:
+                    print(corp_name, await work_queue.enqueue(corp_name, args.corp_type, args.priority))
+            elif args.command == "worker":
+                await asyncio.to_thread(start_parse_executor)
+                await QueueWorker(work_queue).run(max_jobs=args.max_jobs)
+            elif args.command == "sync":
+                for corp_code in args.corp_names:
+                    recorded = await work_queue.recorded_reports(corp_code)
+                    datasets = [dataset for datasets in recorded.values() for dataset in datasets]
+                    print(corp_code, await asyncio.to_thread(statement_store.save_datasets, corp_code, datasets, "work_queue"))
+            else:
+                print(json.dumps(await work_queue.stats(), ensure_ascii=False, indent=2))
+        finally:
+            work_queue.close()
+            await http_client.close()
+            shutdown_parse_executor()
+
+    asyncio.run(main())
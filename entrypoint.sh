@@ -35,6 +35,11 @@ fi
 # 필요한 초기화 작업 수행
 echo "컨테이너 시작됨"
 
+# 기업 레지스트리 스냅샷 컴파일 (모든 워커가 같은 파일을 메모리 매핑하여 공유)
+if [ "$COMPILE_REGISTRY_SNAPSHOT" != "false" ]; then
+    python3 -m app.src.registry_snapshot || echo "WARNING: 레지스트리 스냅샷 컴파일 실패, CSV로 로드합니다."
+fi
+
 # 명령어 인자가 전달되면 해당 명령어 실행, 아니면 FastAPI 앱 실행
 if [ "$#" -eq 0 ]; then
     echo "FastAPI 애플리케이션 시작"
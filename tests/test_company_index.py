@@ -0,0 +1,37 @@
+from app.src.company_index import CompanyNameIndex, normalize_company_name, to_choseong
+
+
+def _index() -> CompanyNameIndex:
+    index = CompanyNameIndex()
+    for corp_name, corp_code, market in [
+        ("삼성전자", "00126380", "P"),
+        ("삼성전기", "00126371", "P"),
+        ("(주)삼성전자서비스", "00258999", "E"),
+        ("카카오", "00258801", "P"),
+    ]:
+        index.add({"corp_name": corp_name, "corp_code": corp_code, "market": market})
+    return index
+
+
+def test_normalize_and_choseong():
+    assert normalize_company_name("(주) 삼성 전자") == "삼성전자"
+    assert normalize_company_name("주식회사 NAVER") == "naver"
+    assert to_choseong("삼성전자") == "ㅅㅅㅈㅈ"
+
+
+def test_exact_match_ranks_first():
+    results = _index().search("삼성전자")
+    assert results[0]["corp_code"] == "00126380"
+    assert {result["corp_code"] for result in results} >= {"00126380", "00258999"}
+
+
+def test_choseong_query():
+    results = _index().search("ㅅㅅㅈㄱ")
+    assert results[0]["corp_code"] == "00126371"
+
+
+def test_market_filter_and_limit():
+    index = _index()
+    assert [result["corp_code"] for result in index.search("삼성전자", market="E")] == ["00258999"]
+    assert len(index.search("삼성", limit=1)) == 1
+    assert index.search("") == []
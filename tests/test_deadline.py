@@ -0,0 +1,26 @@
+import time
+
+import pytest
+
+from app.src.deadline import Deadline, DeadlineExceeded, new_deadline
+
+
+def test_timeout_is_clipped_to_remaining_time():
+    deadline = Deadline(0.5)
+    assert deadline.timeout_ms(60000) <= 500
+    assert deadline.timeout_ms(100) == 100
+
+
+def test_expired_deadline_raises_with_stage():
+    deadline = Deadline(0.01)
+    time.sleep(0.02)
+    assert deadline.expired()
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        deadline.timeout_ms(1000, stage="goto_report")
+    assert exc_info.value.stage == "goto_report"
+
+
+def test_new_deadline_is_optional():
+    assert new_deadline(None) is None
+    assert new_deadline(0) is None
+    assert isinstance(new_deadline(5), Deadline)
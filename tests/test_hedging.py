@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from app.src.hedging import LatencyTracker, NavigationHedger, REPORT_NAVIGATION, VIEWER_NAVIGATION
+
+
+class FakePage:
+    def __init__(self, delay: float, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.closed = False
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("navigation failed")
+
+    async def close(self):
+        self.closed = True
+
+
+def _warm_tracker(samples: int = 20, seconds: float = 0.01) -> LatencyTracker:
+    tracker = LatencyTracker(min_samples=samples)
+    for _ in range(samples):
+        tracker.record(seconds)
+    return tracker
+
+
+def test_no_hedge_before_enough_samples():
+    hedger = NavigationHedger(min_delay_seconds=0)
+
+    async def scenario():
+        page = FakePage(0.01)
+        return page, await hedger.goto(page, "https://dart.fss.or.kr", lambda: None)
+
+    page, result = asyncio.run(scenario())
+    assert result is page
+    assert hedger.stats["hedges_started"] == 0
+    assert len(hedger.tracker(REPORT_NAVIGATION).samples) == 1
+
+
+def test_slow_navigation_is_hedged_and_loser_closed():
+    hedger = NavigationHedger(min_delay_seconds=0, trackers={REPORT_NAVIGATION: _warm_tracker()})
+    hedge_page = FakePage(0.01)
+
+    async def open_page():
+        return hedge_page
+
+    async def scenario():
+        page = FakePage(1.0)
+        return page, await hedger.goto(page, "https://dart.fss.or.kr", open_page)
+
+    page, result = asyncio.run(scenario())
+    assert result is hedge_page
+    assert page.closed
+    assert hedger.stats["hedges_won"] == 1
+    assert hedger.active_hedges == 0
+
+
+def test_caller_page_is_kept_when_all_attempts_fail():
+    hedger = NavigationHedger(min_delay_seconds=0, trackers={REPORT_NAVIGATION: _warm_tracker()})
+    hedge_page = FakePage(0.01, fail=True)
+
+    async def open_page():
+        return hedge_page
+
+    async def scenario():
+        page = FakePage(0.1, fail=True)
+        with pytest.raises(RuntimeError):
+            await hedger.goto(page, "https://dart.fss.or.kr", open_page)
+        return page
+
+    page = asyncio.run(scenario())
+    assert not page.closed
+    assert hedge_page.closed
+    assert hedger.stats["failures"] == 1
+
+
+def test_latency_samples_are_kept_per_navigation_kind():
+    hedger = NavigationHedger(min_delay_seconds=0, trackers={REPORT_NAVIGATION: _warm_tracker(seconds=5)})
+
+    async def scenario():
+        await hedger.goto(FakePage(0.01), "https://dart.fss.or.kr/report/viewer.do", lambda: None, kind=VIEWER_NAVIGATION)
+
+    asyncio.run(scenario())
+    assert hedger.hedge_delay(REPORT_NAVIGATION) == 5
+    assert hedger.hedge_delay(VIEWER_NAVIGATION) is None
+    assert hedger.metrics()["kinds"][VIEWER_NAVIGATION]["latency_samples"] == 1
@@ -0,0 +1,69 @@
+import threading
+
+from app.src import industry_cube as cube_module
+from app.src.industry_cube import IndustryCube
+from app.src.statement_index import StatementIndex
+from app.src.statement_store import StatementStore
+
+PATHS = {
+    "00126380": ["제조업", "전자부품 제조업"],
+    "00164779": ["제조업", "식료품 제조업"],
+    "00164742": ["금융업"],
+}
+
+
+def _row(account_name: str, amounts: list) -> dict:
+    return {"ord_value": 1, "raw_account_name": account_name, "account_name": account_name, "amounts": amounts, "account_level": 0, "ancestors": []}
+
+
+def _cube(tmp_path, monkeypatch) -> IndustryCube:
+    monkeypatch.setattr(cube_module, "get_company_industry_paths", lambda: PATHS)
+    store = StatementStore(root=str(tmp_path))
+    for corp_key, total in [("00126380", "100"), ("00164779", "50")]:
+        store.put(corp_key, "CFS_BS", [_row("자산총계", [{"2023": total}])])
+    index = StatementIndex(store=store)
+    index.refresh()
+    cube = IndustryCube(index=index)
+    cube.build()
+    return cube
+
+
+def test_query_and_children(tmp_path, monkeypatch):
+    cube = _cube(tmp_path, monkeypatch)
+
+    assert cube.list_children([]) == ["제조업"]
+    assert cube.list_children(["제조업"]) == ["식료품 제조업", "전자부품 제조업"]
+    node, rows = cube.query(["제조업"], year=2023)
+    assert node == "제조업"
+    assert rows[0]["year"] == 2023
+    assert rows[0]["metrics"]["total_assets"]["count"] == 2
+
+
+def test_reads_during_updates(tmp_path, monkeypatch):
+    cube = _cube(tmp_path, monkeypatch)
+    cube.index.store.put("00164742", "CFS_BS", [_row("자산총계", [{"2023": "70"}])])
+    cube.index.refresh()
+    errors = []
+
+    def update():
+        try:
+            for _ in range(30):
+                cube.update_companies(["00164742", "00126380"])
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=update)
+    thread.start()
+    while thread.is_alive():
+        try:
+            cube.list_children([])
+            cube.query(["금융업"])
+            cube.query(["제조업", "전자부품 제조업"])
+        except Exception as e:
+            errors.append(e)
+            break
+    thread.join()
+
+    assert not errors
+    assert cube.list_children([]) == ["금융업", "제조업"]
+    assert cube.query(["금융업"])[1][0]["metrics"]["total_assets"]["count"] == 1
@@ -0,0 +1,55 @@
+import json
+
+from app.src.journal import CrawlJournal
+
+
+def _dataset(rcept_no: str, sj_div: str) -> dict:
+    return {"rcept_no": rcept_no, "sj_div": sj_div, "unit": "원", "data": [{"account_name": "자산총계", "amounts": [{"2024": "100"}]}]}
+
+
+def test_units_and_report_survive_reload(tmp_path):
+    journal = CrawlJournal("00126380", journal_dir=str(tmp_path))
+    journal.record_unit("20240301000001", "CFS_BS", _dataset("20240301000001", "CFS_BS"))
+    journal.record_unit("20240301000001", "CFS_IS", _dataset("20240301000001", "CFS_IS"))
+    journal.record_report("20240301000001")
+    journal.record_unit("20230301000001", "CFS_BS", _dataset("20230301000001", "CFS_BS"))
+
+    reloaded = CrawlJournal("00126380", journal_dir=str(tmp_path))
+    assert reloaded.is_report_completed("20240301000001")
+    assert not reloaded.is_report_completed("20230301000001")
+    assert [dataset["sj_div"] for dataset in reloaded.get_report_datasets("20240301000001")] == ["CFS_BS", "CFS_IS"]
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    journal = CrawlJournal("00126380", journal_dir=str(tmp_path))
+    journal.record_unit("20240301000001", "CFS_BS", _dataset("20240301000001", "CFS_BS"))
+    journal.record_report("20240301000001")
+    with open(journal.path, mode='a', encoding='utf-8') as f:
+        f.write(json.dumps({"type": "unit", "rcept_no": "20230301000001"})[:20])
+
+    reloaded = CrawlJournal("00126380", journal_dir=str(tmp_path))
+    assert reloaded.is_report_completed("20240301000001")
+    assert len(reloaded.units) == 1
+
+
+def test_invalidated_unit_reopens_report_until_rerecorded(tmp_path):
+    journal = CrawlJournal("00126380", journal_dir=str(tmp_path))
+    journal.record_unit("20240301000001", "CFS_BS", _dataset("20240301000001", "CFS_BS"))
+    journal.record_report("20240301000001")
+
+    journal.invalidate_unit("20240301000001", "CFS_BS", "subtotal")
+    assert not journal.is_report_completed("20240301000001")
+    assert journal.invalidated_units("20240301000001") == {"CFS_BS"}
+
+    journal.record_unit("20240301000001", "CFS_BS", _dataset("20240301000001", "CFS_BS"))
+    assert journal.is_report_completed("20240301000001")
+    assert not CrawlJournal("00126380", journal_dir=str(tmp_path)).invalidated_units("20240301000001")
+
+
+def test_clear_removes_journal_file(tmp_path):
+    journal = CrawlJournal("00126380", journal_dir=str(tmp_path))
+    journal.record_report("20240301000001")
+    journal.clear()
+
+    assert not journal.completed_reports
+    assert not CrawlJournal("00126380", journal_dir=str(tmp_path)).completed_reports
@@ -0,0 +1,148 @@
+import time
+import asyncio
+
+import pytest
+
+from aiohttp import web
+
+from app.src.deadline import Deadline, DeadlineExceeded
+from app.src.http_client import DartHttpClient
+from app.src.opendart import OpenDartClient, OpenDartError, STATUS_OK, STATUS_RATE_LIMITED
+
+
+def _list_item(rcept_no: str, report_nm: str) -> dict:
+    return {"corp_name": "삼성전자", "report_nm": report_nm, "rcept_no": rcept_no}
+
+
+def _make_app(calls: list, rate_limited_times: int = 0) -> web.Application:
+    pages = {
+        1: [_list_item("20240312000001", "사업보고서 (2023.12)"), _list_item("20230601000001", "사업보고서제출기한연장신고서 (2022.12)")],
+        2: [_list_item("20230307000001", "[기재정정]사업보고서 (2022.12)")],
+    }
+
+    async def report_list(request):
+        calls.append(("list.json", dict(request.query)))
+        page_no = int(request.query["page_no"])
+        return web.json_response({"status": STATUS_OK, "total_page": len(pages), "list": pages[page_no]})
+
+    async def statements(request):
+        calls.append(("fnlttSinglAcntAll.json", dict(request.query)))
+        if len([call for call in calls if call[0] == "fnlttSinglAcntAll.json"]) <= rate_limited_times:
+            return web.json_response({"status": STATUS_RATE_LIMITED, "message": "요청 제한"})
+        if request.query["fs_div"] == "OFS":
+            return web.json_response({"status": "013", "message": "조회된 데이타가 없습니다."})
+        return web.json_response({"status": STATUS_OK, "list": [
+            {"sj_div": "BS", "ord": "2", "bsns_year": request.query["bsns_year"], "account_nm": "부채총계", "thstrm_amount": "40", "frmtrm_amount": "30"},
+            {"sj_div": "BS", "ord": "1", "bsns_year": request.query["bsns_year"], "account_nm": "자산총계", "thstrm_amount": "100", "frmtrm_amount": "90"},
+            {"sj_div": "CF", "ord": "1", "bsns_year": request.query["bsns_year"], "account_nm": "영업활동현금흐름", "thstrm_amount": "10"},
+        ]})
+
+    async def slow(request):
+        await asyncio.sleep(2)
+        return web.json_response({"status": STATUS_OK})
+
+    async def error(request):
+        return web.json_response({"status": "010", "message": "등록되지 않은 키입니다."})
+
+    app = web.Application()
+    app.router.add_get("/api/list.json", report_list)
+    app.router.add_get("/api/fnlttSinglAcntAll.json", statements)
+    app.router.add_get("/api/error.json", error)
+    app.router.add_get("/api/slow.json", slow)
+    return app
+
+
+async def _with_stub(tmp_path, scenario, rate_limited_times: int = 0, deadline=None):
+    calls = []
+    runner = web.AppRunner(_make_app(calls, rate_limited_times))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    http_client = DartHttpClient(retry_count=0, cache_dir=str(tmp_path))
+    client = OpenDartClient(api_key="test-key", base_url=f"http://127.0.0.1:{port}/api", http_client=http_client, deadline=deadline)
+    try:
+        return await scenario(client), calls
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+
+def test_report_list_follows_pages_and_skips_extension_notices(tmp_path):
+    async def scenario(client):
+        return await client.fetch_report_list("00126380")
+
+    reports, calls = asyncio.run(_with_stub(tmp_path, scenario))
+    assert [report["rcept_no"] for report in reports] == ["20240312000001", "20230307000001"]
+    assert reports[0]["report_name"] == "사업보고서"
+    assert reports[0]["publish_date"] == "2023.12"
+    assert [call[1]["page_no"] for call in calls] == ["1", "2"]
+    assert all(call[1]["crtfc_key"] == "test-key" for call in calls)
+
+
+def test_report_datasets_are_converted_for_fiscal_year(tmp_path):
+    report = {"rcept_no": "20240312000001", "report_name": "사업보고서", "publish_date": "2023.12"}
+
+    async def scenario(client):
+        return await client.collect_report_datasets(report, {"corp_code": "00126380", "corp_name": "삼성전자"})
+
+    datasets, calls = asyncio.run(_with_stub(tmp_path, scenario))
+    assert [call[1]["bsns_year"] for call in calls] == ["2023", "2023"]
+    assert [dataset["sj_div"] for dataset in datasets] == ["CFS_BS"]
+    assert [row["account_name"] for row in datasets[0]["data"]] == ["자산총계", "부채총계"]
+    assert datasets[0]["data"][0]["amounts"] == [{"2023": "100"}, {"2022": "90"}]
+
+
+def test_rate_limited_request_is_retried(tmp_path, monkeypatch):
+    sleeps = []
+    real_sleep = asyncio.sleep
+
+    async def fast_sleep(seconds):
+        sleeps.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr("app.src.opendart.asyncio.sleep", fast_sleep)
+
+    async def scenario(client):
+        return await client.fetch_statements("00126380", "2023", "CFS")
+
+    rows, calls = asyncio.run(_with_stub(tmp_path, scenario, rate_limited_times=1))
+    assert len(rows) == 3
+    assert len(calls) == 2
+    assert 2 in sleeps
+
+
+def test_api_error_status_raises(tmp_path):
+    async def scenario(client):
+        try:
+            await client.request("error.json", {})
+        except OpenDartError as e:
+            return str(e)
+        return None
+
+    message, _ = asyncio.run(_with_stub(tmp_path, scenario))
+    assert message is not None and "010" in message
+
+
+def test_slow_response_is_cut_at_deadline(tmp_path):
+    async def scenario(client):
+        started_at = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            await client.request("slow.json", {})
+        return time.monotonic() - started_at
+
+    elapsed, _ = asyncio.run(_with_stub(tmp_path, scenario, deadline=Deadline(0.3)))
+    assert elapsed < 1.5
+
+
+def test_rate_limit_backoff_past_deadline_is_not_awaited(tmp_path):
+    async def scenario(client):
+        started_at = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            await client.fetch_statements("00126380", "2023", "CFS")
+        return time.monotonic() - started_at
+
+    elapsed, calls = asyncio.run(_with_stub(tmp_path, scenario, rate_limited_times=1, deadline=Deadline(1)))
+    assert elapsed < 1
+    assert len(calls) == 1
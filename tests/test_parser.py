@@ -0,0 +1,30 @@
+import asyncio
+
+from app.src import parser
+
+
+def test_parse_pool_uses_spawn_and_parses(monkeypatch):
+    monkeypatch.setattr(parser, "PARSE_WORKERS", 1)
+    meta = {
+        "corp_name": "", "stock_code": "", "corp_code": "00126380", "bsns_year": "2020",
+        "rcept_no": "20210330000001", "corp_type_value": "", "corp_type_name": "", "target_sj_list": ["연결재무상태표"],
+    }
+    nb_table = {"class": "nb", "border": None, "header": None, "body": [], "rows": [
+        {"text": "연결 재무상태표", "tds": ["연결 재무상태표"]},
+        {"text": "", "tds": ["제 52 기 2020.12.31 현재"]},
+        {"text": "", "tds": ["제 51 기 2019.12.31 현재"]},
+        {"text": "", "tds": ["제 50 기 2018.12.31 현재"]},
+        {"text": "(단위 : 원)", "tds": ["(단위 : 원)"]},
+    ]}
+    data_table = {"class": None, "border": "1", "rows": [], "header": ["", "주석", "제 52 기", "제 51 기"],
+                  "body": [["자산총계", "100", "90", "80"]]}
+
+    try:
+        parser.start_parse_executor()
+        assert parser.get_parse_executor()._mp_context.get_start_method() == "spawn"
+        datasets = asyncio.run(parser.parse_in_pool([nb_table, data_table], meta))
+    finally:
+        parser.shutdown_parse_executor()
+
+    assert datasets[0]["sj_div"] == "CFS_BS"
+    assert datasets[0]["data"][0]["account_name"] == "자산총계"
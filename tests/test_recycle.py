@@ -0,0 +1,28 @@
+import sys
+import time
+import subprocess
+
+from app.src.recycle import RecyclePolicy, get_browser_rss_mb, new_browser_marker
+
+
+def test_rss_is_measured_only_for_marked_process_tree():
+    marker = new_browser_marker()
+    marked = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)", marker])
+    other = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)", new_browser_marker()])
+    try:
+        time.sleep(0.3)
+        assert get_browser_rss_mb(marker) > 0
+        assert get_browser_rss_mb(new_browser_marker()) == 0
+    finally:
+        marked.kill()
+        other.kill()
+        marked.wait()
+        other.wait()
+
+
+def test_policy_thresholds():
+    policy = RecyclePolicy(max_reports_per_context=3, context_rss_mb=100, browser_rss_mb=200, max_contexts_per_browser=2)
+    assert policy.decide(0, 0, 10) == RecyclePolicy.NONE
+    assert policy.decide(3, 0, 10) == RecyclePolicy.CONTEXT
+    assert policy.decide(3, 1, 10) == RecyclePolicy.BROWSER
+    assert policy.decide(0, 0, 250) == RecyclePolicy.BROWSER
@@ -0,0 +1,61 @@
+from app.src.parser import parse_statement_tables
+from app.src.opendart import to_datasets
+from app.src.report_selection import get_fiscal_period, get_fiscal_year, select_latest_reports
+
+
+def _report(rcept_no: str, report_name: str, publish_date: str) -> dict:
+    return {"rcept_no": rcept_no, "report_name": report_name, "publish_date": publish_date}
+
+
+def test_fiscal_year_comes_from_period_not_receipt_date():
+    original = _report("20210330000001", "사업보고서", "2020.12")
+    late_amendment = _report("20230512000001", "[기재정정]사업보고서", "2020.12")
+
+    assert get_fiscal_period(late_amendment) == "2020.12"
+    assert get_fiscal_year(original) == "2020"
+    assert get_fiscal_year(late_amendment) == "2020"
+
+
+def test_fiscal_year_falls_back_to_year_before_receipt():
+    assert get_fiscal_year(_report("20240315000001", "사업보고서", "")) == "2023"
+
+
+def test_latest_amendment_replaces_original():
+    reports = [
+        _report("20240315000001", "사업보고서", "2023.12"),
+        _report("20240601000001", "[기재정정]사업보고서", "2023.12"),
+        _report("20230315000001", "사업보고서", "2022.12"),
+    ]
+
+    selected, skipped = select_latest_reports(reports)
+    assert [report["rcept_no"] for report in selected] == ["20240601000001", "20230315000001"]
+    assert [report["rcept_no"] for report in skipped] == ["20240315000001"]
+    assert "기재정정" in skipped[0]["skip_reason"]
+
+
+def test_api_datasets_use_business_year():
+    rows = [{"sj_div": "BS", "ord": "1", "bsns_year": "2020", "account_nm": "자산총계", "thstrm_amount": "100", "frmtrm_amount": "90"}]
+
+    datasets = to_datasets(rows, "CFS", "20230512000001", "2020", {"corp_code": "00126380"})
+    assert datasets[0]["bsns_year"] == "2020"
+    assert [list(amount)[0] for amount in datasets[0]["data"][0]["amounts"]] == ["2020", "2019"]
+
+
+def test_snapshot_amount_years_start_at_business_year():
+    meta = {
+        "corp_name": "", "stock_code": "", "corp_code": "00126380", "bsns_year": "2020",
+        "rcept_no": "20230512000001", "corp_type_value": "", "corp_type_name": "", "target_sj_list": ["연결재무상태표"],
+    }
+    nb_table = {"class": "nb", "border": None, "header": None, "body": [], "rows": [
+        {"text": "연결 재무상태표", "tds": ["연결 재무상태표"]},
+        {"text": "", "tds": ["제 52 기 2020.12.31 현재"]},
+        {"text": "", "tds": ["제 51 기 2019.12.31 현재"]},
+        {"text": "", "tds": ["제 50 기 2018.12.31 현재"]},
+        {"text": "(단위 : 원)", "tds": ["(단위 : 원)"]},
+    ]}
+    data_table = {"class": None, "border": "1", "rows": [], "header": ["", "주석", "제 52 기", "제 51 기"],
+                  "body": [["자산총계", "100", "90", "80"]]}
+
+    datasets = parse_statement_tables([nb_table, data_table], meta)
+    assert datasets[0]["bsns_year"] == "2020"
+    assert [list(amount)[0] for amount in datasets[0]["data"][0]["amounts"]] == ["2020", "2019", "2018"]
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from app.src.scheduler import BACKFILL, INTERACTIVE, CrawlScheduler
+
+
+def test_backfill_cannot_use_reserved_slot():
+    async def scenario():
+        scheduler = CrawlScheduler(slots=2, reserved_interactive=1)
+        await scheduler.acquire(BACKFILL)
+        with pytest.raises(asyncio.TimeoutError):
+            await scheduler.acquire(BACKFILL, timeout=0.05)
+        await scheduler.acquire(INTERACTIVE, timeout=0.05)
+        return scheduler.metrics()
+
+    metrics = asyncio.run(scenario())
+    assert metrics["classes"][BACKFILL]["in_use"] == 1
+    assert metrics["classes"][INTERACTIVE]["in_use"] == 1
+    assert metrics["classes"][BACKFILL]["waiting"] == 0
+
+
+def test_waiting_classes_share_slots_by_weight():
+    async def scenario():
+        scheduler = CrawlScheduler(slots=1, reserved_interactive=0, weights={INTERACTIVE: 3, BACKFILL: 1})
+        await scheduler.acquire(BACKFILL)
+        order = []
+
+        async def worker(priority):
+            await scheduler.acquire(priority)
+            order.append(priority)
+            await asyncio.sleep(0)
+            scheduler.release(priority)
+
+        tasks = [asyncio.create_task(worker(priority)) for priority in [BACKFILL] * 4 + [INTERACTIVE] * 4]
+        await asyncio.sleep(0)
+        scheduler.release(BACKFILL)
+        await asyncio.gather(*tasks)
+        return order
+
+    order = asyncio.run(scenario())
+    assert order[:4].count(INTERACTIVE) == 3
+
+
+def test_unknown_priority_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(CrawlScheduler().acquire("batch"))
@@ -0,0 +1,77 @@
+import threading
+
+from app.src.statement_index import StatementIndex
+from app.src.statement_store import StatementStore
+
+
+def _row(account_name: str, amounts: list) -> dict:
+    return {"ord_value": 1, "raw_account_name": account_name, "account_name": account_name, "amounts": amounts, "account_level": 0, "ancestors": []}
+
+
+def _index(tmp_path):
+    store = StatementStore(root=str(tmp_path))
+    store.put("00126380", "CFS_BS", [_row("자산총계", [{"2023": "100"}, {"2022": "90"}])])
+    store.put("00164779", "CFS_BS", [_row("자산총계", [{"2023": "50"}])])
+    index = StatementIndex(store=store)
+    index.refresh()
+    return store, index
+
+
+def test_statement_and_series_lookup(tmp_path):
+    _, index = _index(tmp_path)
+
+    etag, rows = index.get_statement("00126380", "cfs_bs", from_year=2023)
+    assert etag is not None
+    assert rows[0]["amounts"] == [{"2023": "100"}]
+    assert index.list_statements("00126380") == [{"sj_div": "CFS_BS", "hash": index._statements[("00126380", "CFS_BS")]["hash"], "accounts": 1}]
+
+    _, series = index.get_account_series("CFS_BS", "자산총계")
+    assert [item["corp_key"] for item in series] == ["00126380", "00164779"]
+    assert [corp_key for corp_key, _ in index.iter_statements("cfs_bs")] == ["00126380", "00164779"]
+
+
+def test_etag_changes_when_latest_changes(tmp_path):
+    store, index = _index(tmp_path)
+    etag, _ = index.get_statement("00126380", "CFS_BS")
+
+    store.put("00126380", "CFS_BS", [_row("자산총계", [{"2024": "120"}])])
+    index.update("00126380", "CFS_BS")
+    new_etag, rows = index.get_statement("00126380", "CFS_BS")
+    assert new_etag != etag
+    assert rows[0]["amounts"] == [{"2024": "120"}]
+
+
+def test_reads_are_consistent_while_updating_from_another_thread(tmp_path):
+    store, index = _index(tmp_path)
+    payloads = [
+        [_row("자산총계", [{"2023": "100"}])],
+        [_row("부채총계", [{"2023": "40"}])],
+    ]
+    for payload in payloads:
+        store.put("00126380", "CFS_BS", payload)
+    stop = threading.Event()
+    errors = []
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            store.put("00126380", "CFS_BS", payloads[i % 2], saved_at=str(i))
+            index.update("00126380", "CFS_BS")
+            i += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(3000):
+            try:
+                _, series = index.get_account_series("CFS_BS", "자산총계")
+                assert {item["corp_key"] for item in series} <= {"00126380", "00164779"}
+                list(index.iter_statements("CFS_BS"))
+            except Exception as e:
+                errors.append(e)
+                break
+    finally:
+        stop.set()
+        thread.join()
+
+    assert errors == []
@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.src.statement_store import StatementStore, integrate_datasets
+
+
+def _dataset(rcept_no: str, amounts: list, sj_div: str = "CFS_BS") -> dict:
+    return {"rcept_no": rcept_no, "sj_div": sj_div, "data": [
+        {"ord_value": 1, "raw_account_name": "자산총계", "account_name": "자산총계", "amounts": amounts, "account_level": 0, "ancestors": []},
+    ]}
+
+
+def test_integrate_prefers_latest_report_per_year():
+    integrated = integrate_datasets([
+        _dataset("20230301000001", [{"2022": "90"}, {"2021": "80"}]),
+        _dataset("20240301000001", [{"2023": "100"}, {"2022": "95"}]),
+    ])
+    assert integrated["CFS_BS"][0]["amounts"] == [{"2023": "100"}, {"2022": "95"}, {"2021": "80"}]
+
+
+def test_put_deduplicates_same_content(tmp_path):
+    store = StatementStore(root=str(tmp_path))
+    first = store.put("00126380", "CFS_BS", [{"account_name": "자산총계"}])
+    again = store.put("00126380", "cfs_bs", [{"account_name": "자산총계"}])
+    changed = store.put("00126380", "CFS_BS", [{"account_name": "부채총계"}])
+
+    ref = store.get_ref("00126380", "CFS_BS")
+    assert first == again
+    assert [version["hash"] for version in ref["versions"]] == [first, changed]
+    assert store.get_latest("00126380", "CFS_BS") == [{"account_name": "부채총계"}]
+
+
+def test_compact_removes_unreferenced_objects(tmp_path):
+    store = StatementStore(root=str(tmp_path))
+    store.put("00126380", "CFS_BS", [{"account_name": "자산총계"}])
+    orphan = tmp_path / "objects" / "00" / f"{'0' * 64}.json"
+    orphan.parent.mkdir(parents=True, exist_ok=True)
+    orphan.write_text("[]")
+
+    assert store.compact() == {"collapsed_versions": 0, "removed_objects": 1}
+    assert not orphan.exists()
+    assert store.get_latest("00126380", "CFS_BS") == [{"account_name": "자산총계"}]
+
+
+def test_concurrent_puts_keep_every_version(tmp_path):
+    store = StatementStore(root=str(tmp_path))
+    payloads = [[{"account_name": f"계정{i}"}] for i in range(20)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = []
+        for payload in payloads:
+            futures.append(executor.submit(store.put, "00126380", "CFS_BS", payload))
+            executor.submit(store.compact)
+        digests = [future.result() for future in futures]
+
+    ref = store.get_ref("00126380", "CFS_BS")
+    assert sorted(version["hash"] for version in ref["versions"]) == sorted(digests)
+    assert [version["version"] for version in ref["versions"]] == list(range(1, 21))
+    for digest in digests:
+        assert store.get(digest) is not None
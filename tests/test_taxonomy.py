@@ -0,0 +1,47 @@
+import pytest
+
+from app.src.taxonomy import AccountMatcher, add_canonical_accounts
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return AccountMatcher()
+
+
+@pytest.mark.parametrize("name, canonical", [
+    ("자산총계", "자산총계"),
+    ("유동자산", "유동자산"),
+    ("비유동자산", "비유동자산"),
+    ("당기기타포괄손익", "기타포괄손익"),
+    ("매출채권및기타채권", "매출채권"),
+    ("법인세비용차감전계속영업이익", "법인세비용차감전순이익"),
+    ("지배기업의소유주에게귀속되는자본", "지배기업소유주지분"),
+    ("매각예정비유동자산", "매각예정자산"),
+    ("매각예정으로분류된비유동자산", "매각예정자산"),
+    ("전환사채", "사채"),
+    ("수익", "매출액"),
+])
+def test_maps_exact_and_suffix_names(matcher, name, canonical):
+    assert matcher.map_account(name) == canonical
+
+
+@pytest.mark.parametrize("name", [
+    "계속영업이익",
+    "중단영업이익",
+    "계속영업당기순이익",
+    "비지배지분에귀속되는당기순이익",
+    "지배기업의소유주에게귀속되는당기순이익",
+    "기타포괄손익공정가치측정금융자산",
+    "매각예정비유동부채",
+    "사채할인발행차금",
+    "이연수익",
+    "유동자산처분손실",
+])
+def test_qualified_accounts_are_not_mapped_to_their_parts(matcher, name):
+    assert matcher.map_account(name) is None
+
+
+def test_add_canonical_accounts_sets_none_for_unmatched():
+    datasets = [{"data": [{"account_name": "영업이익"}, {"account_name": "중단영업이익"}, {"account_name": None}]}]
+    add_canonical_accounts(datasets)
+    assert [row["canonical_account"] for row in datasets[0]["data"]] == ["영업이익", None, None]
@@ -0,0 +1,63 @@
+from app.src.journal import CrawlJournal
+from app.src.toc import section_matches_units
+from app.src.validation import invalidate_failed_units, validate_datasets
+
+
+def _row(account_name: str, amounts: list) -> dict:
+    return {"account_name": account_name, "amounts": amounts}
+
+
+def _balance_sheet(rcept_no: str, total_assets: str) -> dict:
+    return {"rcept_no": rcept_no, "sj_div": "CFS_BS", "unit": "원", "data": [
+        _row("유동자산", [{"2023": "60"}, {"2022": "50"}]),
+        _row("비유동자산", [{"2023": "40"}, {"2022": "40"}]),
+        _row("자산총계", [{"2023": total_assets}, {"2022": "90"}]),
+    ]}
+
+
+def test_balanced_statement_has_no_issues():
+    assert validate_datasets([_balance_sheet("20240301000001", "100")]) == []
+
+
+def test_subtotal_mismatch_and_missing_unit_are_reported():
+    dataset = _balance_sheet("20240301000001", "120")
+    dataset["unit"] = ""
+
+    issues = validate_datasets([dataset])
+    assert {issue["check"] for issue in issues} == {"subtotal", "unit"}
+    assert all(issue["sj_div"] == "CFS_BS" for issue in issues)
+
+
+def test_shifted_year_column_is_reported():
+    dataset = _balance_sheet("20240301000001", "100")
+    dataset["data"].append(_row("현금", [{"": "10"}]))
+
+    assert [issue["check"] for issue in validate_datasets([dataset])] == ["year_alignment"]
+
+
+def test_repair_attempts_are_capped(tmp_path):
+    journal = CrawlJournal("00126380", journal_dir=str(tmp_path))
+    dataset = _balance_sheet("20240301000001", "120")
+    issues = validate_datasets([dataset])
+
+    for attempt in range(2):
+        journal.record_unit("20240301000001", "CFS_BS", dataset)
+        journal.record_report("20240301000001")
+        invalid_units = invalidate_failed_units(journal, issues, max_repair_attempts=2)
+        assert [unit["abandoned"] for unit in invalid_units] == [False]
+        assert not journal.is_report_completed("20240301000001")
+
+    journal.record_unit("20240301000001", "CFS_BS", dataset)
+    invalid_units = invalidate_failed_units(journal, issues, max_repair_attempts=2)
+    assert [unit["abandoned"] for unit in invalid_units] == [True]
+    assert journal.is_report_completed("20240301000001")
+    assert CrawlJournal("00126380", journal_dir=str(tmp_path)).invalidation_count("20240301000001", "CFS_BS") == 2
+
+
+def test_repair_sections_are_selected_by_title():
+    assert section_matches_units("2. 연결재무제표 2-1. 연결 재무상태표", {"CFS_BS"})
+    assert not section_matches_units("2. 연결재무제표 2-2. 연결 손익계산서", {"CFS_BS"})
+    assert section_matches_units("4. 재무제표 4-3. 포괄손익계산서", {"OFS_IS"})
+    assert not section_matches_units("4. 재무제표 4-1. 재무상태표", {"CFS_BS"})
+    assert section_matches_units("2. 연결재무제표", {"CFS_IS"})
+    assert not section_matches_units("4. 재무제표", {"CFS_IS"})
@@ -0,0 +1,200 @@
+import os
+import uuid
+import asyncio
+
+import pytest
+
+pytest.importorskip("motor")
+pytest.importorskip("playwright")
+
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from app.src.work_queue import DONE, FAILED, LEASED, PENDING, QueueWorker, WorkQueue
+
+MONGO_TEST_URI = os.getenv("MONGO_TEST_URI", "mongodb://localhost:27017")
+
+
+@pytest.fixture(scope="module")
+def mongo_uri():
+    client = MongoClient(MONGO_TEST_URI, serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip(f"mongod에 연결할 수 없음: {MONGO_TEST_URI}")
+    finally:
+        client.close()
+    return MONGO_TEST_URI
+
+
+@pytest.fixture
+def db_name(mongo_uri):
+    name = f"work_queue_test_{uuid.uuid4().hex[:8]}"
+    yield name
+    client = MongoClient(mongo_uri)
+    client.drop_database(name)
+    client.close()
+
+
+def _queue(mongo_uri: str, db_name: str, node_id: str, **kwargs) -> WorkQueue:
+    return WorkQueue(uri=mongo_uri, db_name=db_name, node_id=node_id, **kwargs)
+
+
+def _run(queues, scenario):
+    async def main():
+        try:
+            return await scenario()
+        finally:
+            for queue in queues:
+                queue.close()
+    return asyncio.run(main())
+
+
+def test_concurrent_leases_never_share_a_job(mongo_uri, db_name):
+    node_a = _queue(mongo_uri, db_name, "node-a")
+    node_b = _queue(mongo_uri, db_name, "node-b")
+
+    async def scenario():
+        await node_a.ensure_indexes()
+        for i in range(5):
+            await node_a.add_job(f"corp{i}", f"기업{i}")
+        return await asyncio.gather(*[queue.lease() for queue in [node_a, node_b] * 5])
+
+    jobs = [job for job in _run([node_a, node_b], scenario) if job is not None]
+    assert sorted(job["_id"] for job in jobs) == [f"corp{i}" for i in range(5)]
+    assert len({job["lease_token"] for job in jobs}) == 5
+
+
+def test_interactive_jobs_are_leased_first(mongo_uri, db_name):
+    queue = _queue(mongo_uri, db_name, "node-a")
+
+    async def scenario():
+        await queue.add_job("corp0", "기업0", priority="backfill")
+        await queue.add_job("corp1", "기업1", priority="interactive")
+        return [(await queue.lease())["_id"], (await queue.lease())["_id"]]
+
+    assert _run([queue], scenario) == ["corp1", "corp0"]
+
+
+def test_expired_lease_is_released_to_another_node(mongo_uri, db_name):
+    node_a = _queue(mongo_uri, db_name, "node-a", lease_seconds=1)
+    node_b = _queue(mongo_uri, db_name, "node-b", lease_seconds=1)
+
+    async def scenario():
+        await node_a.add_job("corp0", "기업0")
+        first = await node_a.lease()
+        assert await node_b.lease() is None
+        await asyncio.sleep(1.2)
+        second = await node_b.lease()
+        return first, second, await node_a.heartbeat(first), await node_a.complete(first, {}), await node_b.heartbeat(second)
+
+    first, second, stale_heartbeat, stale_complete, heartbeat = _run([node_a, node_b], scenario)
+    assert second["_id"] == first["_id"]
+    assert second["lease_owner"] == "node-b"
+    assert second["attempts"] == 2
+    assert second["lease_token"] != first["lease_token"]
+    assert not stale_heartbeat
+    assert not stale_complete
+    assert heartbeat
+
+
+def test_reap_expired_fails_jobs_out_of_attempts(mongo_uri, db_name):
+    queue = _queue(mongo_uri, db_name, "node-a", lease_seconds=1, max_attempts=1)
+
+    async def scenario():
+        await queue.add_job("corp0", "기업0")
+        await queue.lease()
+        assert await queue.reap_expired() == 0
+        await asyncio.sleep(1.2)
+        reaped = await queue.reap_expired()
+        return reaped, await queue.jobs.find_one({"_id": "corp0"}), await queue.lease()
+
+    reaped, job, leased = _run([queue], scenario)
+    assert reaped == 1
+    assert job["status"] == FAILED
+    assert leased is None
+
+
+def test_complete_and_fail_require_current_lease_token(mongo_uri, db_name):
+    queue = _queue(mongo_uri, db_name, "node-a", max_attempts=2)
+
+    async def scenario():
+        await queue.add_job("corp0", "기업0")
+        job = await queue.lease()
+        stale = {**job, "lease_token": "stale"}
+        assert not await queue.complete(stale, {})
+        assert not await queue.fail(stale, "stale")
+
+        assert await queue.fail(job, "첫 번째 실패")
+        requeued = await queue.jobs.find_one({"_id": "corp0"})
+        job = await queue.lease()
+        assert await queue.complete(job, {"reports": 1})
+        return requeued, await queue.jobs.find_one({"_id": "corp0"})
+
+    requeued, done = _run([queue], scenario)
+    assert requeued["status"] == PENDING
+    assert requeued["last_error"] == "첫 번째 실패"
+    assert done["status"] == DONE
+    assert done["result"] == {"reports": 1}
+
+
+def test_failed_reports_mark_job_partial_after_last_attempt(mongo_uri, db_name):
+    queue = _queue(mongo_uri, db_name, "node-a", max_attempts=1)
+
+    async def scenario():
+        await queue.add_job("corp0", "기업0")
+        job = await queue.lease()
+        await queue.fail(job, "수집 실패 보고서 1개", {"failed_reports": ["20240301000001"]})
+        return await queue.jobs.find_one({"_id": "corp0"})
+
+    job = _run([queue], scenario)
+    assert job["status"] == "partial"
+    assert job["result"]["failed_reports"] == ["20240301000001"]
+
+
+def test_complete_report_is_recorded_once(mongo_uri, db_name):
+    node_a = _queue(mongo_uri, db_name, "node-a")
+    node_b = _queue(mongo_uri, db_name, "node-b")
+    job = {"_id": "corp0"}
+    datasets = [{"rcept_no": "20240301000001", "sj_div": "CFS_BS", "data": []}]
+
+    async def scenario():
+        first = await node_a.complete_report(job, "20240301000001", datasets)
+        second = await node_b.complete_report(job, "20240301000001", [{**datasets[0], "sj_div": "OFS_BS"}])
+        return first, second, await node_b.recorded_reports("corp0"), await node_a.results.find_one({"_id": "corp0:20240301000001"})
+
+    first, second, recorded, row = _run([node_a, node_b], scenario)
+    assert first and not second
+    assert recorded == {"20240301000001": datasets}
+    assert row["node_id"] == "node-a"
+    assert row["sj_divs"] == ["CFS_BS"]
+
+
+class _LosingQueue:
+    """하트비트가 한 번 실패한 뒤 임대를 잃는 큐"""
+    lease_seconds = 60
+    node_id = "node-a"
+
+    def __init__(self):
+        self.heartbeats = 0
+
+    async def heartbeat(self, job):
+        self.heartbeats += 1
+        if self.heartbeats == 1:
+            raise ConnectionError("mongod 연결 끊김")
+        return False
+
+
+def test_lost_lease_cancels_processing():
+    worker = QueueWorker(_LosingQueue(), heartbeat_seconds=0.01)
+
+    async def scenario():
+        process_task = asyncio.create_task(asyncio.sleep(10))
+        lost = await worker._keep_alive({"_id": "corp0"}, process_task)
+        await asyncio.sleep(0)
+        return lost, process_task.cancelled()
+
+    lost, cancelled = asyncio.run(scenario())
+    assert lost
+    assert cancelled
+    assert worker.queue.heartbeats == 2